@@ -0,0 +1,56 @@
+"""Compares two JSON files written by `run_benchmarks.py`, e.g., of a baseline commit and of a candidate commit, and
+reports the change of the median duration of each benchmark.
+
+The script exits with the status 1 if a benchmark of the candidate is slower than the baseline by more than the
+given threshold, such that it can be used to detect performance regressions automatically."""
+import argparse
+import json
+import sys
+
+
+def _load(path: str) -> tuple[dict, dict[tuple[str, int], dict]]:
+    with open(path, encoding="utf-8") as file:
+        content: dict = json.load(file)
+    return content, {(result["benchmark"], result["rows"]): result for result in content["results"]}
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("baseline", help="the results of the baseline")
+    parser.add_argument("candidate", help="the results of the candidate")
+    parser.add_argument("--threshold", type=float, default=0.1,
+                        help="the relative increase of the median duration that is reported as regression " +
+                             "(default: 0.1)")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    baseline, baseline_results = _load(arguments.baseline)
+    candidate, candidate_results = _load(arguments.candidate)
+    print(f"baseline:  {baseline.get('commit')} ({baseline.get('timestamp')})")
+    print(f"candidate: {candidate.get('commit')} ({candidate.get('timestamp')})\n")
+
+    regressions: int = 0
+    for key in sorted(baseline_results.keys() & candidate_results.keys(), key=lambda k: (k[1], k[0])):
+        before: float = baseline_results[key]["median_seconds"]
+        after: float = candidate_results[key]["median_seconds"]
+        change: float = (after - before) / before if before > 0 else 0.0
+        marker: str = ""
+        if change > arguments.threshold:
+            marker = "  regression"
+            regressions += 1
+        elif change < -arguments.threshold:
+            marker = "  improvement"
+        written: str = ""
+        if baseline_results[key].get("wal_bytes") is not None and candidate_results[key].get("wal_bytes") is not None:
+            written = f", {baseline_results[key]['wal_bytes']:,.0f} -> {candidate_results[key]['wal_bytes']:,.0f} " + \
+                      "WAL bytes"
+        print(f"{key[0]:<70} {key[1]:>10,} rows: {before:.4f} s -> {after:.4f} s ({change:+.1%}){written}{marker}")
+
+    for key in sorted(baseline_results.keys() ^ candidate_results.keys()):
+        print(f"{key[0]:<70} {key[1]:>10,} rows: only measured by the " +
+              ("baseline" if key in baseline_results else "candidate"))
+
+    sys.exit(1 if regressions > 0 else 0)
+
+
+if __name__ == "__main__":
+    main()
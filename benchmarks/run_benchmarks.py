@@ -0,0 +1,436 @@
+"""Runs the benchmarks of DaQSS against a throwaway PostgreSQL database and writes their results to a JSON file, such
+that the performance of different commits can be compared using `compare_benchmarks.py`.
+
+The benchmarks measure the time needed to import DaQSS in a fresh interpreter, the throughput of storing data elements
+and DQ results, the latency of retrieving DQ metrics, and the latency of retrieving DQ results. They run on synthetic customer data that is modeled on the demonstration
+data `demo_data/fake_customer_data.csv` and is generated reproducibly from a seed.
+
+By default, the database is started using the `docker-compose.yml` next to this file, which creates the schema from
+`database_setup` and keeps its data in memory only. The package `daqss` is imported from the `src` directory of this
+repository, such that always the checked-out commit is benchmarked.
+
+??? example
+    ``` shell
+    python benchmarks/run_benchmarks.py --sizes 1000 10000 100000
+    python benchmarks/compare_benchmarks.py benchmarks/results/<baseline>.json benchmarks/results/<candidate>.json
+    python benchmarks/run_benchmarks.py --import-only  # Fails if importing daqss imports heavy dependencies
+    ```
+"""
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable
+
+import numpy
+import pandas
+
+_DIRECTORY: str = os.path.dirname(os.path.abspath(__file__))
+_COMPOSE_FILE: str = os.path.join(_DIRECTORY, "docker-compose.yml")
+_COMPOSE_PROJECT: str = "daqss-benchmark"
+
+_ROOT: str = "benchmark://fake_customer_data"
+"""The global identifier of the data element that contains all data elements created by the benchmarks."""
+
+_SOURCE_DIRECTORY: str = os.path.normpath(os.path.join(_DIRECTORY, os.pardir, "src"))
+
+_HEAVY_MODULES: tuple[str, ...] = ("dill", "dotenv", "pandas", "pyarrow", "sqlalchemy")
+"""The dependencies that must not be imported by `import daqss`, but only on first use of the symbols needing them."""
+
+_FIRST_NAMES: list[str] = ["Anna", "Ben", "Clara", "David", "Emma", "Felix", "Greta", "Hannah", "Jonas", "Lena",
+                           "Lukas", "Maria", "Noah", "Paul", "Sophie", "Theresa"]
+_LAST_NAMES: list[str] = ["Bauer", "Fischer", "Gruber", "Hofer", "Huber", "Koch", "Mayer", "Moser", "Müller",
+                          "Schmid", "Schneider", "Wagner", "Weber", "Wolf"]
+_CITIES: list[str] = ["Graz", "Innsbruck", "Klagenfurt", "Linz", "Salzburg", "St. Pölten", "Vienna", "Wels"]
+_COUNTRIES: list[str] = ["Austria", "Germany", "Italy", "Switzerland"]
+
+
+def generate_customers(rows: int, seed: int = 0, missing_share: float = 0.05) -> pandas.DataFrame:
+    """Generates synthetic customer data, in which a share of the values is missing.
+    Textual columns are categorical, such that even 10^7 rows fit into memory comfortably.
+
+    Args:
+        rows: The number of customers to be generated.
+        seed: The seed of the random number generator. Equal seeds result in equal data.
+        missing_share: The share of values that are missing in each column except the customer ID.
+
+    Returns:
+        A DataFrame containing one customer per row, indexed by the column `CustomerID`."""
+    generator: numpy.random.Generator = numpy.random.default_rng(seed)
+
+    def missing() -> numpy.ndarray:
+        return generator.random(rows) < missing_share
+
+    def categorical(categories: list[str]) -> pandas.Categorical:
+        codes: numpy.ndarray = generator.integers(0, len(categories), rows)
+        codes[missing()] = -1
+        return pandas.Categorical.from_codes(codes, categories)
+
+    birth_dates: pandas.Series = pandas.Series(pandas.Timestamp("1940-01-01") + pandas.to_timedelta(
+        generator.integers(0, 60 * 365, rows), unit="D"))
+    incomes: pandas.Series = pandas.Series(generator.normal(45_000, 15_000, rows).round(2))
+    data: pandas.DataFrame = pandas.DataFrame({
+        "CustomerID": numpy.arange(1, rows + 1),
+        "FirstName": categorical(_FIRST_NAMES),
+        "LastName": categorical(_LAST_NAMES),
+        "City": categorical(_CITIES),
+        "Country": categorical(_COUNTRIES),
+        "DateOfBirth": birth_dates.mask(missing()),
+        "Income": incomes.mask(missing())})
+    return data.set_index("CustomerID", drop=False)
+
+
+def benchmark_completeness(rows: pandas.DataFrame) -> pandas.Series:
+    """Computes the share of available values per row. This vectorized DQ metric is stored in DaQSS by the
+    benchmarks."""
+    return 1 - rows.isna().mean(axis=1)
+
+
+def benchmark_plausibility(rows: pandas.DataFrame) -> pandas.Series:
+    """Computes whether the income of a row is positive. This vectorized DQ metric is stored in DaQSS by the
+    benchmarks, such that multiple DQ metrics are stored per row."""
+    return (rows["Income"] > 0).astype(float)
+
+
+class _Recorder:
+    """Measures the duration and the write cost of benchmarks and collects their results."""
+
+    def __init__(self, repetitions: int) -> None:
+        self.repetitions: int = repetitions
+        self.results: list[dict] = []
+        self.wal_position: Callable[[], int] | None = None
+        """Returns the current position in the write-ahead log of PostgreSQL in bytes, or is `None` as long as no
+        database is benchmarked."""
+
+    def measure(self, benchmark: str, rows: int, unit: str | None, function: Callable[[], Any],
+                repetitions: int | None = None) -> Any:
+        """Runs a function repeatedly and records the median and the 95th percentile of its duration, as well as the
+        median number of bytes it wrote to the write-ahead log of PostgreSQL.
+
+        Args:
+            benchmark: The name of the benchmark.
+            rows: The number of rows, data elements, or DQ results processed by a single run of the function.
+            unit: The unit of the throughput, e.g., `results/s`. Defaults to `None`, which means that only the
+                latency is of interest.
+            function: The function to be measured.
+            repetitions: The number of runs. Defaults to `None`, which means that the number of repetitions of the
+                recorder is used.
+
+        Returns:
+            The return value of the last run of the function."""
+        durations: list[float] = []
+        wal_bytes: list[int] = []
+        value: Any = None
+        for _ in range(repetitions or self.repetitions):
+            wal_start: int | None = self.wal_position() if self.wal_position is not None else None
+            start: float = time.perf_counter()
+            value = function()
+            durations.append(time.perf_counter() - start)
+            if wal_start is not None:
+                wal_bytes.append(self.wal_position() - wal_start)
+
+        median: float = statistics.median(durations)
+        result: dict = {
+            "benchmark": benchmark,
+            "rows": rows,
+            "repetitions": len(durations),
+            "median_seconds": median,
+            "p95_seconds": durations[0] if len(durations) == 1 else
+            statistics.quantiles(durations, n=20, method="inclusive")[-1],
+            "throughput": rows / median if unit is not None and median > 0 else None,
+            "unit": unit,
+            "wal_bytes": statistics.median(wal_bytes) if len(wal_bytes) > 0 else None}
+        self.results.append(result)
+        throughput: str = f", {result['throughput']:,.0f} {unit}" if result["throughput"] is not None else ""
+        written: str = f", {result['wal_bytes'] / rows:,.0f} WAL bytes/row" \
+            if result["wal_bytes"] is not None and rows > 0 else ""
+        print(f"{benchmark:<70} {rows:>10,} rows: {median:.4f} s{throughput}{written}", flush=True)
+        return value
+
+
+def _check_rejected(benchmark: str, rejected: pandas.DataFrame) -> None:
+    if len(rejected) > 0:
+        print(f"{benchmark}: {len(rejected)} DQ results were rejected:\n{rejected['reason'].value_counts()}",
+              file=sys.stderr)
+
+
+def _benchmark_size(d, recorder: _Recorder, size: int, row_wise_limit: int, seed: int) -> None:
+    """Runs all benchmarks that depend on the number of rows on a fresh set of data elements."""
+    from daqss import ROW, TABLE, DataElement
+
+    data: pandas.DataFrame = generate_customers(size, seed)
+    values: pandas.Series = benchmark_completeness(data)
+    row_wise: int = min(size, row_wise_limit)
+
+    def table(benchmark: str) -> str:
+        identifier: str = f"{_ROOT}/{size}/{benchmark}"
+        d.store_data_element(identifier, f"{size}/{benchmark}", TABLE, _ROOT)
+        return identifier
+
+    parent: str = table("store_data_element")
+    recorder.measure("store_data_element", row_wise, "data elements/s",
+                     lambda: [d.store_data_element(f"{parent}#{index}", str(index), ROW, parent)
+                              for index in values.index[:row_wise]],
+                     repetitions=1)
+
+    parent = table("store_data_elements")
+    data_elements: list[DataElement] = [DataElement(f"{parent}#{index}", str(index), ROW, parent)
+                                        for index in values.index]
+    recorder.measure("store_data_elements", size, "data elements/s",
+                     lambda: d.store_data_elements(data_elements), repetitions=1)
+    del data_elements
+
+    measured: str = table("measurement")
+    _check_rejected("measurement", recorder.measure(
+        "store_dq_measurement_results_from_series[bulk, new data elements]", size, "results/s",
+        lambda: d.store_dq_measurement_results_from_series(benchmark_completeness, ROW, measured, values, bulk=True),
+        repetitions=1))
+    _check_rejected("measurement", recorder.measure(
+        "store_dq_measurement_results_from_series[bulk, existing data elements]", size, "results/s",
+        lambda: d.store_dq_measurement_results_from_series(benchmark_completeness, ROW, measured, values, bulk=True),
+        repetitions=1))
+    batched: str = table("measurement_batched")
+    _check_rejected("measurement_batched", recorder.measure(
+        "store_dq_measurement_results_from_series[batched, new data elements]", size, "results/s",
+        lambda: d.store_dq_measurement_results_from_series(benchmark_completeness, ROW, batched, values, batched=True),
+        repetitions=1))
+    _check_rejected("measurement_batched", recorder.measure(
+        "store_dq_measurement_results_from_series[batched, existing data elements]", size, "results/s",
+        lambda: d.store_dq_measurement_results_from_series(benchmark_completeness, ROW, batched, values, batched=True),
+        repetitions=1))
+    # The batches are recorded as the most recent DQ results when these are retrieved for the first time
+    recorder.measure("retrieve_latest_dq_results[parent, batched, first retrieval]", size, "results/s",
+                     lambda: d.retrieve_latest_dq_results(parent=batched), repetitions=1)
+    parent = table("measurement_row_wise")
+    _check_rejected("measurement_row_wise", recorder.measure(
+        "store_dq_measurement_results_from_series[row-wise]", row_wise, "results/s",
+        lambda: d.store_dq_measurement_results_from_series(benchmark_completeness, ROW, parent,
+                                                           values.iloc[:row_wise]),
+        repetitions=1))
+
+    metrics: pandas.DataFrame = pandas.DataFrame({benchmark_completeness.__name__: values,
+                                                  benchmark_plausibility.__name__: benchmark_plausibility(data)})
+    parent = table("measurement_per_series")
+    recorder.measure(
+        "store_dq_measurement_results_from_series[bulk, one call per DQ metric]", metrics.size, "results/s",
+        lambda: [_check_rejected("measurement_per_series", d.store_dq_measurement_results_from_series(
+            dq_metric, ROW, parent, metrics[dq_metric.__name__], bulk=True))
+                 for dq_metric in (benchmark_completeness, benchmark_plausibility)],
+        repetitions=1)
+    parent = table("measurement_per_dataframe")
+    _check_rejected("measurement_per_dataframe", recorder.measure(
+        "store_dq_measurement_results_from_dataframe", metrics.size, "results/s",
+        lambda: d.store_dq_measurement_results_from_dataframe(metrics, ROW, parent), repetitions=1))
+    del metrics
+
+    parent = table("aggregation")
+    _check_rejected("aggregation", recorder.measure(
+        "store_dq_aggregation_results_from_series[bulk]", size, "results/s",
+        lambda: d.store_dq_aggregation_results_from_series("benchmark aggregation", ROW, parent, values, bulk=True),
+        repetitions=1))
+    parent = table("aggregation_row_wise")
+    _check_rejected("aggregation_row_wise", recorder.measure(
+        "store_dq_aggregation_results_from_series[row-wise]", row_wise, "results/s",
+        lambda: d.store_dq_aggregation_results_from_series("benchmark aggregation", ROW, parent,
+                                                           values.iloc[:row_wise]),
+        repetitions=1))
+
+    # The measured data element holds two DQ results per row
+    recorder.measure("retrieve_dq_results[parent]", 2 * size, "results/s",
+                     lambda: sum(len(chunk) for chunk in d.retrieve_dq_results(parent=measured)))
+    recorder.measure("retrieve_dq_results[parent, value range]", 2 * size, None,
+                     lambda: sum(len(chunk) for chunk in d.retrieve_dq_results(parent=measured,
+                                                                               value_range=(1.0, None))))
+    recorder.measure("retrieve_dq_results[parent, batched]", 2 * size, "results/s",
+                     lambda: sum(len(chunk) for chunk in d.retrieve_dq_results(parent=batched)))
+    recorder.measure("retrieve_latest_dq_results[parent]", size, "results/s",
+                     lambda: d.retrieve_latest_dq_results(parent=measured))
+    recorder.measure("retrieve_dq_results_in_subtree[dq metric]", 2 * size, "results/s",
+                     lambda: sum(len(chunk) for chunk in d.retrieve_dq_results_in_subtree(
+                         f"{_ROOT}/{size}/measurement", dq_metric=benchmark_completeness)))
+
+
+def _run_python(statement: str) -> str:
+    """Runs a statement in a fresh interpreter that imports DaQSS from the `src` directory of this repository.
+
+    Returns:
+        The standard output of the interpreter."""
+    environment: dict[str, str] = dict(os.environ)
+    environment["PYTHONPATH"] = os.pathsep.join(filter(None, [_SOURCE_DIRECTORY, os.getenv("PYTHONPATH")]))
+    return subprocess.run([sys.executable, "-c", statement], env=environment, capture_output=True, text=True,
+                          check=True).stdout
+
+
+def _benchmark_import(recorder: _Recorder) -> list[str]:
+    """Measures the time a fresh interpreter needs to start, to import DaQSS, and to create a DaQSS instance, which
+    must not access the database yet.
+
+    Returns:
+        The heavy dependencies that are imported by `import daqss` already, which should be none."""
+    recorder.measure("startup[python]", 1, None, lambda: _run_python("pass"))
+    recorder.measure("startup[import daqss]", 1, None, lambda: _run_python("import daqss"))
+    recorder.measure("startup[DaQSS()]", 1, None, lambda: _run_python("import daqss; daqss.DaQSS()"))
+
+    eagerly_imported: list[str] = _run_python(
+        f"import sys, daqss; print(*(module for module in {_HEAVY_MODULES!r} if module in sys.modules))").split()
+    if len(eagerly_imported) > 0:
+        print(f"import daqss: the dependencies {', '.join(eagerly_imported)} are imported eagerly", file=sys.stderr)
+    return eagerly_imported
+
+
+def _benchmark_metric_retrieval(recorder: _Recorder) -> None:
+    """Measures the latency of retrieving the implementation of a DQ metric by fresh DaQSS instances, whose cache of
+    DQ metrics is empty, and by a single DaQSS instance, whose cache holds the DQ metric."""
+    from daqss import DaQSS
+
+    recorder.measure("retrieve_dq_metric_implementation_by_name[cold]", 1, None,
+                     lambda: DaQSS().retrieve_dq_metric_implementation_by_name(benchmark_completeness.__name__))
+    d: DaQSS = DaQSS()
+    d.retrieve_dq_metric_implementation_by_name(benchmark_completeness.__name__)
+    recorder.measure("retrieve_dq_metric_implementation_by_name[warm]", 1, None,
+                     lambda: d.retrieve_dq_metric_implementation_by_name(benchmark_completeness.__name__),
+                     repetitions=100 * recorder.repetitions)
+
+
+def _prepare_catalog(d) -> None:
+    """Stores the DQ dimension, the DQ metric, and the aggregation process used by the benchmarks."""
+    from daqss import DATABASE, ROW, VALUE
+
+    d.store_data_element(_ROOT, "fake_customer_data", DATABASE)
+    d.store_dq_dimension("Completeness")
+    d.store_dq_metric(benchmark_completeness, ["Completeness"], ROW, vectorized=True)
+    d.store_dq_dimension("Plausibility")
+    d.store_dq_metric(benchmark_plausibility, ["Plausibility"], ROW, vectorized=True)
+    d.store_aggregation_constraint("else", "Is fulfilled if no other constraint is fulfilled.", "else", ROW)
+    d.store_aggregation_function("benchmark mean", "The mean of the values of a row.", "mean(value)", VALUE, ROW)
+    d.store_aggregation_process("benchmark aggregation", "Aggregates the values of the benchmark data.",
+                                "SELECT 1 AS value", [("else", "benchmark mean")], ["Completeness"])
+
+
+def _git_commit() -> tuple[str | None, bool]:
+    try:
+        commit: str = subprocess.run(["git", "rev-parse", "HEAD"], cwd=_DIRECTORY, capture_output=True, text=True,
+                                     check=True).stdout.strip()
+        dirty: bool = subprocess.run(["git", "status", "--porcelain", "--untracked-files=no"], cwd=_DIRECTORY,
+                                     capture_output=True, text=True, check=True).stdout.strip() != ""
+        return commit, dirty
+    except (OSError, subprocess.CalledProcessError):
+        return None, False
+
+
+def _compose(*arguments: str) -> None:
+    subprocess.run(["docker", "compose", "--file", _COMPOSE_FILE, "--project-name", _COMPOSE_PROJECT, *arguments],
+                   check=True)
+
+
+def _wait_for_database(timeout: float = 120.0) -> None:
+    """Waits until the schema of DaQSS has been created, since the database already accepts connections while the
+    scripts of `database_setup` are executed."""
+    from daqss import DaQSS
+    from sqlalchemy import text
+
+    deadline: float = time.monotonic() + timeout
+    while True:
+        try:
+            with DaQSS().connect() as connection:
+                if connection.execute(text("SELECT count(*) FROM levels_of_data_granularity")).scalar() > 0:
+                    return
+        except Exception:
+            if time.monotonic() > deadline:
+                raise
+        time.sleep(1.0)
+
+
+def main() -> None:
+    parser: argparse.ArgumentParser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6, 10 ** 7],
+                        help="the numbers of rows of the synthetic data (default: 10^3 to 10^7)")
+    parser.add_argument("--repetitions", type=int, default=5,
+                        help="the number of runs of each retrieval benchmark (default: 5)")
+    parser.add_argument("--row-wise-limit", type=int, default=10_000,
+                        help="the maximum number of rows stored one at a time (default: 10 000)")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the synthetic data (default: 0)")
+    parser.add_argument("--output", help="the JSON file to which the results are written " +
+                                         "(default: benchmarks/results/<commit>.json)")
+    parser.add_argument("--port", type=int, default=55432,
+                        help="the port on which the throwaway PostgreSQL listens (default: 55432)")
+    parser.add_argument("--no-docker", action="store_true",
+                        help="use the database configured by the DAQSS_* environment variables instead of starting " +
+                             "a throwaway PostgreSQL")
+    parser.add_argument("--keep", action="store_true", help="keep the throwaway PostgreSQL running afterward")
+    parser.add_argument("--import-only", action="store_true",
+                        help="only measure the import time, which requires no database, and exit with the status 1 " +
+                             "if importing daqss imports heavy dependencies")
+    arguments: argparse.Namespace = parser.parse_args()
+
+    recorder: _Recorder = _Recorder(arguments.repetitions)
+    eagerly_imported: list[str] = _benchmark_import(recorder)
+    if arguments.import_only:
+        _write_results(arguments.output, recorder, None, [], arguments.seed, eagerly_imported)
+        sys.exit(1 if len(eagerly_imported) > 0 else 0)
+
+    # Benchmark the checked-out source code rather than an installed version of DaQSS
+    sys.path.insert(0, _SOURCE_DIRECTORY)
+    if not arguments.no_docker:
+        os.environ.setdefault("DAQSS_USERNAME", "daqss_benchmark")
+        os.environ.setdefault("DAQSS_PASSWORD", "daqss_benchmark")
+        os.environ["DAQSS_HOST"] = f"localhost:{arguments.port}"
+        os.environ["DAQSS_DATABASE"] = "daqss"
+        os.environ["DAQSS_BENCHMARK_PORT"] = str(arguments.port)
+        _compose("up", "--detach", "--wait")
+
+    try:
+        from daqss import DaQSS
+        from sqlalchemy import text
+
+        _wait_for_database()
+        d: DaQSS = DaQSS()
+        with d.connect() as connection:
+            postgresql_version: str = connection.execute(text("SELECT version()")).scalar()
+
+        def wal_position() -> int:
+            with d.connect() as wal_connection:
+                return int(wal_connection.execute(text(
+                    "SELECT pg_wal_lsn_diff(pg_current_wal_insert_lsn(), '0/0')")).scalar())
+
+        recorder.wal_position = wal_position
+
+        _prepare_catalog(d)
+        _benchmark_metric_retrieval(recorder)
+        for size in arguments.sizes:
+            _benchmark_size(d, recorder, size, arguments.row_wise_limit, arguments.seed)
+    finally:
+        if not arguments.no_docker and not arguments.keep:
+            _compose("down", "--volumes")
+
+    _write_results(arguments.output, recorder, postgresql_version, arguments.sizes, arguments.seed,
+                   eagerly_imported)
+
+
+def _write_results(output: str | None, recorder: _Recorder, postgresql_version: str | None, sizes: list[int],
+                   seed: int, eagerly_imported: list[str]) -> None:
+    commit, dirty = _git_commit()
+    output = output or os.path.join(
+        _DIRECTORY, "results", f"{(commit or 'unknown')[:12]}{'-dirty' if dirty else ''}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(output)), exist_ok=True)
+    with open(output, "w", encoding="utf-8") as file:
+        json.dump({"commit": commit,
+                   "dirty": dirty,
+                   "timestamp": datetime.now(tz=timezone.utc).isoformat(),
+                   "python": platform.python_version(),
+                   "platform": platform.platform(),
+                   "postgresql": postgresql_version,
+                   "sizes": sizes,
+                   "seed": seed,
+                   "eagerly_imported": eagerly_imported,
+                   "results": recorder.results}, file, indent=2)
+    print(f"The results have been written to {output}.")
+
+
+if __name__ == "__main__":
+    main()
@@ -2,6 +2,8 @@
 \c daqss
 START TRANSACTION;
 
+CREATE EXTENSION IF NOT EXISTS ltree;
+
 CREATE TABLE IF NOT EXISTS levels_of_data_granularity
 (
     level_name TEXT
@@ -24,7 +26,9 @@ CREATE TABLE IF NOT EXISTS dq_metric
         CONSTRAINT dq_metric_pk PRIMARY KEY,
     metric_description                     TEXT,
     python_implementation                  bytea,
-    designed_for_level_of_data_granularity TEXT REFERENCES levels_of_data_granularity (level_name) NOT NULL
+    implementation_hash                    TEXT,
+    designed_for_level_of_data_granularity TEXT REFERENCES levels_of_data_granularity (level_name) NOT NULL,
+    is_vectorized                          BOOLEAN DEFAULT FALSE                                   NOT NULL
 );
 
 COMMENT ON TABLE dq_metric IS 'Contains data quality metrics that are designed for a specific level of data granularity '
@@ -35,8 +39,15 @@ COMMENT ON COLUMN dq_metric.metric_description IS
     'Describes the behavior of a data quality metric, i.e., how it computes a measurement result.';
 COMMENT ON COLUMN dq_metric.python_implementation IS
     'Contains the Dill serialization of the Python function that implements this data quality metric';
+COMMENT ON COLUMN dq_metric.implementation_hash IS
+    'Contains the hexadecimal SHA-256 digest of the column "python_implementation", '
+        'which allows clients to detect whether a cached implementation has changed.';
 COMMENT ON COLUMN dq_metric.designed_for_level_of_data_granularity IS
     'References the level of data granularity which the data quality metric is targeted at.';
+COMMENT ON COLUMN dq_metric.is_vectorized IS
+    'Declares whether the Python implementation of this data quality metric receives a whole chunk of data elements '
+        'at once and returns a series of results (true), or whether it is applied to each data element individually '
+        '(false).';
 
 
 
@@ -172,9 +183,12 @@ COMMENT ON COLUMN aggregation_process_computes_value_for_dimension.dimension_nam
 CREATE TABLE IF NOT EXISTS data_element
 (
     data_element_global_identifier        TEXT PRIMARY KEY,
+    data_element_id                       BIGINT GENERATED ALWAYS AS IDENTITY
+        CONSTRAINT data_element_id_uniqueness UNIQUE,
     data_element_local_identifier         TEXT,
     is_of_level_of_data_granularity       TEXT REFERENCES levels_of_data_granularity (level_name) NOT NULL,
-    parent_data_element_global_identifier TEXT REFERENCES data_element (data_element_global_identifier) ON DELETE CASCADE
+    parent_data_element_global_identifier TEXT REFERENCES data_element (data_element_global_identifier) ON DELETE CASCADE,
+    data_element_path                     ltree NOT NULL
 );
 COMMENT ON TABLE data_element IS 'Stores representations of data elements, i.e., whole databases, tables, columns, ...';
 COMMENT ON COLUMN data_element.data_element_global_identifier IS
@@ -184,6 +198,8 @@ COMMENT ON COLUMN data_element.data_element_global_identifier IS
         'the columns global_identifier appended to the filepath or database connection string after a slash. '
         'In case, a value or a row are identified, '
         'the identifying values of a row are listed after a hashtag in a CSV like list.';
+COMMENT ON COLUMN data_element.data_element_id IS
+    'A compact surrogate key of a data element, which is referenced by DQ results instead of the global identifier.';
 COMMENT ON COLUMN data_element.data_element_local_identifier IS 'Locally identifies a data element.'
     'E.g., the name of a database, a table, a column or the key of a row in a CSV-like structure.';
 COMMENT ON COLUMN data_element.is_of_level_of_data_granularity IS
@@ -191,36 +207,378 @@ COMMENT ON COLUMN data_element.is_of_level_of_data_granularity IS
 COMMENT ON COLUMN data_element.parent_data_element_global_identifier IS
     'The global global_identifier of the more coarse-granular data element that contains '
         'this more fine-granular data element.';
+COMMENT ON COLUMN data_element.data_element_path IS
+    'The surrogate keys of all data elements that contain this data element, starting at the most coarse-granular '
+        'one and ending with the surrogate key of this data element. The path is set when a data element is stored.';
+CREATE INDEX IF NOT EXISTS data_element_parent_idx
+    ON data_element (parent_data_element_global_identifier);
+CREATE INDEX IF NOT EXISTS data_element_path_idx
+    ON data_element USING GIST (data_element_path);
+
+CREATE OR REPLACE FUNCTION set_data_element_path() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    IF NEW.parent_data_element_global_identifier IS NULL THEN
+        NEW.data_element_path := text2ltree(NEW.data_element_id::TEXT);
+    ELSE
+        SELECT data_element_path || NEW.data_element_id::TEXT
+        INTO NEW.data_element_path
+        FROM data_element
+        WHERE data_element_global_identifier = NEW.parent_data_element_global_identifier;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+COMMENT ON FUNCTION set_data_element_path() IS 'Sets the path of a data element to be stored by appending its '
+    'surrogate key to the path of its parent data element.';
+CREATE OR REPLACE TRIGGER data_element_path_trigger
+    BEFORE INSERT
+    ON data_element
+    FOR EACH ROW
+EXECUTE FUNCTION set_data_element_path();
 
-CREATE TABLE dq_result
+CREATE TABLE dq_result_row
 (
     creation_timestamp                 TIMESTAMP NOT NULL,
     result_value                       NUMERIC   NOT NULL,
-    computed_on_data_element_global_id TEXT      NOT NULL
-        REFERENCES data_element (data_element_global_identifier) ON DELETE CASCADE,
+    computed_on_data_element_id        BIGINT    NOT NULL
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE,
     calculated_by_dq_metric            TEXT REFERENCES dq_metric (metric_name),
     calculated_by_aggregation_process  TEXT REFERENCES aggregation_process (aggregation_process_name),
     CONSTRAINT calculated_by_dq_metric_xor_aggregation_process CHECK (
         (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
         (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL)),
-    UNIQUE (creation_timestamp, computed_on_data_element_global_id, calculated_by_dq_metric)
-);
-COMMENT ON TABLE dq_result IS 'Stores DQ results computed on a data element either by a DQ metric or'
-    ' an aggregation process.';
-COMMENT ON COLUMN dq_result.creation_timestamp IS
+    CONSTRAINT dq_result_uniqueness UNIQUE (creation_timestamp, computed_on_data_element_id,
+                                            calculated_by_dq_metric)
+) PARTITION BY RANGE (creation_timestamp);
+COMMENT ON TABLE dq_result_row IS 'Stores DQ results computed on a data element either by a DQ metric or'
+    ' an aggregation process as one row per DQ result. The table is partitioned by month based on the column '
+    '"creation_timestamp". The view "dq_result" combines its DQ results with the ones stored in batches.';
+COMMENT ON COLUMN dq_result_row.creation_timestamp IS
     'The timestamp of the point in time when the data quality results has been computed.'
         'Part of the tables uniqueness constraint.';
-COMMENT ON COLUMN dq_result.result_value IS
+COMMENT ON COLUMN dq_result_row.result_value IS
     'The data quality result value that has been computed.';
-COMMENT ON COLUMN dq_result.computed_on_data_element_global_id IS
+COMMENT ON COLUMN dq_result_row.computed_on_data_element_id IS
     'References the data element for which the data quality result value that has been computed.'
         'Part of the tables uniqueness constraint.';
-COMMENT ON COLUMN dq_result.calculated_by_dq_metric IS
+COMMENT ON COLUMN dq_result_row.calculated_by_dq_metric IS
     'References the data quality metric that computed the result value.'
         'Part of the tables uniqueness constraint.';
-COMMENT ON COLUMN dq_result.calculated_by_aggregation_process IS
+COMMENT ON COLUMN dq_result_row.calculated_by_aggregation_process IS
     'References the data quality aggregation process that computed the result value.'
         'Part of the tables uniqueness constraint.';
 
+CREATE INDEX IF NOT EXISTS dq_result_data_element_metric_idx
+    ON dq_result_row (computed_on_data_element_id, calculated_by_dq_metric, creation_timestamp)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dq_result_data_element_aggregation_process_idx
+    ON dq_result_row (computed_on_data_element_id, calculated_by_aggregation_process, creation_timestamp)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS dq_result_row_default PARTITION OF dq_result_row DEFAULT;
+COMMENT ON TABLE dq_result_row_default IS 'Stores DQ results for whose creation timestamp no monthly partition '
+    'of the table "dq_result_row" exists.';
+
+CREATE OR REPLACE FUNCTION create_dq_result_partition(month_date DATE) RETURNS TEXT
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    first_day      DATE := date_trunc('month', month_date)::DATE;
+    partition_name TEXT := 'dq_result_row_' || to_char(first_day, 'YYYY_MM');
+BEGIN
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF dq_result_row FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, first_day, (first_day + INTERVAL '1 month')::DATE);
+    RETURN partition_name;
+END;
+$$;
+COMMENT ON FUNCTION create_dq_result_partition(DATE) IS 'Creates the partition of the table "dq_result_row" that '
+    'holds the DQ results created in the month of the given date, unless it already exists, and returns its name.';
+
+CREATE TABLE dq_result_latest
+(
+    creation_timestamp                 TIMESTAMP NOT NULL,
+    result_value                       NUMERIC   NOT NULL,
+    computed_on_data_element_id        BIGINT    NOT NULL
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    calculated_by_dq_metric            TEXT REFERENCES dq_metric (metric_name),
+    calculated_by_aggregation_process  TEXT REFERENCES aggregation_process (aggregation_process_name),
+    CONSTRAINT latest_calculated_by_dq_metric_xor_aggregation_process CHECK (
+        (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
+        (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL))
+);
+COMMENT ON TABLE dq_result_latest IS 'Stores the most recent DQ result computed on a data element by each DQ metric '
+    'and each aggregation process. The table is maintained whenever DQ results are stored in the table '
+    '"dq_result_row". DQ results stored in batches are recorded by the function "refresh_dq_result_latest".';
+
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_latest_data_element_metric_idx
+    ON dq_result_latest (computed_on_data_element_id, calculated_by_dq_metric)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_latest_data_element_aggregation_process_idx
+    ON dq_result_latest (computed_on_data_element_id, calculated_by_aggregation_process)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE INDEX IF NOT EXISTS dq_result_metric_timestamp_idx
+    ON dq_result_row (calculated_by_dq_metric, creation_timestamp)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dq_result_aggregation_process_timestamp_idx
+    ON dq_result_row (calculated_by_aggregation_process, creation_timestamp)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS retention_policy
+(
+    applies_to_dq_metric           TEXT REFERENCES dq_metric (metric_name) ON DELETE CASCADE,
+    applies_to_aggregation_process TEXT REFERENCES aggregation_process (aggregation_process_name) ON DELETE CASCADE,
+    raw_retention_days             INTEGER NOT NULL CHECK (raw_retention_days > 0),
+    rollup_granularity             TEXT    NOT NULL CHECK (rollup_granularity IN ('day', 'week')),
+    CONSTRAINT retention_policy_dq_metric_xor_aggregation_process CHECK (
+        (applies_to_dq_metric IS NOT NULL AND applies_to_aggregation_process IS NULL) OR
+        (applies_to_dq_metric IS NULL AND applies_to_aggregation_process IS NOT NULL))
+);
+COMMENT ON TABLE retention_policy IS 'Defines for a DQ metric or an aggregation process how long its DQ results are '
+    'kept at full resolution in the view "dq_result", before they are compacted into the table "dq_result_rollup".';
+COMMENT ON COLUMN retention_policy.raw_retention_days IS
+    'The number of days for which DQ results are kept at full resolution.';
+COMMENT ON COLUMN retention_policy.rollup_granularity IS
+    'The period, either "day" or "week", per which older DQ results of a data element are compacted into one row.';
+
+CREATE UNIQUE INDEX IF NOT EXISTS retention_policy_dq_metric_idx
+    ON retention_policy (applies_to_dq_metric)
+    WHERE applies_to_dq_metric IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS retention_policy_aggregation_process_idx
+    ON retention_policy (applies_to_aggregation_process)
+    WHERE applies_to_aggregation_process IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS dq_result_rollup
+(
+    bucket_start                      TIMESTAMP NOT NULL,
+    bucket_granularity                TEXT      NOT NULL CHECK (bucket_granularity IN ('day', 'week')),
+    computed_on_data_element_id       BIGINT    NOT NULL
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    calculated_by_dq_metric           TEXT REFERENCES dq_metric (metric_name),
+    calculated_by_aggregation_process TEXT REFERENCES aggregation_process (aggregation_process_name),
+    result_count                      BIGINT    NOT NULL,
+    minimum_value                     NUMERIC   NOT NULL,
+    maximum_value                     NUMERIC   NOT NULL,
+    sum_value                         NUMERIC   NOT NULL,
+    last_value                        NUMERIC   NOT NULL,
+    last_timestamp                    TIMESTAMP NOT NULL,
+    CONSTRAINT rollup_calculated_by_dq_metric_xor_aggregation_process CHECK (
+        (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
+        (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL))
+);
+COMMENT ON TABLE dq_result_rollup IS 'Stores the DQ results that were compacted according to a retention policy. '
+    'Each row summarizes the DQ results computed on a data element by a DQ metric or an aggregation process within '
+    'a day or a week, which starts at "bucket_start".';
+COMMENT ON COLUMN dq_result_rollup.sum_value IS
+    'The sum of the compacted result values, which allows merging rows and computing their mean.';
+COMMENT ON COLUMN dq_result_rollup.last_value IS
+    'The most recent of the compacted result values, which was computed at "last_timestamp".';
+
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_rollup_data_element_metric_idx
+    ON dq_result_rollup (computed_on_data_element_id, calculated_by_dq_metric, bucket_granularity, bucket_start)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_rollup_data_element_aggregation_process_idx
+    ON dq_result_rollup (computed_on_data_element_id, calculated_by_aggregation_process, bucket_granularity,
+                         bucket_start)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS dq_result_batch
+(
+    dq_result_batch_id                BIGINT GENERATED ALWAYS AS IDENTITY
+        CONSTRAINT dq_result_batch_pk PRIMARY KEY,
+    creation_timestamp                TIMESTAMP          NOT NULL,
+    parent_data_element_id            BIGINT             NOT NULL
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    calculated_by_dq_metric           TEXT REFERENCES dq_metric (metric_name),
+    calculated_by_aggregation_process TEXT REFERENCES aggregation_process (aggregation_process_name),
+    result_count                      INTEGER            NOT NULL,
+    data_element_ids                  BIGINT[]           COMPRESSION lz4 NOT NULL,
+    result_values                     DOUBLE PRECISION[] COMPRESSION lz4 NOT NULL,
+    is_latest_pending                 BOOLEAN            NOT NULL DEFAULT TRUE,
+    CONSTRAINT batch_calculated_by_dq_metric_xor_aggregation_process CHECK (
+        (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
+        (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL)),
+    CONSTRAINT batch_arrays_of_equal_length CHECK (
+        cardinality(data_element_ids) = result_count AND cardinality(result_values) = result_count)
+);
+COMMENT ON TABLE dq_result_batch IS 'Stores the DQ results computed by a DQ metric or an aggregation process at the '
+    'same point in time on the children of a data element as a single row, instead of one row per DQ result in the '
+    'table "dq_result_row". The arrays are compressed by PostgreSQL once they exceed about 2 kB.';
+COMMENT ON COLUMN dq_result_batch.parent_data_element_id IS
+    'References the data element that contains the data elements on which the DQ results have been computed.';
+COMMENT ON COLUMN dq_result_batch.result_count IS
+    'The number of DQ results in the batch, i.e., the length of both arrays.';
+COMMENT ON COLUMN dq_result_batch.data_element_ids IS
+    'The surrogate keys of the data elements on which the DQ results have been computed, in ascending order.';
+COMMENT ON COLUMN dq_result_batch.result_values IS
+    'The result values, whereby each one belongs to the data element at the same position of "data_element_ids".';
+COMMENT ON COLUMN dq_result_batch.is_latest_pending IS
+    'Whether the DQ results of the batch have not been recorded in the table "dq_result_latest" yet.';
+
+CREATE INDEX IF NOT EXISTS dq_result_batch_parent_timestamp_idx
+    ON dq_result_batch (parent_data_element_id, creation_timestamp);
+CREATE INDEX IF NOT EXISTS dq_result_batch_latest_pending_idx
+    ON dq_result_batch (dq_result_batch_id)
+    WHERE is_latest_pending;
+CREATE INDEX IF NOT EXISTS dq_result_batch_metric_timestamp_idx
+    ON dq_result_batch (calculated_by_dq_metric, creation_timestamp)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dq_result_batch_aggregation_process_timestamp_idx
+    ON dq_result_batch (calculated_by_aggregation_process, creation_timestamp)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE OR REPLACE VIEW dq_result AS
+SELECT creation_timestamp,
+       result_value,
+       computed_on_data_element_id,
+       calculated_by_dq_metric,
+       calculated_by_aggregation_process
+FROM dq_result_row
+UNION ALL
+SELECT dq_result_batch.creation_timestamp,
+       CAST(entry.result_value AS NUMERIC),
+       entry.data_element_id,
+       dq_result_batch.calculated_by_dq_metric,
+       dq_result_batch.calculated_by_aggregation_process
+FROM dq_result_batch
+         CROSS JOIN LATERAL unnest(dq_result_batch.data_element_ids,
+                                   dq_result_batch.result_values) AS entry (data_element_id, result_value);
+COMMENT ON VIEW dq_result IS 'Provides all DQ results at full resolution, regardless of whether they are stored as '
+    'one row per DQ result in the table "dq_result_row" or in batches in the table "dq_result_batch". DQ results '
+    'inserted into the view are stored in the table "dq_result_row".';
+
+CREATE OR REPLACE FUNCTION insert_dq_result() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    INSERT INTO dq_result_row (creation_timestamp, result_value, computed_on_data_element_id,
+                               calculated_by_dq_metric, calculated_by_aggregation_process)
+    VALUES (NEW.creation_timestamp, NEW.result_value, NEW.computed_on_data_element_id,
+            NEW.calculated_by_dq_metric, NEW.calculated_by_aggregation_process);
+    RETURN NEW;
+END;
+$$;
+COMMENT ON FUNCTION insert_dq_result() IS 'Stores a DQ result inserted into the view "dq_result" in the table '
+    '"dq_result_row".';
+CREATE OR REPLACE TRIGGER dq_result_insert_trigger
+    INSTEAD OF INSERT
+    ON dq_result
+    FOR EACH ROW
+EXECUTE FUNCTION insert_dq_result();
+
+CREATE OR REPLACE FUNCTION refresh_dq_result_latest() RETURNS BIGINT
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    refreshed BIGINT;
+BEGIN
+    WITH pending AS (
+        UPDATE dq_result_batch
+            SET is_latest_pending = FALSE
+            WHERE is_latest_pending
+            RETURNING creation_timestamp, calculated_by_dq_metric, calculated_by_aggregation_process,
+                data_element_ids, result_values),
+         latest AS (
+             SELECT DISTINCT ON (entry.data_element_id, pending.calculated_by_dq_metric,
+                 pending.calculated_by_aggregation_process) pending.creation_timestamp,
+                                                            CAST(entry.result_value AS NUMERIC) AS result_value,
+                                                            entry.data_element_id,
+                                                            pending.calculated_by_dq_metric,
+                                                            pending.calculated_by_aggregation_process
+             FROM pending
+                      CROSS JOIN LATERAL unnest(pending.data_element_ids,
+                                                pending.result_values) AS entry (data_element_id, result_value)
+             ORDER BY entry.data_element_id, pending.calculated_by_dq_metric,
+                      pending.calculated_by_aggregation_process, pending.creation_timestamp DESC),
+         by_dq_metric AS (
+             INSERT INTO dq_result_latest (creation_timestamp, result_value, computed_on_data_element_id,
+                                           calculated_by_dq_metric, calculated_by_aggregation_process)
+                 SELECT * FROM latest WHERE calculated_by_dq_metric IS NOT NULL
+                 ON CONFLICT (computed_on_data_element_id, calculated_by_dq_metric)
+                     WHERE calculated_by_dq_metric IS NOT NULL
+                     DO UPDATE SET creation_timestamp = EXCLUDED.creation_timestamp,
+                                   result_value = EXCLUDED.result_value
+                     WHERE dq_result_latest.creation_timestamp <= EXCLUDED.creation_timestamp
+                 RETURNING 1),
+         by_aggregation_process AS (
+             INSERT INTO dq_result_latest (creation_timestamp, result_value, computed_on_data_element_id,
+                                           calculated_by_dq_metric, calculated_by_aggregation_process)
+                 SELECT * FROM latest WHERE calculated_by_aggregation_process IS NOT NULL
+                 ON CONFLICT (computed_on_data_element_id, calculated_by_aggregation_process)
+                     WHERE calculated_by_aggregation_process IS NOT NULL
+                     DO UPDATE SET creation_timestamp = EXCLUDED.creation_timestamp,
+                                   result_value = EXCLUDED.result_value
+                     WHERE dq_result_latest.creation_timestamp <= EXCLUDED.creation_timestamp
+                 RETURNING 1)
+    SELECT (SELECT count(*) FROM by_dq_metric) + (SELECT count(*) FROM by_aggregation_process)
+    INTO refreshed;
+    RETURN refreshed;
+END;
+$$;
+COMMENT ON FUNCTION refresh_dq_result_latest() IS 'Records the DQ results of the batches stored since the last '
+    'call in the table "dq_result_latest", unless more recent DQ results are recorded already, and returns the '
+    'number of DQ results recorded. Batches are not recorded when they are stored, such that storing them does not '
+    'write one row per DQ result.';
+
+CREATE TABLE IF NOT EXISTS data_element_fingerprint
+(
+    data_element_id        BIGINT NOT NULL REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    measured_by_dq_metric  TEXT   NOT NULL REFERENCES dq_metric (metric_name) ON DELETE CASCADE,
+    fingerprint            BIGINT NOT NULL,
+    implementation_hash    TEXT,
+    CONSTRAINT data_element_fingerprint_pk PRIMARY KEY (data_element_id, measured_by_dq_metric)
+);
+COMMENT ON TABLE data_element_fingerprint IS 'Contains a fingerprint of the content of a data element at the time '
+    'the most recent DQ measurement result was computed on it by a DQ metric. Data elements whose fingerprint is '
+    'unchanged need not be measured again by the same implementation of the DQ metric.';
+COMMENT ON COLUMN data_element_fingerprint.fingerprint IS
+    'A 64-bit hash of the values of the data element, e.g., of a row or a column.';
+COMMENT ON COLUMN data_element_fingerprint.implementation_hash IS
+    'The hash of the implementation of the DQ metric by which the data element was measured.';
+
+CREATE TABLE IF NOT EXISTS catalog_version
+(
+    version BIGINT NOT NULL
+);
+COMMENT ON TABLE catalog_version IS 'Contains a single row holding the version of the catalog, i.e., of the tables '
+    'holding levels of data granularity, DQ dimensions, DQ metrics, aggregation constraints, aggregation functions, '
+    'and aggregation processes. The version is incremented whenever one of these tables is changed.';
+INSERT INTO catalog_version (version)
+SELECT 0
+WHERE NOT EXISTS (SELECT FROM catalog_version);
+
+CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE catalog_version SET version = version + 1 RETURNING version INTO new_version;
+    PERFORM pg_notify('daqss_catalog', new_version::TEXT);
+    RETURN NULL;
+END;
+$$;
+COMMENT ON FUNCTION notify_catalog_change() IS 'Increments the version of the catalog and notifies listeners on the '
+    'channel "daqss_catalog" once the changing transaction is committed.';
+
+DO
+$$
+    DECLARE
+        catalog_table TEXT;
+    BEGIN
+        FOREACH catalog_table IN ARRAY ARRAY ['levels_of_data_granularity', 'dq_dimension', 'dq_metric',
+            'metric_computes_value_for_dimension', 'aggregation_constraint', 'aggregation_function',
+            'aggregation_process', 'aggregation_process_is_based_on',
+            'aggregation_process_computes_value_for_dimension']
+            LOOP
+                EXECUTE format('CREATE OR REPLACE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I ' ||
+                               'FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change()',
+                               catalog_table || '_catalog_change_trigger', catalog_table);
+            END LOOP;
+    END
+$$;
+
 
 END TRANSACTION;
\ No newline at end of file
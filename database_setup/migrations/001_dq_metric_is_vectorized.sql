@@ -0,0 +1,13 @@
+-- Adds the execution mode of data quality metrics to databases created by a previous version of DaQSS.
+\c daqss
+START TRANSACTION;
+
+ALTER TABLE dq_metric
+    ADD COLUMN IF NOT EXISTS is_vectorized BOOLEAN DEFAULT FALSE NOT NULL;
+
+COMMENT ON COLUMN dq_metric.is_vectorized IS
+    'Declares whether the Python implementation of this data quality metric receives a whole chunk of data elements '
+        'at once and returns a series of results (true), or whether it is applied to each data element individually '
+        '(false).';
+
+END TRANSACTION;
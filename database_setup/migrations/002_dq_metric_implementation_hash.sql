@@ -0,0 +1,18 @@
+-- Adds the content hash of the Python implementation of data quality metrics
+-- to databases created by a previous version of DaQSS.
+\c daqss
+START TRANSACTION;
+
+ALTER TABLE dq_metric
+    ADD COLUMN IF NOT EXISTS implementation_hash TEXT;
+
+COMMENT ON COLUMN dq_metric.implementation_hash IS
+    'Contains the hexadecimal SHA-256 digest of the column "python_implementation", '
+        'which allows clients to detect whether a cached implementation has changed.';
+
+UPDATE dq_metric
+SET implementation_hash = encode(sha256(python_implementation), 'hex')
+WHERE implementation_hash IS NULL
+  AND python_implementation IS NOT NULL;
+
+END TRANSACTION;
@@ -0,0 +1,96 @@
+-- Partitions the table "dq_result" by month, and adds indexes for looking up DQ results by data element and
+-- DQ metric or aggregation process, as well as for looking up data elements by their parent data element,
+-- to databases created by a previous version of DaQSS.
+-- The existing DQ results are copied into the partitioned table, which may take a while for large tables.
+\c daqss
+START TRANSACTION;
+
+CREATE INDEX IF NOT EXISTS data_element_parent_idx
+    ON data_element (parent_data_element_global_identifier);
+
+SELECT relkind = 'p' AS dq_result_is_partitioned
+FROM pg_class
+WHERE oid = 'dq_result'::regclass \gset
+
+\if :dq_result_is_partitioned
+\echo 'The table "dq_result" is already partitioned.'
+\else
+ALTER TABLE dq_result
+    RENAME TO dq_result_unpartitioned;
+
+CREATE TABLE dq_result
+(
+    creation_timestamp                 TIMESTAMP NOT NULL,
+    result_value                       NUMERIC   NOT NULL,
+    computed_on_data_element_global_id TEXT      NOT NULL
+        REFERENCES data_element (data_element_global_identifier) ON DELETE CASCADE,
+    calculated_by_dq_metric            TEXT REFERENCES dq_metric (metric_name),
+    calculated_by_aggregation_process  TEXT REFERENCES aggregation_process (aggregation_process_name),
+    CONSTRAINT calculated_by_dq_metric_xor_aggregation_process CHECK (
+        (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
+        (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL)),
+    CONSTRAINT dq_result_uniqueness UNIQUE (creation_timestamp, computed_on_data_element_global_id,
+                                            calculated_by_dq_metric)
+) PARTITION BY RANGE (creation_timestamp);
+COMMENT ON TABLE dq_result IS 'Stores DQ results computed on a data element either by a DQ metric or'
+    ' an aggregation process. The table is partitioned by month based on the column "creation_timestamp".';
+COMMENT ON COLUMN dq_result.creation_timestamp IS
+    'The timestamp of the point in time when the data quality results has been computed.'
+        'Part of the tables uniqueness constraint.';
+COMMENT ON COLUMN dq_result.result_value IS
+    'The data quality result value that has been computed.';
+COMMENT ON COLUMN dq_result.computed_on_data_element_global_id IS
+    'References the data element for which the data quality result value that has been computed.'
+        'Part of the tables uniqueness constraint.';
+COMMENT ON COLUMN dq_result.calculated_by_dq_metric IS
+    'References the data quality metric that computed the result value.'
+        'Part of the tables uniqueness constraint.';
+COMMENT ON COLUMN dq_result.calculated_by_aggregation_process IS
+    'References the data quality aggregation process that computed the result value.'
+        'Part of the tables uniqueness constraint.';
+
+CREATE INDEX IF NOT EXISTS dq_result_data_element_metric_idx
+    ON dq_result (computed_on_data_element_global_id, calculated_by_dq_metric, creation_timestamp)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dq_result_data_element_aggregation_process_idx
+    ON dq_result (computed_on_data_element_global_id, calculated_by_aggregation_process, creation_timestamp)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS dq_result_default PARTITION OF dq_result DEFAULT;
+COMMENT ON TABLE dq_result_default IS 'Stores DQ results for whose creation timestamp no monthly partition '
+    'of the table "dq_result" exists.';
+
+CREATE OR REPLACE FUNCTION create_dq_result_partition(month_date DATE) RETURNS TEXT
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    first_day      DATE := date_trunc('month', month_date)::DATE;
+    partition_name TEXT := 'dq_result_' || to_char(first_day, 'YYYY_MM');
+BEGIN
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF dq_result FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, first_day, (first_day + INTERVAL '1 month')::DATE);
+    RETURN partition_name;
+END;
+$$;
+COMMENT ON FUNCTION create_dq_result_partition(DATE) IS 'Creates the partition of the table "dq_result" that holds '
+    'the DQ results created in the month of the given date, unless it already exists, and returns its name.';
+
+SELECT create_dq_result_partition(month_date::DATE)
+FROM generate_series(date_trunc('month', coalesce((SELECT min(creation_timestamp) FROM dq_result_unpartitioned),
+                                                  localtimestamp)),
+                     date_trunc('month', localtimestamp) + INTERVAL '2 months',
+                     INTERVAL '1 month') AS month_date;
+
+INSERT INTO dq_result (creation_timestamp, result_value, computed_on_data_element_global_id,
+                       calculated_by_dq_metric, calculated_by_aggregation_process)
+SELECT creation_timestamp,
+       result_value,
+       computed_on_data_element_global_id,
+       calculated_by_dq_metric,
+       calculated_by_aggregation_process
+FROM dq_result_unpartitioned;
+
+DROP TABLE dq_result_unpartitioned;
+\endif
+
+END TRANSACTION;
@@ -0,0 +1,37 @@
+-- Adds the table holding the most recent DQ result per data element and DQ metric or aggregation process
+-- to databases created by a previous version of DaQSS, and fills it from the DQ results stored so far.
+\c daqss
+START TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS dq_result_latest
+(
+    creation_timestamp                 TIMESTAMP NOT NULL,
+    result_value                       NUMERIC   NOT NULL,
+    computed_on_data_element_global_id TEXT      NOT NULL
+        REFERENCES data_element (data_element_global_identifier) ON DELETE CASCADE,
+    calculated_by_dq_metric            TEXT REFERENCES dq_metric (metric_name),
+    calculated_by_aggregation_process  TEXT REFERENCES aggregation_process (aggregation_process_name),
+    CONSTRAINT latest_calculated_by_dq_metric_xor_aggregation_process CHECK (
+        (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
+        (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL))
+);
+COMMENT ON TABLE dq_result_latest IS 'Stores the most recent DQ result computed on a data element by each DQ metric '
+    'and each aggregation process. The table is maintained whenever DQ results are stored in the table "dq_result".';
+
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_latest_data_element_metric_idx
+    ON dq_result_latest (computed_on_data_element_global_id, calculated_by_dq_metric)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_latest_data_element_aggregation_process_idx
+    ON dq_result_latest (computed_on_data_element_global_id, calculated_by_aggregation_process)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+INSERT INTO dq_result_latest
+SELECT DISTINCT ON (computed_on_data_element_global_id, calculated_by_dq_metric, calculated_by_aggregation_process)
+    creation_timestamp, result_value, computed_on_data_element_global_id,
+    calculated_by_dq_metric, calculated_by_aggregation_process
+FROM dq_result
+WHERE NOT EXISTS (SELECT FROM dq_result_latest)
+ORDER BY computed_on_data_element_global_id, calculated_by_dq_metric, calculated_by_aggregation_process,
+         creation_timestamp DESC;
+
+END TRANSACTION;
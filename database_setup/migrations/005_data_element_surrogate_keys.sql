@@ -0,0 +1,68 @@
+-- Adds a compact integer surrogate key to the table "data_element" and lets the tables "dq_result" and
+-- "dq_result_latest" reference data elements by it instead of by their global identifier,
+-- to databases created by a previous version of DaQSS.
+-- All DQ results are rewritten, which may take a while for large tables. The space previously occupied by the
+-- global identifiers is reclaimed by running "VACUUM FULL dq_result;" afterward.
+\c daqss
+START TRANSACTION;
+
+SELECT EXISTS (SELECT
+               FROM information_schema.columns
+               WHERE table_name = 'dq_result'
+                 AND column_name = 'computed_on_data_element_id') AS surrogate_keys_exist \gset
+
+\if :surrogate_keys_exist
+\echo 'The table "dq_result" already references data elements by their surrogate key.'
+\else
+ALTER TABLE data_element
+    ADD COLUMN data_element_id BIGINT GENERATED ALWAYS AS IDENTITY
+        CONSTRAINT data_element_id_uniqueness UNIQUE;
+COMMENT ON COLUMN data_element.data_element_id IS
+    'A compact surrogate key of a data element, which is referenced by DQ results instead of the global identifier.';
+
+ALTER TABLE dq_result
+    ADD COLUMN computed_on_data_element_id BIGINT;
+UPDATE dq_result
+SET computed_on_data_element_id = data_element.data_element_id
+FROM data_element
+WHERE dq_result.computed_on_data_element_global_id = data_element.data_element_global_identifier;
+-- Dropping the global identifier also drops the uniqueness constraint and the indexes that contain it.
+ALTER TABLE dq_result
+    DROP COLUMN computed_on_data_element_global_id,
+    ALTER COLUMN computed_on_data_element_id SET NOT NULL,
+    ADD CONSTRAINT dq_result_computed_on_data_element_id_fkey FOREIGN KEY (computed_on_data_element_id)
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    ADD CONSTRAINT dq_result_uniqueness UNIQUE (creation_timestamp, computed_on_data_element_id,
+                                                calculated_by_dq_metric);
+COMMENT ON COLUMN dq_result.computed_on_data_element_id IS
+    'References the data element for which the data quality result value that has been computed.'
+        'Part of the tables uniqueness constraint.';
+
+CREATE INDEX IF NOT EXISTS dq_result_data_element_metric_idx
+    ON dq_result (computed_on_data_element_id, calculated_by_dq_metric, creation_timestamp)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dq_result_data_element_aggregation_process_idx
+    ON dq_result (computed_on_data_element_id, calculated_by_aggregation_process, creation_timestamp)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+ALTER TABLE dq_result_latest
+    ADD COLUMN computed_on_data_element_id BIGINT;
+UPDATE dq_result_latest
+SET computed_on_data_element_id = data_element.data_element_id
+FROM data_element
+WHERE dq_result_latest.computed_on_data_element_global_id = data_element.data_element_global_identifier;
+ALTER TABLE dq_result_latest
+    DROP COLUMN computed_on_data_element_global_id,
+    ALTER COLUMN computed_on_data_element_id SET NOT NULL,
+    ADD CONSTRAINT dq_result_latest_computed_on_data_element_id_fkey FOREIGN KEY (computed_on_data_element_id)
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE;
+
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_latest_data_element_metric_idx
+    ON dq_result_latest (computed_on_data_element_id, calculated_by_dq_metric)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_latest_data_element_aggregation_process_idx
+    ON dq_result_latest (computed_on_data_element_id, calculated_by_aggregation_process)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+\endif
+
+END TRANSACTION;
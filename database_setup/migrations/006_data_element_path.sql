@@ -0,0 +1,60 @@
+-- Adds the path of each data element within the hierarchy of data elements, which allows retrieving all
+-- descendants or ancestors of a data element using a single index scan, to databases created by a previous
+-- version of DaQSS. Requires migration 005.
+\c daqss
+START TRANSACTION;
+
+CREATE EXTENSION IF NOT EXISTS ltree;
+
+ALTER TABLE data_element
+    ADD COLUMN IF NOT EXISTS data_element_path ltree;
+COMMENT ON COLUMN data_element.data_element_path IS
+    'The surrogate keys of all data elements that contain this data element, starting at the most coarse-granular '
+        'one and ending with the surrogate key of this data element. The path is set when a data element is stored.';
+
+WITH RECURSIVE paths AS (SELECT data_element_global_identifier,
+                                text2ltree(data_element_id::TEXT) AS data_element_path
+                         FROM data_element
+                         WHERE parent_data_element_global_identifier IS NULL
+                         UNION ALL
+                         SELECT child.data_element_global_identifier,
+                                paths.data_element_path || child.data_element_id::TEXT
+                         FROM data_element AS child
+                                  JOIN paths
+                                       ON child.parent_data_element_global_identifier =
+                                          paths.data_element_global_identifier)
+UPDATE data_element
+SET data_element_path = paths.data_element_path
+FROM paths
+WHERE data_element.data_element_global_identifier = paths.data_element_global_identifier
+  AND data_element.data_element_path IS NULL;
+
+ALTER TABLE data_element
+    ALTER COLUMN data_element_path SET NOT NULL;
+CREATE INDEX IF NOT EXISTS data_element_path_idx
+    ON data_element USING GIST (data_element_path);
+
+CREATE OR REPLACE FUNCTION set_data_element_path() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    IF NEW.parent_data_element_global_identifier IS NULL THEN
+        NEW.data_element_path := text2ltree(NEW.data_element_id::TEXT);
+    ELSE
+        SELECT data_element_path || NEW.data_element_id::TEXT
+        INTO NEW.data_element_path
+        FROM data_element
+        WHERE data_element_global_identifier = NEW.parent_data_element_global_identifier;
+    END IF;
+    RETURN NEW;
+END;
+$$;
+COMMENT ON FUNCTION set_data_element_path() IS 'Sets the path of a data element to be stored by appending its '
+    'surrogate key to the path of its parent data element.';
+CREATE OR REPLACE TRIGGER data_element_path_trigger
+    BEFORE INSERT
+    ON data_element
+    FOR EACH ROW
+EXECUTE FUNCTION set_data_element_path();
+
+END TRANSACTION;
@@ -0,0 +1,48 @@
+-- Adds the version of the catalog and the triggers that increment it and notify listeners whenever the catalog
+-- changes, to databases created by a previous version of DaQSS.
+\c daqss
+START TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS catalog_version
+(
+    version BIGINT NOT NULL
+);
+COMMENT ON TABLE catalog_version IS 'Contains a single row holding the version of the catalog, i.e., of the tables '
+    'holding levels of data granularity, DQ dimensions, DQ metrics, aggregation constraints, aggregation functions, '
+    'and aggregation processes. The version is incremented whenever one of these tables is changed.';
+INSERT INTO catalog_version (version)
+SELECT 0
+WHERE NOT EXISTS (SELECT FROM catalog_version);
+
+CREATE OR REPLACE FUNCTION notify_catalog_change() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    new_version BIGINT;
+BEGIN
+    UPDATE catalog_version SET version = version + 1 RETURNING version INTO new_version;
+    PERFORM pg_notify('daqss_catalog', new_version::TEXT);
+    RETURN NULL;
+END;
+$$;
+COMMENT ON FUNCTION notify_catalog_change() IS 'Increments the version of the catalog and notifies listeners on the '
+    'channel "daqss_catalog" once the changing transaction is committed.';
+
+DO
+$$
+    DECLARE
+        catalog_table TEXT;
+    BEGIN
+        FOREACH catalog_table IN ARRAY ARRAY ['levels_of_data_granularity', 'dq_dimension', 'dq_metric',
+            'metric_computes_value_for_dimension', 'aggregation_constraint', 'aggregation_function',
+            'aggregation_process', 'aggregation_process_is_based_on',
+            'aggregation_process_computes_value_for_dimension']
+            LOOP
+                EXECUTE format('CREATE OR REPLACE TRIGGER %I AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON %I ' ||
+                               'FOR EACH STATEMENT EXECUTE FUNCTION notify_catalog_change()',
+                               catalog_table || '_catalog_change_trigger', catalog_table);
+            END LOOP;
+    END
+$$;
+
+END TRANSACTION;
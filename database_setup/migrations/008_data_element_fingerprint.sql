@@ -0,0 +1,22 @@
+-- Adds the table holding the fingerprints of measured data elements, which allow skipping unchanged data elements
+-- when DQ metrics are run again, to databases created by a previous version of DaQSS.
+\c daqss
+START TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS data_element_fingerprint
+(
+    data_element_id        BIGINT NOT NULL REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    measured_by_dq_metric  TEXT   NOT NULL REFERENCES dq_metric (metric_name) ON DELETE CASCADE,
+    fingerprint            BIGINT NOT NULL,
+    implementation_hash    TEXT,
+    CONSTRAINT data_element_fingerprint_pk PRIMARY KEY (data_element_id, measured_by_dq_metric)
+);
+COMMENT ON TABLE data_element_fingerprint IS 'Contains a fingerprint of the content of a data element at the time '
+    'the most recent DQ measurement result was computed on it by a DQ metric. Data elements whose fingerprint is '
+    'unchanged need not be measured again by the same implementation of the DQ metric.';
+COMMENT ON COLUMN data_element_fingerprint.fingerprint IS
+    'A 64-bit hash of the values of the data element, e.g., of a row or a column.';
+COMMENT ON COLUMN data_element_fingerprint.implementation_hash IS
+    'The hash of the implementation of the DQ metric by which the data element was measured.';
+
+END TRANSACTION;
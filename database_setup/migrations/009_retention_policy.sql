@@ -0,0 +1,71 @@
+-- Adds the retention policies and the table holding compacted DQ results, as well as the indexes used to find the
+-- DQ results to be compacted, to databases created by a previous version of DaQSS.
+\c daqss
+START TRANSACTION;
+
+CREATE INDEX IF NOT EXISTS dq_result_metric_timestamp_idx
+    ON dq_result (calculated_by_dq_metric, creation_timestamp)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dq_result_aggregation_process_timestamp_idx
+    ON dq_result (calculated_by_aggregation_process, creation_timestamp)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS retention_policy
+(
+    applies_to_dq_metric           TEXT REFERENCES dq_metric (metric_name) ON DELETE CASCADE,
+    applies_to_aggregation_process TEXT REFERENCES aggregation_process (aggregation_process_name) ON DELETE CASCADE,
+    raw_retention_days             INTEGER NOT NULL CHECK (raw_retention_days > 0),
+    rollup_granularity             TEXT    NOT NULL CHECK (rollup_granularity IN ('day', 'week')),
+    CONSTRAINT retention_policy_dq_metric_xor_aggregation_process CHECK (
+        (applies_to_dq_metric IS NOT NULL AND applies_to_aggregation_process IS NULL) OR
+        (applies_to_dq_metric IS NULL AND applies_to_aggregation_process IS NOT NULL))
+);
+COMMENT ON TABLE retention_policy IS 'Defines for a DQ metric or an aggregation process how long its DQ results are '
+    'kept in the table "dq_result", before they are compacted into the table "dq_result_rollup".';
+COMMENT ON COLUMN retention_policy.raw_retention_days IS
+    'The number of days for which DQ results are kept at full resolution.';
+COMMENT ON COLUMN retention_policy.rollup_granularity IS
+    'The period, either "day" or "week", per which older DQ results of a data element are compacted into one row.';
+
+CREATE UNIQUE INDEX IF NOT EXISTS retention_policy_dq_metric_idx
+    ON retention_policy (applies_to_dq_metric)
+    WHERE applies_to_dq_metric IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS retention_policy_aggregation_process_idx
+    ON retention_policy (applies_to_aggregation_process)
+    WHERE applies_to_aggregation_process IS NOT NULL;
+
+CREATE TABLE IF NOT EXISTS dq_result_rollup
+(
+    bucket_start                      TIMESTAMP NOT NULL,
+    bucket_granularity                TEXT      NOT NULL CHECK (bucket_granularity IN ('day', 'week')),
+    computed_on_data_element_id       BIGINT    NOT NULL
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    calculated_by_dq_metric           TEXT REFERENCES dq_metric (metric_name),
+    calculated_by_aggregation_process TEXT REFERENCES aggregation_process (aggregation_process_name),
+    result_count                      BIGINT    NOT NULL,
+    minimum_value                     NUMERIC   NOT NULL,
+    maximum_value                     NUMERIC   NOT NULL,
+    sum_value                         NUMERIC   NOT NULL,
+    last_value                        NUMERIC   NOT NULL,
+    last_timestamp                    TIMESTAMP NOT NULL,
+    CONSTRAINT rollup_calculated_by_dq_metric_xor_aggregation_process CHECK (
+        (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
+        (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL))
+);
+COMMENT ON TABLE dq_result_rollup IS 'Stores the DQ results that were compacted according to a retention policy. '
+    'Each row summarizes the DQ results computed on a data element by a DQ metric or an aggregation process within '
+    'a day or a week, which starts at "bucket_start".';
+COMMENT ON COLUMN dq_result_rollup.sum_value IS
+    'The sum of the compacted result values, which allows merging rows and computing their mean.';
+COMMENT ON COLUMN dq_result_rollup.last_value IS
+    'The most recent of the compacted result values, which was computed at "last_timestamp".';
+
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_rollup_data_element_metric_idx
+    ON dq_result_rollup (computed_on_data_element_id, calculated_by_dq_metric, bucket_granularity, bucket_start)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE UNIQUE INDEX IF NOT EXISTS dq_result_rollup_data_element_aggregation_process_idx
+    ON dq_result_rollup (computed_on_data_element_id, calculated_by_aggregation_process, bucket_granularity,
+                         bucket_start)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+END TRANSACTION;
@@ -0,0 +1,66 @@
+-- Adds the table holding DQ results stored in batches and the view combining them with the DQ results of the table
+-- "dq_result" to databases created by a previous version of DaQSS.
+\c daqss
+START TRANSACTION;
+
+CREATE TABLE IF NOT EXISTS dq_result_batch
+(
+    dq_result_batch_id                BIGINT GENERATED ALWAYS AS IDENTITY
+        CONSTRAINT dq_result_batch_pk PRIMARY KEY,
+    creation_timestamp                TIMESTAMP          NOT NULL,
+    parent_data_element_id            BIGINT             NOT NULL
+        REFERENCES data_element (data_element_id) ON DELETE CASCADE,
+    calculated_by_dq_metric           TEXT REFERENCES dq_metric (metric_name),
+    calculated_by_aggregation_process TEXT REFERENCES aggregation_process (aggregation_process_name),
+    result_count                      INTEGER            NOT NULL,
+    data_element_ids                  BIGINT[]           COMPRESSION lz4 NOT NULL,
+    result_values                     DOUBLE PRECISION[] COMPRESSION lz4 NOT NULL,
+    CONSTRAINT batch_calculated_by_dq_metric_xor_aggregation_process CHECK (
+        (calculated_by_dq_metric IS NOT NULL AND calculated_by_aggregation_process IS NULL) OR
+        (calculated_by_dq_metric IS NULL AND calculated_by_aggregation_process IS NOT NULL)),
+    CONSTRAINT batch_arrays_of_equal_length CHECK (
+        cardinality(data_element_ids) = result_count AND cardinality(result_values) = result_count)
+);
+COMMENT ON TABLE dq_result_batch IS 'Stores the DQ results computed by a DQ metric or an aggregation process at the '
+    'same point in time on the children of a data element as a single row, instead of one row per DQ result in the '
+    'table "dq_result". The arrays are compressed by PostgreSQL once they exceed about 2 kB.';
+COMMENT ON COLUMN dq_result_batch.parent_data_element_id IS
+    'References the data element that contains the data elements on which the DQ results have been computed.';
+COMMENT ON COLUMN dq_result_batch.result_count IS
+    'The number of DQ results in the batch, i.e., the length of both arrays.';
+COMMENT ON COLUMN dq_result_batch.data_element_ids IS
+    'The surrogate keys of the data elements on which the DQ results have been computed, in ascending order.';
+COMMENT ON COLUMN dq_result_batch.result_values IS
+    'The result values, whereby each one belongs to the data element at the same position of "data_element_ids".';
+
+CREATE INDEX IF NOT EXISTS dq_result_batch_parent_idx
+    ON dq_result_batch (parent_data_element_id);
+CREATE INDEX IF NOT EXISTS dq_result_batch_metric_timestamp_idx
+    ON dq_result_batch (calculated_by_dq_metric, creation_timestamp)
+    WHERE calculated_by_dq_metric IS NOT NULL;
+CREATE INDEX IF NOT EXISTS dq_result_batch_aggregation_process_timestamp_idx
+    ON dq_result_batch (calculated_by_aggregation_process, creation_timestamp)
+    WHERE calculated_by_aggregation_process IS NOT NULL;
+
+CREATE OR REPLACE VIEW dq_result_all AS
+SELECT creation_timestamp,
+       result_value,
+       computed_on_data_element_id,
+       calculated_by_dq_metric,
+       calculated_by_aggregation_process
+FROM dq_result
+UNION ALL
+SELECT dq_result_batch.creation_timestamp,
+       CAST(entry.result_value AS NUMERIC),
+       entry.data_element_id,
+       dq_result_batch.calculated_by_dq_metric,
+       dq_result_batch.calculated_by_aggregation_process
+FROM dq_result_batch
+         CROSS JOIN LATERAL unnest(dq_result_batch.data_element_ids,
+                                   dq_result_batch.result_values) AS entry (data_element_id, result_value);
+COMMENT ON VIEW dq_result_all IS 'Provides all DQ results at full resolution with the columns of the table '
+    '"dq_result", regardless of whether they are stored in the table "dq_result" or in the table "dq_result_batch". '
+    'Queries that read the table "dq_result", e.g., the queries of aggregation processes, do not see DQ results '
+    'stored in batches and must read this view instead.';
+
+END TRANSACTION;
@@ -0,0 +1,176 @@
+-- Renames the table "dq_result" to "dq_result_row" and replaces it by a view, which combines the DQ results of the
+-- table with the DQ results stored in batches, such that SQL reading "dq_result" sees all DQ results. Moreover, the
+-- DQ results stored in batches are recorded in the table "dq_result_latest" lazily from now on, in databases created
+-- by a previous version of DaQSS.
+\c daqss
+START TRANSACTION;
+
+DROP VIEW IF EXISTS dq_result_all;
+
+SELECT relkind = 'p' AS dq_result_is_table
+FROM pg_class
+WHERE oid = 'dq_result'::regclass \gset
+
+\if :dq_result_is_table
+ALTER TABLE dq_result
+    RENAME TO dq_result_row;
+
+DO
+$$
+    DECLARE
+        partition_name TEXT;
+    BEGIN
+        FOR partition_name IN SELECT child.relname
+                              FROM pg_inherits
+                                       JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid
+                              WHERE pg_inherits.inhparent = 'dq_result_row'::regclass
+                                AND child.relname ~ '^dq_result_([0-9]{4}_[0-9]{2}|default)$'
+            LOOP
+                EXECUTE format('ALTER TABLE %I RENAME TO %I', partition_name,
+                               'dq_result_row_' || substr(partition_name, length('dq_result_') + 1));
+            END LOOP;
+    END
+$$;
+\else
+\echo 'The table "dq_result" has already been renamed to "dq_result_row".'
+\endif
+
+COMMENT ON TABLE dq_result_row IS 'Stores DQ results computed on a data element either by a DQ metric or'
+    ' an aggregation process as one row per DQ result. The table is partitioned by month based on the column '
+    '"creation_timestamp". The view "dq_result" combines its DQ results with the ones stored in batches.';
+COMMENT ON TABLE dq_result_row_default IS 'Stores DQ results for whose creation timestamp no monthly partition '
+    'of the table "dq_result_row" exists.';
+
+CREATE OR REPLACE FUNCTION create_dq_result_partition(month_date DATE) RETURNS TEXT
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    first_day      DATE := date_trunc('month', month_date)::DATE;
+    partition_name TEXT := 'dq_result_row_' || to_char(first_day, 'YYYY_MM');
+BEGIN
+    EXECUTE format('CREATE TABLE IF NOT EXISTS %I PARTITION OF dq_result_row FOR VALUES FROM (%L) TO (%L)',
+                   partition_name, first_day, (first_day + INTERVAL '1 month')::DATE);
+    RETURN partition_name;
+END;
+$$;
+COMMENT ON FUNCTION create_dq_result_partition(DATE) IS 'Creates the partition of the table "dq_result_row" that '
+    'holds the DQ results created in the month of the given date, unless it already exists, and returns its name.';
+
+-- The DQ results of existing batches have been recorded in the table "dq_result_latest" when they were stored
+ALTER TABLE dq_result_batch
+    ADD COLUMN IF NOT EXISTS is_latest_pending BOOLEAN NOT NULL DEFAULT FALSE;
+ALTER TABLE dq_result_batch
+    ALTER COLUMN is_latest_pending SET DEFAULT TRUE;
+COMMENT ON TABLE dq_result_batch IS 'Stores the DQ results computed by a DQ metric or an aggregation process at the '
+    'same point in time on the children of a data element as a single row, instead of one row per DQ result in the '
+    'table "dq_result_row". The arrays are compressed by PostgreSQL once they exceed about 2 kB.';
+COMMENT ON COLUMN dq_result_batch.is_latest_pending IS
+    'Whether the DQ results of the batch have not been recorded in the table "dq_result_latest" yet.';
+
+DROP INDEX IF EXISTS dq_result_batch_parent_idx;
+CREATE INDEX IF NOT EXISTS dq_result_batch_parent_timestamp_idx
+    ON dq_result_batch (parent_data_element_id, creation_timestamp);
+CREATE INDEX IF NOT EXISTS dq_result_batch_latest_pending_idx
+    ON dq_result_batch (dq_result_batch_id)
+    WHERE is_latest_pending;
+
+COMMENT ON TABLE dq_result_latest IS 'Stores the most recent DQ result computed on a data element by each DQ metric '
+    'and each aggregation process. The table is maintained whenever DQ results are stored in the table '
+    '"dq_result_row". DQ results stored in batches are recorded by the function "refresh_dq_result_latest".';
+COMMENT ON TABLE retention_policy IS 'Defines for a DQ metric or an aggregation process how long its DQ results are '
+    'kept at full resolution in the view "dq_result", before they are compacted into the table "dq_result_rollup".';
+
+CREATE OR REPLACE VIEW dq_result AS
+SELECT creation_timestamp,
+       result_value,
+       computed_on_data_element_id,
+       calculated_by_dq_metric,
+       calculated_by_aggregation_process
+FROM dq_result_row
+UNION ALL
+SELECT dq_result_batch.creation_timestamp,
+       CAST(entry.result_value AS NUMERIC),
+       entry.data_element_id,
+       dq_result_batch.calculated_by_dq_metric,
+       dq_result_batch.calculated_by_aggregation_process
+FROM dq_result_batch
+         CROSS JOIN LATERAL unnest(dq_result_batch.data_element_ids,
+                                   dq_result_batch.result_values) AS entry (data_element_id, result_value);
+COMMENT ON VIEW dq_result IS 'Provides all DQ results at full resolution, regardless of whether they are stored as '
+    'one row per DQ result in the table "dq_result_row" or in batches in the table "dq_result_batch". DQ results '
+    'inserted into the view are stored in the table "dq_result_row".';
+
+CREATE OR REPLACE FUNCTION insert_dq_result() RETURNS TRIGGER
+    LANGUAGE plpgsql AS
+$$
+BEGIN
+    INSERT INTO dq_result_row (creation_timestamp, result_value, computed_on_data_element_id,
+                               calculated_by_dq_metric, calculated_by_aggregation_process)
+    VALUES (NEW.creation_timestamp, NEW.result_value, NEW.computed_on_data_element_id,
+            NEW.calculated_by_dq_metric, NEW.calculated_by_aggregation_process);
+    RETURN NEW;
+END;
+$$;
+COMMENT ON FUNCTION insert_dq_result() IS 'Stores a DQ result inserted into the view "dq_result" in the table '
+    '"dq_result_row".';
+CREATE OR REPLACE TRIGGER dq_result_insert_trigger
+    INSTEAD OF INSERT
+    ON dq_result
+    FOR EACH ROW
+EXECUTE FUNCTION insert_dq_result();
+
+CREATE OR REPLACE FUNCTION refresh_dq_result_latest() RETURNS BIGINT
+    LANGUAGE plpgsql AS
+$$
+DECLARE
+    refreshed BIGINT;
+BEGIN
+    WITH pending AS (
+        UPDATE dq_result_batch
+            SET is_latest_pending = FALSE
+            WHERE is_latest_pending
+            RETURNING creation_timestamp, calculated_by_dq_metric, calculated_by_aggregation_process,
+                data_element_ids, result_values),
+         latest AS (
+             SELECT DISTINCT ON (entry.data_element_id, pending.calculated_by_dq_metric,
+                 pending.calculated_by_aggregation_process) pending.creation_timestamp,
+                                                            CAST(entry.result_value AS NUMERIC) AS result_value,
+                                                            entry.data_element_id,
+                                                            pending.calculated_by_dq_metric,
+                                                            pending.calculated_by_aggregation_process
+             FROM pending
+                      CROSS JOIN LATERAL unnest(pending.data_element_ids,
+                                                pending.result_values) AS entry (data_element_id, result_value)
+             ORDER BY entry.data_element_id, pending.calculated_by_dq_metric,
+                      pending.calculated_by_aggregation_process, pending.creation_timestamp DESC),
+         by_dq_metric AS (
+             INSERT INTO dq_result_latest (creation_timestamp, result_value, computed_on_data_element_id,
+                                           calculated_by_dq_metric, calculated_by_aggregation_process)
+                 SELECT * FROM latest WHERE calculated_by_dq_metric IS NOT NULL
+                 ON CONFLICT (computed_on_data_element_id, calculated_by_dq_metric)
+                     WHERE calculated_by_dq_metric IS NOT NULL
+                     DO UPDATE SET creation_timestamp = EXCLUDED.creation_timestamp,
+                                   result_value = EXCLUDED.result_value
+                     WHERE dq_result_latest.creation_timestamp <= EXCLUDED.creation_timestamp
+                 RETURNING 1),
+         by_aggregation_process AS (
+             INSERT INTO dq_result_latest (creation_timestamp, result_value, computed_on_data_element_id,
+                                           calculated_by_dq_metric, calculated_by_aggregation_process)
+                 SELECT * FROM latest WHERE calculated_by_aggregation_process IS NOT NULL
+                 ON CONFLICT (computed_on_data_element_id, calculated_by_aggregation_process)
+                     WHERE calculated_by_aggregation_process IS NOT NULL
+                     DO UPDATE SET creation_timestamp = EXCLUDED.creation_timestamp,
+                                   result_value = EXCLUDED.result_value
+                     WHERE dq_result_latest.creation_timestamp <= EXCLUDED.creation_timestamp
+                 RETURNING 1)
+    SELECT (SELECT count(*) FROM by_dq_metric) + (SELECT count(*) FROM by_aggregation_process)
+    INTO refreshed;
+    RETURN refreshed;
+END;
+$$;
+COMMENT ON FUNCTION refresh_dq_result_latest() IS 'Records the DQ results of the batches stored since the last '
+    'call in the table "dq_result_latest", unless more recent DQ results are recorded already, and returns the '
+    'number of DQ results recorded. Batches are not recorded when they are stored, such that storing them does not '
+    'write one row per DQ result.';
+
+END TRANSACTION;
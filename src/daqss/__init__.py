@@ -1,7 +1,32 @@
+import importlib
+
 from daqss.environment_variables import EnvironmentVariables
 from daqss.levels_of_data_granularity import *
-from daqss.api import *
 
-__all__ = ["DaQSS", "EnvironmentVariables", "LevelOfDataGranularity", "VALUE", "ROW", "COLUMN", "TABLE",
-           "DATABASE", "SYSTEM"]
+_LAZY_SYMBOLS: dict[str, str] = {"AsyncDaQSS": "daqss.async_api", "Catalog": "daqss.catalog", "DaQSS": "daqss.api",
+                                 "DataElement": "daqss.api", "IncrementalMeasurement": "daqss.api",
+                                 "OperationEvent": "daqss.instrumentation",
+                                 "PrometheusExporter": "daqss.instrumentation", "add_hook": "daqss.instrumentation",
+                                 "remove_hook": "daqss.instrumentation", "ResultSink": "daqss.result_sink"}
+"""Maps the symbols that depend on Pandas, SQLAlchemy, or Dill to the modules defining them. These modules are only
+imported when one of their symbols is accessed for the first time, such that importing the package, e.g., for using
+the levels of data granularity, stays fast."""
+
+
+def __getattr__(name: str):
+    module: str | None = _LAZY_SYMBOLS.get(name)
+    if module is None:
+        raise AttributeError(f"module \"{__name__}\" has no attribute \"{name}\"")
+    symbol = getattr(importlib.import_module(module), name)
+    globals()[name] = symbol
+    return symbol
+
+
+def __dir__() -> list[str]:
+    return sorted(set(globals()) | set(_LAZY_SYMBOLS))
+
+
+__all__ = ["AsyncDaQSS", "Catalog", "DaQSS", "DataElement", "EnvironmentVariables", "IncrementalMeasurement",
+           "LevelOfDataGranularity", "OperationEvent", "PrometheusExporter", "ResultSink", "add_hook", "remove_hook",
+           "VALUE", "ROW", "COLUMN", "TABLE", "DATABASE", "SYSTEM"]
 """Defines which symbols are available when importing the `daqss` package."""
@@ -0,0 +1,257 @@
+"""Provides the execution of aggregation processes. The constraint formulas and aggregation function expressions of an
+aggregation process are translated into a single SQL `CASE` expression, such that the aggregation is performed by
+PostgreSQL. Aggregation processes that use constructs of CobADQs custom language beyond the supported subset are
+evaluated on a [Pandas DataFrame][pandas.DataFrame] instead.
+
+The supported subset consists of numeric literals, column names, the arithmetic operators `+`, `-`, `*`, and `/`,
+the comparison operators `<`, `<=`, `>`, `>=`, `=`, `==`, `!=`, and `<>`, the logical operators `and`, `or`, and
+`not`, parentheses, the aggregate functions `avg`, `mean`, `sum`, `min`, `max`, and `count`, and the constraint
+`else`."""
+import re
+from typing import Iterator
+
+import pandas
+
+ELSE: str = "else"
+"""The aggregation constraint that is fulfilled if no other aggregation constraint of an aggregation process is
+fulfilled."""
+
+_TOKEN: re.Pattern = re.compile(
+    r"\s*(?:(?P<number>(?:\d+\.?\d*|\.\d+)(?:[eE][+-]?\d+)?)|(?P<name>[A-Za-z_][A-Za-z0-9_]*)" +
+    r"|(?P<operator><=|>=|==|!=|<>|[-+*/<>=()]))")
+
+_AGGREGATE_FUNCTIONS: dict[str, str] = {"avg": "avg", "mean": "avg", "sum": "sum", "min": "min", "max": "max",
+                                        "count": "count"}
+"""Maps the names of the supported aggregate functions to their names in PostgreSQL."""
+
+_COMPARISON_OPERATORS: dict[str, str] = {"<": "<", "<=": "<=", ">": ">", ">=": ">=", "=": "=", "==": "=",
+                                         "!=": "<>", "<>": "<>"}
+"""Maps the supported comparison operators to their counterparts in PostgreSQL."""
+
+_PANDAS_OPERATOR: re.Pattern = re.compile(r"(?P<quoted>'[^']*'|\"[^\"]*\")|<>|(?<![<>=!])=(?!=)")
+"""Matches the comparison operators `=` and `<>`, which are written differently in expressions evaluated by Pandas,
+outside of quoted strings."""
+
+_NUMBER: str = "number"
+_BOOLEAN: str = "boolean"
+
+
+def _tokenize(expression: str) -> Iterator[str]:
+    position: int = 0
+    expression = expression.rstrip()
+    while position < len(expression):
+        match: re.Match | None = _TOKEN.match(expression, position)
+        if match is None:
+            raise ValueError(f"The expression \"{expression}\" contains an unsupported construct at position " +
+                             f"{position}.")
+        position = match.end()
+        yield match.group(match.lastgroup)
+
+
+class _Translator:
+    """Translates a single constraint formula or aggregation function expression into SQL by recursive descent.
+    Column names are translated into references to the columns of the subquery `aggregation_values`."""
+
+    def __init__(self, expression: str) -> None:
+        self._expression: str = expression
+        self._tokens: list[str] = list(_tokenize(expression))
+        self._position: int = 0
+        self._aggregate_depth: int = 0
+
+        self.aggregated: bool = False
+        """Whether the expression contains an aggregate function."""
+
+        self.plain_columns: bool = False
+        """Whether the expression references a column outside an aggregate function."""
+
+    def translate(self, expected_type: str) -> str:
+        sql, result_type = self._disjunction()
+        if self._position < len(self._tokens):
+            self._unsupported(f"the unexpected token \"{self._tokens[self._position]}\"")
+        if result_type != expected_type:
+            self._unsupported(f"a {result_type} result, whereas a {expected_type} result is expected")
+        return sql
+
+    def _unsupported(self, reason: str):
+        raise ValueError(f"The expression \"{self._expression}\" cannot be translated into SQL, since it contains " +
+                         f"{reason}.")
+
+    def _peek(self) -> str | None:
+        return self._tokens[self._position] if self._position < len(self._tokens) else None
+
+    def _accept(self, *tokens: str) -> str | None:
+        token: str | None = self._peek()
+        if token is not None and token.lower() in tokens:
+            self._position += 1
+            return token.lower()
+        return None
+
+    def _expect(self, token: str) -> None:
+        if self._accept(token) is None:
+            self._unsupported(f"no \"{token}\" where it is expected")
+
+    def _operands(self, operands: list[tuple[str, str]], expected_type: str) -> list[str]:
+        if any(result_type != expected_type for _, result_type in operands):
+            self._unsupported(f"an operator that is applied to an operand that is not a {expected_type}")
+        return [sql for sql, _ in operands]
+
+    def _disjunction(self) -> tuple[str, str]:
+        operands: list[tuple[str, str]] = [self._conjunction()]
+        while self._accept("or") is not None:
+            operands.append(self._conjunction())
+        if len(operands) == 1:
+            return operands[0]
+        return "(" + " OR ".join(self._operands(operands, _BOOLEAN)) + ")", _BOOLEAN
+
+    def _conjunction(self) -> tuple[str, str]:
+        operands: list[tuple[str, str]] = [self._negation()]
+        while self._accept("and") is not None:
+            operands.append(self._negation())
+        if len(operands) == 1:
+            return operands[0]
+        return "(" + " AND ".join(self._operands(operands, _BOOLEAN)) + ")", _BOOLEAN
+
+    def _negation(self) -> tuple[str, str]:
+        if self._accept("not") is not None:
+            return "(NOT " + self._operands([self._negation()], _BOOLEAN)[0] + ")", _BOOLEAN
+        return self._comparison()
+
+    def _comparison(self) -> tuple[str, str]:
+        left: tuple[str, str] = self._sum()
+        operator: str | None = self._accept(*_COMPARISON_OPERATORS)
+        if operator is None:
+            return left
+        operands: list[str] = self._operands([left, self._sum()], _NUMBER)
+        return f"({operands[0]} {_COMPARISON_OPERATORS[operator]} {operands[1]})", _BOOLEAN
+
+    def _sum(self) -> tuple[str, str]:
+        sql, result_type = self._product()
+        while (operator := self._accept("+", "-")) is not None:
+            operands: list[str] = self._operands([(sql, result_type), self._product()], _NUMBER)
+            sql, result_type = f"({operands[0]} {operator} {operands[1]})", _NUMBER
+        return sql, result_type
+
+    def _product(self) -> tuple[str, str]:
+        sql, result_type = self._unary()
+        while (operator := self._accept("*", "/")) is not None:
+            operands: list[str] = self._operands([(sql, result_type), self._unary()], _NUMBER)
+            if operator == "/":
+                # A division by zero results in no aggregation result instead of an error
+                sql = f"(CAST({operands[0]} AS NUMERIC) / NULLIF({operands[1]}, 0))"
+            else:
+                sql = f"({operands[0]} * {operands[1]})"
+            result_type = _NUMBER
+        return sql, result_type
+
+    def _unary(self) -> tuple[str, str]:
+        if self._accept("-") is not None:
+            return "(-" + self._operands([self._unary()], _NUMBER)[0] + ")", _NUMBER
+        if self._accept("+") is not None:
+            return self._unary()
+        return self._primary()
+
+    def _primary(self) -> tuple[str, str]:
+        token: str | None = self._peek()
+        if token is None:
+            self._unsupported("an incomplete expression")
+        if self._accept("(") is not None:
+            sql, result_type = self._disjunction()
+            self._expect(")")
+            return sql, result_type
+        if _TOKEN.fullmatch(token).lastgroup == "number":
+            self._position += 1
+            return f"CAST('{token}' AS NUMERIC)", _NUMBER
+        if _TOKEN.fullmatch(token).lastgroup != "name" or token.lower() in ("and", "or", "not", ELSE):
+            self._unsupported(f"the unexpected token \"{token}\"")
+
+        self._position += 1
+        if self._accept("(") is None:
+            if self._aggregate_depth == 0:
+                self.plain_columns = True
+            return "aggregation_values.\"" + token.replace("\"", "\"\"") + "\"", _NUMBER
+
+        if token.lower() not in _AGGREGATE_FUNCTIONS:
+            self._unsupported(f"the unsupported function \"{token}\"")
+        if self._aggregate_depth > 0:
+            self._unsupported("nested aggregate functions")
+        self.aggregated = True
+        self._aggregate_depth += 1
+        argument: str = self._operands([self._disjunction()], _NUMBER)[0]
+        self._aggregate_depth -= 1
+        self._expect(")")
+        return f"{_AGGREGATE_FUNCTIONS[token.lower()]}({argument})", _NUMBER
+
+
+def to_sql(constraints_and_functions: list[tuple[str, str]]) -> tuple[str, bool]:
+    """Translates the constraint formulas and aggregation function expressions of an aggregation process into a
+    single SQL `CASE` expression over the columns of the subquery `aggregation_values`.
+
+    Args:
+        constraints_and_functions: Pairs of a constraint formula and an aggregation function expression, in the
+            order in which the constraints are checked. The constraint `else` must be the last one, if present.
+
+    Returns:
+        A tuple containing the `CASE` expression, and whether it uses aggregate functions, such that the rows of
+        the subquery must be grouped by data element.
+
+    Raises:
+        ValueError: If a formula or expression contains constructs beyond the supported subset of CobADQs custom
+            language."""
+    branches: list[str] = []
+    otherwise: str = "NULL"
+    translators: list[_Translator] = []
+    for index, (formula, expression) in enumerate(constraints_and_functions):
+        function_translator: _Translator = _Translator(expression)
+        function_sql: str = function_translator.translate(_NUMBER)
+        translators.append(function_translator)
+        if formula.strip().lower() == ELSE:
+            if index != len(constraints_and_functions) - 1:
+                raise ValueError("The constraint \"else\" must be the last constraint of an aggregation process.")
+            otherwise = function_sql
+        else:
+            constraint_translator: _Translator = _Translator(formula)
+            branches.append(f"WHEN {constraint_translator.translate(_BOOLEAN)} THEN {function_sql}")
+            translators.append(constraint_translator)
+
+    aggregated: bool = any(translator.aggregated for translator in translators)
+    if aggregated and any(translator.plain_columns for translator in translators):
+        raise ValueError("Columns that are referenced outside aggregate functions cannot be translated into SQL, " +
+                         "if other columns are aggregated.")
+    if len(branches) == 0:
+        return otherwise, aggregated
+    return "CASE " + " ".join(branches) + f" ELSE {otherwise} END", aggregated
+
+
+def _to_pandas(expression: str) -> str:
+    """Rewrites the comparison operators `=` and `<>` of a formula or expression into `==` and `!=`, since `=` denotes
+    an assignment and `<>` is not supported by [`DataFrame.eval`][pandas.DataFrame.eval]."""
+    return _PANDAS_OPERATOR.sub(lambda match: match.group("quoted") or ("!=" if match.group() == "<>" else "=="),
+                                expression)
+
+
+def evaluate(constraints_and_functions: list[tuple[str, str]], values: pandas.DataFrame) -> pandas.Series:
+    """Evaluates the constraint formulas and aggregation function expressions of an aggregation process on each
+    row of a DataFrame using [`DataFrame.eval`][pandas.DataFrame.eval]. Each row is assigned the result of the
+    aggregation function paired with the first constraint it fulfills. Like in SQL, a division by zero results in a
+    missing aggregation result instead of an infinite one.
+
+    Args:
+        constraints_and_functions: Pairs of a constraint formula and an aggregation function expression, in the
+            order in which the constraints are checked.
+        values: The values to be aggregated, one row per data element.
+
+    Returns:
+        A series containing one aggregation result per row of the DataFrame, which is missing for rows that fulfill
+        no constraint."""
+    results: pandas.Series = pandas.Series(float("nan"), index=values.index, dtype=float)
+    assigned: pandas.Series = pandas.Series(False, index=values.index)
+    for formula, expression in constraints_and_functions:
+        if formula.strip().lower() == ELSE:
+            fulfilled: pandas.Series = ~assigned
+        else:
+            fulfilled: pandas.Series = pandas.Series(values.eval(_to_pandas(formula)), index=values.index) \
+                .astype(bool) & ~assigned
+        result: pandas.Series = pandas.Series(values.eval(_to_pandas(expression)), index=values.index, dtype=float)
+        results = results.mask(fulfilled, result.replace([float("inf"), float("-inf")], float("nan")))
+        assigned |= fulfilled
+    return results
@@ -1,8 +1,15 @@
+import functools
+import inspect
+import io
 import os
-from collections import namedtuple
-from typing import Callable
-from datetime import datetime, timezone
-import dill
+import tempfile
+import threading
+import time
+from collections import OrderedDict, namedtuple
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, BinaryIO, Callable, Iterable, Iterator
+from datetime import date, datetime, timedelta, timezone
 import logging
 
 import pandas
@@ -10,21 +17,573 @@ import sqlalchemy.engine.base
 
 from daqss import EnvironmentVariables
 from daqss import LevelOfDataGranularity
+from daqss import aggregation_execution
+from daqss import instrumentation
+from daqss import metric_execution
+from daqss import sharding
+from daqss.catalog import Catalog
+from daqss.metric_cache import DQMetricCache, hash_implementation
+from daqss.levels_of_data_granularity import COLUMN, ROW
 
 try:
     import pretty_errors
 except ModuleNotFoundError:
     pass
 
-from dotenv import load_dotenv
-from sqlalchemy import Engine, Row, create_engine, text, ResultProxy
-from sqlalchemy.exc import IntegrityError
+from sqlalchemy import Engine, Row, create_engine, event, text, ResultProxy
+from sqlalchemy.exc import DBAPIError, IntegrityError
+from sqlalchemy.util import await_only
+
+if TYPE_CHECKING:
+    import pyarrow
+
+    from daqss.result_sink import ResultSink
 
 DQResult = namedtuple("DQResult", ["name", "ordering"])
 """A [named tuple][collections.namedtuple] 
 that contains the `name` and the `ordering` of a level of data granularity."""
 
+DataElement = namedtuple("DataElement",
+                         ["global_identifier", "local_identifier", "level_of_data_granularity", "parent_identifier",
+                          "children"],
+                         defaults=(None, ()))
+"""A [named tuple][collections.namedtuple] that represents a data element to be stored using
+[`store_data_elements`][src.daqss.api.DaQSS.store_data_elements].
+It contains the `global_identifier`, the `local_identifier`, the `level_of_data_granularity`, and optionally the
+`parent_identifier` of a data element. Optionally, `children` may contain further data elements, for which this data
+element is used as parent, such that whole trees of data elements can be described."""
+
+IncrementalMeasurement = namedtuple("IncrementalMeasurement", ["results", "unchanged", "rejected"])
+"""A [named tuple][collections.namedtuple] that is returned by
+[`measure_dq_metric_incrementally`][src.daqss.api.DaQSS.measure_dq_metric_incrementally].
+It contains the DQ measurement `results` computed on new or changed data elements, the row or column labels of the
+`unchanged` data elements that were skipped, and the `rejected` results that could not be stored."""
+
+_DQ_METRIC_CHUNK_SIZE: int = 100_000
+"""The default number of rows or columns that are passed to a DQ metric at once by
+[`run_dq_metric`][src.daqss.api.DaQSS.run_dq_metric]."""
+
+_COPY_CHUNK_SIZE: int = 100_000
+"""The number of rows that are sent to PostgreSQL within a single `COPY` statement during bulk ingestion."""
+
+_ROLLUP_GRANULARITIES: tuple[str, ...] = ("day", "week")
+"""The periods per which DQ results can be compacted by a retention policy."""
+
+_DQ_RESULTS_OF_BOTH_TIERS: str = (
+    "(SELECT 'raw' AS tier, creation_timestamp, result_value, computed_on_data_element_id, " +
+    "calculated_by_dq_metric, calculated_by_aggregation_process, 1 AS result_count, " +
+    "result_value AS minimum_value, result_value AS maximum_value, result_value AS last_value " +
+    "FROM dq_result " +
+    "UNION ALL " +
+    "SELECT 'rollup', bucket_start, sum_value / result_count, computed_on_data_element_id, " +
+    "calculated_by_dq_metric, calculated_by_aggregation_process, result_count, " +
+    "minimum_value, maximum_value, last_value " +
+    "FROM dq_result_rollup)")
+"""Combines the DQ results at full resolution with the compacted DQ results, whereby each compacted row is
+represented by the start of its period as creation timestamp and by the mean of its result values as result value."""
+
+_DATA_ELEMENT_ID_CACHE_SIZE: int = 1_000_000
+"""The maximum number of surrogate keys of data elements that a DaQSS instance holds in memory."""
+
+
+_bound_connection: ContextVar[tuple["DaQSS", sqlalchemy.engine.base.Connection, bool] | None] = \
+    ContextVar("_bound_connection", default=None)
+"""Holds a DaQSS instance together with a connection that the instance uses instead of connecting through its own
+engine, and whether the connection belongs to a [`session`][src.daqss.api.DaQSS.session]. Besides sessions, it is
+set by [`AsyncDaQSS`][src.daqss.async_api.AsyncDaQSS] for connections of an asynchronous engine."""
+
+_session_catalog: ContextVar[tuple["DaQSS", Catalog] | None] = ContextVar("_session_catalog", default=None)
+"""Holds a DaQSS instance together with the catalog snapshot that is loaded through the connection of its current
+[`session`][src.daqss.api.DaQSS.session], such that changes of the catalog made within the session are visible."""
+
+_engines: dict[tuple[str, tuple], Engine] = {}
+"""The engines shared by all DaQSS instances of a process, keyed by their connection string and pool options."""
+
+_engines_lock: threading.Lock = threading.Lock()
+
+_catalogs: dict[Engine, Catalog] = {}
+"""The catalog snapshots shared by all DaQSS instances of a process that share an engine."""
+
+_routers: dict[tuple[str, ...], sharding.ShardRouter] = {}
+"""The routers shared by all DaQSS instances of a process, keyed by the hosts of their shards."""
+
+
+def _pool_options() -> dict:
+    """Reads the options of the connection pool from the
+    [environment variables][src.daqss.environment_variables.EnvironmentVariables].
+
+    Returns:
+        The keyword arguments passed to SQLAlchemy when an engine is created."""
+    return {"pool_size": int(os.getenv(EnvironmentVariables.DAQSS_POOL_SIZE.value, "5")),
+            "max_overflow": int(os.getenv(EnvironmentVariables.DAQSS_POOL_MAX_OVERFLOW.value, "10")),
+            "pool_pre_ping": os.getenv(EnvironmentVariables.DAQSS_POOL_PRE_PING.value, "false").lower()
+                             in ("1", "true", "yes"),
+            "pool_recycle": int(os.getenv(EnvironmentVariables.DAQSS_POOL_RECYCLE.value, "-1"))}
 
+
+def _count_round_trip(*args) -> None:
+    instrumentation.count("round_trips")
+
+
+def _count_database_error(context) -> None:
+    if isinstance(context.sqlalchemy_exception, IntegrityError):
+        instrumentation.count("integrity_errors")
+
+
+def _instrument_engine(engine: Engine) -> None:
+    """Registers the listeners that count the round trips and the integrity errors of the operations of DaQSS on an
+    engine.
+
+    Args:
+        engine: The engine to be instrumented. For asynchronous engines, their synchronous engine is passed."""
+    event.listen(engine, "before_cursor_execute", _count_round_trip)
+    event.listen(engine, "handle_error", _count_database_error)
+
+
+def _shared_engine(connection_string: str, pool_options: dict) -> Engine:
+    """Returns the engine for a connection string and pool options, which is created on first use and shared by all
+    DaQSS instances of the process afterward.
+
+    Args:
+        connection_string: The connection string of the DaQSS database.
+        pool_options: The options of the connection pool of the engine.
+
+    Returns:
+        The shared engine."""
+    key: tuple[str, tuple] = (connection_string, tuple(sorted(pool_options.items())))
+    with _engines_lock:
+        engine: Engine | None = _engines.get(key)
+        if engine is None:
+            engine = create_engine(connection_string, **pool_options)
+            _instrument_engine(engine)
+            _engines[key] = engine
+        return engine
+
+
+def _shared_catalog(engine: Engine) -> Catalog:
+    """Returns the catalog snapshot of an engine, which is created on first use and shared by all DaQSS instances of
+    the process that use the engine afterward.
+
+    Args:
+        engine: The engine used by the catalog snapshot.
+
+    Returns:
+        The shared catalog snapshot."""
+    with _engines_lock:
+        catalog: Catalog | None = _catalogs.get(engine)
+        if catalog is None:
+            catalog = Catalog(engine, _catalog_poll_interval(), _bound_connection_outside_session)
+            _catalogs[engine] = catalog
+        return catalog
+
+
+def _catalog_poll_interval() -> float:
+    return float(os.getenv(EnvironmentVariables.DAQSS_CATALOG_POLL_INTERVAL.value, "5"))
+
+
+def _bound_connection_outside_session() -> sqlalchemy.engine.base.Connection | None:
+    """Returns the connection bound to the current call if it does not belong to a
+    [`session`][src.daqss.api.DaQSS.session], e.g., the connection of an asynchronous engine bound by
+    [`AsyncDaQSS`][src.daqss.async_api.AsyncDaQSS], such that the shared catalog snapshot is loaded without blocking
+    the event loop. The changes of a session are not committed yet, hence they are kept out of the shared snapshot."""
+    bound: tuple[DaQSS, sqlalchemy.engine.base.Connection, bool] | None = _bound_connection.get()
+    return None if bound is None or bound[2] else bound[1]
+
+
+def _shared_router(hosts: tuple[str, ...]) -> sharding.ShardRouter:
+    """Returns the router for the shards on a list of hosts, which is created on first use and shared by all DaQSS
+    instances of the process afterward, such that they share the locations of data elements.
+
+    Args:
+        hosts: The hosts of the shards, including their ports.
+
+    Returns:
+        The shared router."""
+    engines: list[Engine] = [_shared_engine(_connection_string("psycopg2", host), _pool_options()) for host in hosts]
+    with _engines_lock:
+        router: sharding.ShardRouter | None = _routers.get(hosts)
+        if router is None:
+            router = sharding.ShardRouter(engines)
+            _routers[hosts] = router
+        return router
+
+
+def _load_dotenv() -> None:
+    """Loads the environment variables defined in a `.env` file, which do not override variables that are already
+    set. The package `dotenv` is imported only when the environment is loaded, which is deferred until the first
+    access of the database."""
+    from dotenv import load_dotenv
+
+    load_dotenv()
+
+
+def _connection_string(driver: str, host: str | None = None) -> str:
+    """Creates the connection string for the DaQSS database from the
+    [environment variables][src.daqss.environment_variables.EnvironmentVariables].
+
+    Args:
+        driver: The name of the SQLAlchemy driver used for connecting to PostgreSQL, e.g. `psycopg2`.
+        host: The host of the database, including its port, e.g., of a shard. Defaults to `None`, which means that
+            the host is read from the environment variable `DAQSS_HOST`.
+
+    Returns:
+        The connection string, which can be passed to SQLAlchemy for creating an engine."""
+    _load_dotenv()
+
+    username: str | None = os.getenv(EnvironmentVariables.DAQSS_USERNAME.value)
+    if username is None:
+        logging.error("No username provided.")
+
+    password: str | None = os.getenv(EnvironmentVariables.DAQSS_PASSWORD.value)
+    if password is None:
+        logging.error("No password provided.")
+
+    host: str = host or os.getenv(EnvironmentVariables.DAQSS_HOST.value, "localhost:5432")
+    database: str = os.getenv(EnvironmentVariables.DAQSS_DATABASE.value, "daqss")
+
+    return f"postgresql+{driver}://{username}:{password}@{host}/{database}"
+
+
+def _dq_results_query(dq_metric: Callable | str | None = None, aggregation_process: str | None = None,
+                      parent: str | None = None, level_of_data_granularity: LevelOfDataGranularity | None = None,
+                      since: datetime | None = None, until: datetime | None = None,
+                      value_range: tuple[float | None, float | None] | None = None,
+                      table: str = "dq_result", subtree: str | None = None,
+                      include_rollups: bool = False) -> tuple[str, dict]:
+    """Compiles the filters of [`retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results] into a single
+    parameterized query.
+
+    Args:
+        table: The table or view from which the DQ results are retrieved, either `dq_result`, which includes the
+            DQ results stored in batches, or `dq_result_latest`.
+        subtree: The global identifier of a data element, such that only DQ results computed on this data element
+            or on data elements contained in it are retrieved.
+        include_rollups: Whether the compacted DQ results of the table `dq_result_rollup` are retrieved as well.
+
+    Returns:
+        A tuple containing the query and its parameters."""
+    conditions: list[str] = []
+    parameters: dict = {}
+    if dq_metric is not None:
+        conditions.append("dq_result.calculated_by_dq_metric = :dq_metric")
+        parameters["dq_metric"] = getattr(dq_metric, "__name__", dq_metric)
+    if aggregation_process is not None:
+        conditions.append("dq_result.calculated_by_aggregation_process = :aggregation_process")
+        parameters["aggregation_process"] = aggregation_process
+    if parent is not None:
+        conditions.append("data_element.parent_data_element_global_identifier = :parent")
+        parameters["parent"] = parent
+    if level_of_data_granularity is not None:
+        conditions.append("data_element.is_of_level_of_data_granularity = :level")
+        parameters["level"] = level_of_data_granularity.name
+    if subtree is not None:
+        conditions.append("data_element.data_element_path <@ (SELECT data_element_path FROM data_element AS root " +
+                          "WHERE root.data_element_global_identifier = :subtree)")
+        parameters["subtree"] = subtree
+    if since is not None:
+        conditions.append("dq_result.creation_timestamp >= :since")
+        parameters["since"] = since
+    if until is not None:
+        conditions.append("dq_result.creation_timestamp < :until")
+        parameters["until"] = until
+    if value_range is not None and value_range[0] is not None:
+        conditions.append("dq_result.result_value >= :minimum")
+        parameters["minimum"] = value_range[0]
+    if value_range is not None and value_range[1] is not None:
+        conditions.append("dq_result.result_value <= :maximum")
+        parameters["maximum"] = value_range[1]
+
+    query: str = ("SELECT data_element.data_element_global_identifier AS global_identifier, " +
+                  "data_element.data_element_local_identifier AS local_identifier, " +
+                  "data_element.is_of_level_of_data_granularity AS level_of_data_granularity, " +
+                  "data_element.parent_data_element_global_identifier AS parent_identifier, " +
+                  "dq_result.creation_timestamp, " +
+                  "CAST(dq_result.result_value AS DOUBLE PRECISION) AS result_value, " +
+                  "dq_result.calculated_by_dq_metric AS dq_metric, " +
+                  "dq_result.calculated_by_aggregation_process AS aggregation_process ")
+    if include_rollups:
+        query += (", dq_result.tier, dq_result.result_count, " +
+                  "CAST(dq_result.minimum_value AS DOUBLE PRECISION) AS minimum_value, " +
+                  "CAST(dq_result.maximum_value AS DOUBLE PRECISION) AS maximum_value, " +
+                  "CAST(dq_result.last_value AS DOUBLE PRECISION) AS last_value ")
+        table = _DQ_RESULTS_OF_BOTH_TIERS
+    query += (f"FROM {table} AS dq_result JOIN data_element " +
+              "ON dq_result.computed_on_data_element_id = data_element.data_element_id")
+    if len(conditions) > 0:
+        query += " WHERE " + " AND ".join(conditions)
+    return query, parameters
+
+
+def _upsert_latest_dq_results(connection: sqlalchemy.engine.base.Connection, source: str, parameters: dict,
+                              by_dq_metric: bool) -> None:
+    """Records DQ results in the table `dq_result_latest`, unless a more recent DQ result is already recorded for
+    the same data element and DQ metric or aggregation process.
+
+    Args:
+        connection: The connection, including its currently open transaction, in which the DQ results are stored.
+        source: A `VALUES` list or a query that provides the creation timestamp, the result value, the surrogate
+            key of the data element, the DQ metric, and the aggregation process of the DQ results.
+        parameters: The parameters of the source.
+        by_dq_metric: Whether the DQ results were computed by a DQ metric or by an aggregation process."""
+    result_column: str = "calculated_by_dq_metric" if by_dq_metric else "calculated_by_aggregation_process"
+    connection.execute(text(
+        "INSERT INTO dq_result_latest " +
+        "(creation_timestamp, result_value, computed_on_data_element_id, " +
+        "calculated_by_dq_metric, calculated_by_aggregation_process) " +
+        source + " " +
+        f"ON CONFLICT (computed_on_data_element_id, {result_column}) WHERE {result_column} IS NOT NULL " +
+        "DO UPDATE SET creation_timestamp = EXCLUDED.creation_timestamp, result_value = EXCLUDED.result_value " +
+        "WHERE dq_result_latest.creation_timestamp <= EXCLUDED.creation_timestamp"),
+        parameters)
+
+
+def _insert_dq_result_batches(connection: sqlalchemy.engine.base.Connection, source: str, parameters: dict) -> None:
+    """Stores DQ results in the table `dq_result_batch`, whereby the DQ results sharing their creation timestamp and
+    their DQ metric or aggregation process form one batch. Within a batch, the DQ results are ordered by the surrogate
+    keys of their data elements, which are mostly consecutive and thus compress well.
+
+    Args:
+        connection: The connection, including its currently open transaction, in which the DQ results are stored.
+        source: A query that provides the creation timestamp, the result value, the surrogate key of the data
+            element, the DQ metric, and the aggregation process of the DQ results.
+        parameters: The parameters of the source, which must include the surrogate key of the parent data element
+            of all data elements as `parent_data_element_id`."""
+    connection.execute(text(
+        "INSERT INTO dq_result_batch (creation_timestamp, parent_data_element_id, calculated_by_dq_metric, " +
+        "calculated_by_aggregation_process, result_count, data_element_ids, result_values) " +
+        "SELECT source.creation_timestamp, CAST(:parent_data_element_id AS BIGINT), source.dq_metric, " +
+        "source.aggregation_process, count(*), array_agg(source.data_element_id ORDER BY source.data_element_id), " +
+        "array_agg(source.result_value ORDER BY source.data_element_id) " +
+        f"FROM ({source}) AS source (creation_timestamp, result_value, data_element_id, dq_metric, " +
+        "aggregation_process) " +
+        "GROUP BY source.creation_timestamp, source.dq_metric, source.aggregation_process"),
+        parameters)
+
+
+def _upsert_fingerprints(connection: sqlalchemy.engine.base.Connection, source: str, parameters: dict) -> None:
+    """Records the fingerprints of data elements measured by a DQ metric in the table `data_element_fingerprint`,
+    together with the hash of the implementation of the DQ metric.
+
+    Args:
+        connection: The connection, including its currently open transaction, in which the DQ results are stored.
+        source: A `VALUES` list or a query that provides the surrogate key and the fingerprint of the data elements.
+            Data elements without a fingerprint are skipped.
+        parameters: The parameters of the source, which must include the name of the DQ metric as `metric_name`."""
+    connection.execute(text(
+        "INSERT INTO data_element_fingerprint " +
+        "(data_element_id, measured_by_dq_metric, fingerprint, implementation_hash) " +
+        "SELECT source.data_element_id, dq_metric.metric_name, source.fingerprint, dq_metric.implementation_hash " +
+        f"FROM ({source}) AS source (data_element_id, fingerprint) " +
+        "JOIN dq_metric ON dq_metric.metric_name = CAST(:metric_name AS TEXT) " +
+        "WHERE source.fingerprint IS NOT NULL " +
+        "ON CONFLICT (data_element_id, measured_by_dq_metric) " +
+        "DO UPDATE SET fingerprint = EXCLUDED.fingerprint, implementation_hash = EXCLUDED.implementation_hash"),
+        parameters)
+
+
+def _rejected_rows(values: pandas.Series, mask, reason: str) -> pandas.DataFrame:
+    """Creates a DataFrame of rejected DQ result values that retains the index of the original series.
+
+    Args:
+        values: The series of DQ result values that was supplied for storing.
+        mask: A boolean array that selects the rejected values.
+        reason: A description of why the selected values have been rejected.
+
+    Returns:
+        A DataFrame with the columns `result_value` and `reason`, indexed by the local identifiers of the rejected
+        values."""
+    rejected: pandas.DataFrame = pandas.DataFrame({"result_value": values[mask]})
+    rejected["reason"] = reason
+    return rejected
+
+
+def _copy_csv_into_table(connection: sqlalchemy.engine.base.Connection, table: str, columns: list[str],
+                         data: bytes) -> None:
+    """Copies CSV data into a table using a single PostgreSQL `COPY` statement.
+
+    Args:
+        connection: The connection, including its currently open transaction, that is used for copying.
+        table: The name of the table into which the data is copied.
+        columns: The names of the columns of the table in the order of the columns of the CSV data.
+        data: The CSV data without header. Unquoted empty values are copied as `NULL`."""
+    instrumentation.count("round_trips")
+    instrumentation.count("bytes_copied", len(data))
+    if connection.dialect.driver == "asyncpg":
+        await_only(connection.connection.driver_connection.copy_to_table(table, source=io.BytesIO(data),
+                                                                         columns=columns, format="csv"))
+        return
+
+    cursor = connection.connection.cursor()
+    try:
+        cursor.copy_expert(f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv)", io.BytesIO(data))
+    finally:
+        cursor.close()
+
+
+def _copy_dataframe_into_table(connection: sqlalchemy.engine.base.Connection, table: str,
+                               dataframe: pandas.DataFrame) -> None:
+    """Streams the content of a DataFrame into a table using PostgreSQL `COPY` in chunks of
+    [`_COPY_CHUNK_SIZE`][src.daqss.api._COPY_CHUNK_SIZE] rows, such that the memory required on the client stays
+    bounded.
+
+    Args:
+        connection: The connection, including its currently open transaction, that is used for copying.
+        table: The name of the table into which the data is copied. The column names of the DataFrame must
+            match the column names of the table.
+        dataframe: The data to be copied into the table. Missing values and empty strings are copied as `NULL`."""
+    for start in range(0, len(dataframe), _COPY_CHUNK_SIZE):
+        _copy_csv_into_table(connection, table, list(dataframe.columns),
+                             dataframe.iloc[start:start + _COPY_CHUNK_SIZE].to_csv(header=False, index=False).encode())
+
+
+def _copy_query_out(connection: sqlalchemy.engine.base.Connection, query: str, parameters: dict,
+                    parse: Callable[[BinaryIO], Iterator]) -> Iterator:
+    """Streams the rows returned by a query using PostgreSQL `COPY ... TO STDOUT WITH (FORMAT csv)`.
+    Using psycopg2, the output is passed through a pipe, into which `COPY` writes from a background thread while it
+    is parsed, such that the memory required stays bounded. Using asyncpg, the output is spooled to a temporary file
+    before it is parsed.
+
+    Args:
+        connection: The connection, including its currently open transaction, that is used for copying.
+        query: The query, whose parameters are bound like the parameters of [`text`][sqlalchemy.sql.expression.text].
+        parameters: The parameters of the query.
+        parse: A function that parses a binary file-like object providing the CSV output into an iterator.
+
+    Returns:
+        The iterator returned by the parse function."""
+    compiled = text(query).compile(dialect=connection.dialect)
+    bound_parameters: dict = compiled.construct_params(parameters)
+    instrumentation.count("round_trips")
+    if connection.dialect.driver == "asyncpg":
+        with tempfile.TemporaryFile() as spool:
+            await_only(connection.connection.driver_connection.copy_from_query(
+                compiled.string, *[bound_parameters[name] for name in compiled.positiontup], output=spool,
+                format="csv"))
+            spool.seek(0)
+            yield from parse(spool)
+        return
+
+    cursor = connection.connection.cursor()
+    statement: str = f"COPY ({cursor.mogrify(compiled.string, bound_parameters).decode()}) TO STDOUT WITH (FORMAT csv)"
+    read_descriptor, write_descriptor = os.pipe()
+    errors: list[Exception] = []
+
+    def copy() -> None:
+        try:
+            with os.fdopen(write_descriptor, "wb") as pipe:
+                cursor.copy_expert(statement, pipe)
+        except Exception as error:
+            errors.append(error)
+
+    thread: threading.Thread = threading.Thread(target=copy, name="daqss-copy-out", daemon=True)
+    thread.start()
+    try:
+        # Closing the pipe early causes COPY to fail, which ends the thread
+        with os.fdopen(read_descriptor, "rb") as pipe:
+            yield from parse(pipe)
+    finally:
+        thread.join()
+        cursor.close()
+    if len(errors) > 0:
+        raise errors[0]
+
+
+def _import_columnar():
+    """Imports the module `columnar`, which requires the optional dependency `pyarrow`.
+
+    Returns:
+        The module `columnar`.
+
+    Raises:
+        ModuleNotFoundError: If `pyarrow` is not installed."""
+    try:
+        from daqss import columnar
+    except ModuleNotFoundError as error:
+        raise ModuleNotFoundError("Exporting and importing DQ results requires the package pyarrow, which can be " +
+                                  "installed by running `pip install " +
+                                  "\"daqss[arrow] @ git+https://github.com/johannesschrott/daqss.git\"`.") from error
+    return columnar
+
+
+def _shard_of_data_element(argument: str) -> Callable[[sharding.ShardRouter, dict], int | None]:
+    """Creates the routing of [`_routed`][src.daqss.api._routed] for methods that concern a data element.
+
+    Args:
+        argument: The name of the argument holding the global identifier of the data element.
+
+    Returns:
+        A function that determines the shard holding the data element, or returns `None` if the argument is `None`,
+        such that the call is fanned out to all shards."""
+    def shard_of(router: sharding.ShardRouter, arguments: dict) -> int | None:
+        return None if arguments[argument] is None else router.shard_of(arguments[argument])
+
+    return shard_of
+
+
+def _routed(shard_of: Callable[[sharding.ShardRouter, dict], int | None] = lambda router, arguments: None,
+            combine: Callable[[list], object] | None = None) -> Callable[[Callable], Callable]:
+    """Routes the calls of a method of DaQSS to a shard, if DaQSS is sharded. Calls that are not routed to a single
+    shard are fanned out to all shards in parallel. Methods called within a routed call access the same shard.
+
+    Args:
+        shard_of: A function that receives the router and the arguments of a call, keyed by their names, and
+            determines the shard to which the call is routed, or returns `None` if the call is fanned out. Defaults to
+            a function that fans out all calls.
+        combine: A function that combines the return values of a fanned-out call, which are passed in the order of
+            the shards. The items of generator methods are yielded in the order they arrive instead.
+
+    Returns:
+        A decorator for the method."""
+    def decorator(function: Callable) -> Callable:
+        signature: inspect.Signature = inspect.signature(function)
+
+        def shard(daqss: "DaQSS", args: tuple, kwargs: dict) -> int | None:
+            arguments: inspect.BoundArguments = signature.bind(daqss, *args, **kwargs)
+            arguments.apply_defaults()
+            return shard_of(daqss._router, arguments.arguments)
+
+        if inspect.isgeneratorfunction(function):
+            @functools.wraps(function)
+            def generator_wrapper(self: "DaQSS", *args, **kwargs):
+                router: sharding.ShardRouter | None = self._router
+                if router is None or sharding.current_shard.get() is not None:
+                    yield from function(self, *args, **kwargs)
+                    return
+                target: int | None = shard(self, args, kwargs)
+                yield from router.merge(lambda _: function(self, *args, **kwargs),
+                                        None if target is None else [target])
+
+            return generator_wrapper
+
+        @functools.wraps(function)
+        def wrapper(self: "DaQSS", *args, **kwargs):
+            router: sharding.ShardRouter | None = self._router
+            if router is None or sharding.current_shard.get() is not None:
+                return function(self, *args, **kwargs)
+            target: int | None = shard(self, args, kwargs)
+            if target is None:
+                return combine(router.run(lambda _: function(self, *args, **kwargs)))
+            return router.run(lambda _: function(self, *args, **kwargs), [target])[0]
+
+        return wrapper
+
+    return decorator
+
+
+def _synchronizing_shards(function: Callable) -> Callable:
+    """Copies the catalog to the shards after each call of a method that changes the catalog, if DaQSS is sharded.
+    Within a [`session`][src.daqss.api.DaQSS.session], the catalog is copied when the session has been committed."""
+    @functools.wraps(function)
+    def wrapper(self: "DaQSS", *args, **kwargs):
+        result = function(self, *args, **kwargs)
+        if self._router is not None and not self._in_session():
+            self.synchronize_shards()
+        return result
+
+    return wrapper
+
+
+@instrumentation.instrument_public_methods("connect", "session")
 class DaQSS:
     """Instances of the class DaQSS hold the connection to the PostgreSQL database and provide functions
      that enable a convenient access to the system. As described for the initializer,
@@ -43,35 +602,969 @@ class DaQSS:
          **Optional environment variables:**
 
             - [`DAQSS_HOST`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_HOST] - default value: `localhost:5432`
+            - [`DAQSS_CATALOG_POLL_INTERVAL`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_CATALOG_POLL_INTERVAL] - default value: `5`
             - [`DAQSS_DATABASE`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_DATABASE] - default value: `daqss`
+            - [`DAQSS_METRIC_CACHE_SIZE`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_METRIC_CACHE_SIZE] - default value: `128`
+            - [`DAQSS_METRIC_CACHE_DIRECTORY`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_METRIC_CACHE_DIRECTORY] - default value: none
+            - [`DAQSS_POOL_SIZE`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_POOL_SIZE] - default value: `5`
+            - [`DAQSS_POOL_MAX_OVERFLOW`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_POOL_MAX_OVERFLOW] - default value: `10`
+            - [`DAQSS_POOL_PRE_PING`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_POOL_PRE_PING] - default value: `false`
+            - [`DAQSS_POOL_RECYCLE`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_POOL_RECYCLE] - default value: `-1`
+            - [`DAQSS_SHARD_HOSTS`][src.daqss.environment_variables.EnvironmentVariables.DAQSS_SHARD_HOSTS] - default value: none
+
+        DaQSS instances that connect to the same database using the same pool options share their connection pool.
+        The environment variables are read and the connection pool is created on the first access of the database,
+        such that creating an instance is cheap.
+        If shards are configured, data elements and DQ results are stored on the shards, whereas the catalog is
+        stored on the database configured by `DAQSS_HOST`, as described for the
+        [PostgreSQL structure](postgresql_structure.md#sharding-of-data-elements-and-dq-results).
+        Each call of a public method is recorded by the [instrumentation][src.daqss.instrumentation] of DaQSS.
+        """
+        self._lazy_engine: Engine | None = None
+        self._lazy_dq_metric_cache: DQMetricCache | None = None
+        self._lazy_catalog: Catalog | None = None
+        self._lazy_lock: threading.Lock = threading.Lock()
+        """Ensures that the cache of DQ metrics, which is not shared between instances, is created only once."""
+
+        self._lazy_router: sharding.ShardRouter | None = None
+        self._router_loaded: bool = False
+
+        self._partitioned_months: set[tuple[int | None, date]] = set()
+        """The months for which this instance has ensured that a partition of the table `dq_result_row` exists,
+        together with the shard of the table, which is `None` if DaQSS is not sharded."""
+
+        self._data_element_ids: OrderedDict[str, int] = OrderedDict()
+        """Interns the surrogate keys of the data elements, keyed by their global identifiers, that this instance has
+        recently stored or looked up, such that DQ results can reference them without querying the database. The
+        surrogate keys are discarded whenever an operation fails, e.g., because an interned data element has been
+        deleted in the meantime, and whenever DQ results are compacted."""
+
+        self._data_element_ids_lock: threading.Lock = threading.Lock()
+
+    @property
+    def _engine(self) -> Engine:
+        """The [Engine][sqlalchemy.engine.Engine] object is used for connecting to the DaQSS database when the methods
+        provided by this class are used. It is created on first access."""
+        if self._lazy_engine is None:
+            self._lazy_engine = _shared_engine(_connection_string("psycopg2"), _pool_options())
+        return self._lazy_engine
+
+    @property
+    def _router(self) -> sharding.ShardRouter | None:
+        """Routes data elements and DQ results to the shards configured by the environment variable
+        `DAQSS_SHARD_HOSTS`, or is `None` if DaQSS is not sharded. It is created on first access."""
+        if not self._router_loaded:
+            with self._lazy_lock:
+                if not self._router_loaded:
+                    _load_dotenv()
+                    hosts: tuple[str, ...] = tuple(
+                        host.strip() for host in os.getenv(EnvironmentVariables.DAQSS_SHARD_HOSTS.value, "").split(",")
+                        if host.strip() != "")
+                    if len(hosts) > 0:
+                        self._lazy_router = _shared_router(hosts)
+                    self._router_loaded = True
+        return self._lazy_router
+
+    def _current_engine(self) -> Engine:
+        """Returns the engine of the shard to which the current call is routed, or the engine of the primary database
+        if the call is not routed."""
+        shard: int | None = sharding.current_shard.get()
+        return self._engine if shard is None else self._router.engines[shard]
+
+    @property
+    def _dq_metric_cache(self) -> DQMetricCache:
+        """Holds the deserialized implementations of DQ metrics retrieved by
+        [`retrieve_dq_metric_implementation_by_name`][src.daqss.api.DaQSS.retrieve_dq_metric_implementation_by_name].
+        It is created on first access."""
+        with self._lazy_lock:
+            if self._lazy_dq_metric_cache is None:
+                _load_dotenv()
+                self._lazy_dq_metric_cache = DQMetricCache(
+                    int(os.getenv(EnvironmentVariables.DAQSS_METRIC_CACHE_SIZE.value, "128")),
+                    os.getenv(EnvironmentVariables.DAQSS_METRIC_CACHE_DIRECTORY.value))
+            return self._lazy_dq_metric_cache
+
+    @property
+    def catalog(self) -> Catalog:
+        """The [in-memory snapshot][src.daqss.catalog.Catalog] of the levels of data granularity, DQ dimensions,
+        DQ metrics, aggregation constraints, aggregation functions, and aggregation processes, from which metadata
+        is looked up without querying the database. Within a [`session`][src.daqss.api.DaQSS.session], a snapshot
+        that is loaded through the connection of the session is used instead, which includes the changes made
+        within the session."""
+        session_catalog: tuple[DaQSS, Catalog] | None = _session_catalog.get()
+        if session_catalog is not None and session_catalog[0] is self:
+            return session_catalog[1]
+        if self._lazy_catalog is None:
+            self._lazy_catalog = _shared_catalog(self._engine)
+        return self._lazy_catalog
 
+    def connect(self) -> sqlalchemy.engine.base.Connection:
+        """Returns the SQLAlchemy [Connection][sqlalchemy.engine.base.Connection] to directly
+        query the system using SQL. If DaQSS is sharded, the connection is opened to the primary database.
+
+        Returns:
+            The connection with DaQSS that can be used to query it using SQL."""
+        return self._engine.connect()
+
+    @contextmanager
+    def session(self) -> Iterator[sqlalchemy.engine.base.Connection]:
+        """Provides a unit of work, in which all functions of this DaQSS instance that are called within the same
+        thread share one connection and one transaction. The transaction is committed when the unit of work ends,
+        or rolled back if an exception is raised. If a function fails to store something, only its own changes are
+        discarded, as it is the case outside a unit of work. Nested units of work join the outermost one.
+        If DaQSS is sharded, a unit of work can only span changes of the catalog, which are copied to the shards
+        when it is committed.
+
+        Returns:
+            A context manager that provides the connection of the unit of work, which can also be used to
+            directly query the system using SQL within the same transaction.
+
+        ??? example
+            ``` python
+            with d.session():
+                d.store_dq_dimension("Completeness")
+                d.store_dq_metric(arith_mean_completeness_per_row, ["Completeness"], ROW)
+            ```
         """
-        load_dotenv()
+        bound: tuple[DaQSS, sqlalchemy.engine.base.Connection, bool] | None = _bound_connection.get()
+        if bound is not None and bound[0] is self:
+            yield bound[1]
+            return
 
-        username: str | None = os.getenv(EnvironmentVariables.DAQSS_USERNAME.value)
-        if username is None:
-            logging.error("No username provided.")
+        with self._engine.connect() as connection:
+            token = _bound_connection.set((self, connection, True))
+            catalog_token = _session_catalog.set(
+                (self, Catalog(self._engine, _catalog_poll_interval(), lambda: connection)))
+            try:
+                yield connection
+                connection.commit()
+                _shared_catalog(self._engine).invalidate()
+                if self._router is not None:
+                    self.synchronize_shards()
+            except Exception:
+                self._forget_data_element_ids()
+                raise
+            finally:
+                _session_catalog.reset(catalog_token)
+                _bound_connection.reset(token)
+
+    @contextmanager
+    def _connect(self) -> Iterator[sqlalchemy.engine.base.Connection]:
+        """Provides the connection used by the methods of this class. Usually, a new connection of the engine is
+        opened and closed again afterward. If a connection has been bound to this instance, that connection is used
+        instead and its current transaction is rolled back if an exception occurs. Within a
+        [`session`][src.daqss.api.DaQSS.session], the changes are made within a savepoint, such that only they are
+        rolled back. Since changes are discarded if an exception occurs, the interned surrogate keys of data elements
+        are discarded as well. If the current call is routed to a shard, a connection to the shard is used.
 
-        password: str | None = os.getenv(EnvironmentVariables.DAQSS_PASSWORD.value)
-        if password is None:
-            logging.error("No password provided.")
+        Returns:
+            A context manager that provides the connection.
+
+        Raises:
+            ValueError: If the current call is routed to a shard, but a connection to another database has been
+                bound to this instance."""
+        bound: tuple[DaQSS, sqlalchemy.engine.base.Connection, bool] | None = _bound_connection.get()
+        if sharding.current_shard.get() is not None and bound is not None and bound[0] is self \
+                and bound[1].engine is not self._current_engine():
+            raise ValueError("Data elements and DQ results cannot be accessed within a unit of work or " +
+                             "asynchronously if DaQSS is sharded, since they are stored on the shards.")
+        try:
+            if bound is None or bound[0] is not self:
+                start: float = time.perf_counter()
+                with self._current_engine().connect() as connection:
+                    instrumentation.count("connection_wait_seconds", time.perf_counter() - start)
+                    yield connection
+            elif bound[2]:
+                savepoint = bound[1].begin_nested()
+                try:
+                    yield bound[1]
+                except Exception:
+                    if savepoint.is_active:
+                        savepoint.rollback()
+                    raise
+                if savepoint.is_active:
+                    savepoint.commit()
+            else:
+                try:
+                    yield bound[1]
+                except Exception:
+                    bound[1].rollback()
+                    raise
+        except Exception:
+            self._forget_data_element_ids()
+            raise
+
+    def _in_session(self) -> bool:
+        bound: tuple[DaQSS, sqlalchemy.engine.base.Connection, bool] | None = _bound_connection.get()
+        return bound is not None and bound[0] is self and bound[2]
+
+    def _commit(self, connection: sqlalchemy.engine.base.Connection) -> None:
+        """Commits the current transaction of a connection, unless the connection belongs to a
+        [`session`][src.daqss.api.DaQSS.session], which is committed when it ends."""
+        if not self._in_session():
+            connection.commit()
+
+    def _rollback(self, connection: sqlalchemy.engine.base.Connection) -> None:
+        """Rolls back the current transaction of a connection or, within a
+        [`session`][src.daqss.api.DaQSS.session], the savepoint of the current function."""
+        if self._in_session():
+            connection.get_nested_transaction().rollback()
+        else:
+            connection.rollback()
+        self._forget_data_element_ids()
 
-        host: str = os.getenv(EnvironmentVariables.DAQSS_HOST.value, "localhost:5432")
-        database: str = os.getenv(EnvironmentVariables.DAQSS_DATABASE.value, "daqss")
+    def _cached_data_element_id(self, global_identifier: str) -> int | None:
+        with self._data_element_ids_lock:
+            data_element_id: int | None = self._data_element_ids.get(global_identifier)
+            if data_element_id is not None:
+                self._data_element_ids.move_to_end(global_identifier)
+            return data_element_id
 
-        connection_string: str = f"postgresql+psycopg2://{username}:{password}@{host}/{database}"
+    def _remember_data_element_ids(self, data_element_ids: Iterable[tuple[str, int]]) -> None:
+        """Interns the surrogate keys of data elements, whereby the least recently used surrogate keys are discarded
+        if more than [`_DATA_ELEMENT_ID_CACHE_SIZE`][src.daqss.api._DATA_ELEMENT_ID_CACHE_SIZE] are interned.
 
-        self._engine: Engine = create_engine(connection_string)
-        """The [Engine][sqlalchemy._engine.Engine] object is used for connecting to the DaQSS
-         database when the methods provided by this class are used."""
+        Args:
+            data_element_ids: Pairs of the global identifier and the surrogate key of data elements."""
+        with self._data_element_ids_lock:
+            for global_identifier, data_element_id in data_element_ids:
+                self._data_element_ids[global_identifier] = data_element_id
+                self._data_element_ids.move_to_end(global_identifier)
+            while len(self._data_element_ids) > _DATA_ELEMENT_ID_CACHE_SIZE:
+                self._data_element_ids.popitem(last=False)
+
+    def _forget_data_element_ids(self) -> None:
+        """Discards all interned surrogate keys of data elements, since some of them may have been created within a
+        transaction that has been rolled back or their data elements may have been deleted."""
+        with self._data_element_ids_lock:
+            self._data_element_ids.clear()
+
+    def _data_element_id(self, connection: sqlalchemy.engine.base.Connection, global_identifier: str) -> int | None:
+        """Looks up the surrogate key of a data element, which is interned after it has been looked up once.
 
-    def connect(self) -> sqlalchemy.engine.base.Connection:
-        """Returns the SQLAlchemy [Connection][sqlalchemy.engine.base.Connection] to directly
-        query the system using SQL.
+        Args:
+            connection: The connection used if the surrogate key is not interned yet.
+            global_identifier: The global identifier of the data element.
 
         Returns:
-            The connection with DaQSS that can be used to query it using SQL."""
-        return self._engine.connect()
+            The surrogate key or `None`, if the data element is not represented in DaQSS."""
+        data_element_id: int | None = self._cached_data_element_id(global_identifier)
+        if data_element_id is None:
+            data_element_id = connection.execute(text(
+                "SELECT data_element_id FROM data_element WHERE data_element_global_identifier = :g_id"),
+                {"g_id": global_identifier}).scalar()
+            if data_element_id is not None:
+                self._remember_data_element_ids([(global_identifier, data_element_id)])
+        return data_element_id
+
+    def _intern_data_element(self, connection: sqlalchemy.engine.base.Connection, global_identifier: str,
+                             local_identifier: str, level_of_data_granularity: LevelOfDataGranularity,
+                             parent_identifier: str) -> int:
+        """Returns the surrogate key of a data element, which is stored first if it is not represented in DaQSS yet.
+        Once its surrogate key is interned, the data element is neither stored nor looked up again.
+
+        Args:
+            connection: The connection, including its currently open transaction, used for storing the data element.
+            global_identifier: The global identifier of the data element.
+            local_identifier: The local identifier of the data element.
+            level_of_data_granularity: The level of data granularity of the data element.
+            parent_identifier: The global identifier of the parent data element.
+
+        Returns:
+            The surrogate key of the data element."""
+        data_element_id: int | None = self._cached_data_element_id(global_identifier)
+        if data_element_id is not None:
+            return data_element_id
+
+        data_element_id = connection.execute(text(
+            "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier, " +
+            "is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
+            "VALUES (:g_id, :l_id, :lodg, :parent_identifier) " +
+            "ON CONFLICT DO NOTHING RETURNING data_element_id"),
+            {"g_id": global_identifier, "l_id": local_identifier, "lodg": level_of_data_granularity.name,
+             "parent_identifier": parent_identifier}).scalar()
+        if data_element_id is None:
+            data_element_id = connection.execute(text(
+                "SELECT data_element_id FROM data_element WHERE data_element_global_identifier = :g_id"),
+                {"g_id": global_identifier}).scalar()
+        self._remember_data_element_ids([(global_identifier, data_element_id)])
+        return data_element_id
+
+    @_routed(combine=sum)
+    def compact_dq_results(self, batch_size: int = 100_000) -> int:
+        """Enforces the [retention policies][src.daqss.api.DaQSS.store_retention_policy] by compacting the DQ results
+        that are older than their retention period into the table `dq_result_rollup` and deleting them from the tables
+        `dq_result_row` and `dq_result_batch`. For each data element, DQ metric or aggregation process, and day or
+        week, the compacted row holds the number, the minimum, the maximum, the sum, and the most recent of the result
+        values. Only whole days or weeks are compacted, and rows of the same period that are compacted by later runs
+        are merged into the same compacted row.
+
+        The DQ results are compacted and deleted in batches, each within its own transaction, such that locks are held
+        only briefly. DQ results stored in batches by the option `batched` of
+        [`store_dq_measurement_results_from_series`][src.daqss.api.DaQSS.store_dq_measurement_results_from_series] are
+        compacted as a whole, hence a transaction may compact more DQ results than the batch size. Beforehand, the
+        DQ results of batches are recorded as the most recent DQ results, if they are, such that compacting them does
+        not lose them. Afterward, monthly partitions of the table `dq_result_row` that precede all retention periods
+        and have become empty are dropped, which frees their storage without vacuuming.
+
+        Args:
+            batch_size: The maximum number of DQ results compacted within one transaction, unless a single batch
+                comprises more DQ results. Defaults to 100 000.
+
+        Returns:
+            The number of DQ results that were compacted.
+
+        ??? example
+            ``` python
+            d.store_retention_policy(90, dq_metric="arith_mean_completeness_per_row", granularity="week")
+            d.compact_dq_results()
+            ```
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be positive.")
+
+        with self._connect() as connection:
+            policies: list[Row] = connection.execute(text(
+                "SELECT applies_to_dq_metric, applies_to_aggregation_process, raw_retention_days, rollup_granularity " +
+                "FROM retention_policy")).all()
+        if len(policies) == 0:
+            return 0
+
+        with self._connect() as connection:
+            connection.execute(text("SELECT refresh_dq_result_latest()"))
+            self._commit(connection)
+
+        now: datetime = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        compacted: int = 0
+        for dq_metric_name, aggregation_process, retention_days, granularity in policies:
+            column: str = "calculated_by_dq_metric" if dq_metric_name is not None \
+                else "calculated_by_aggregation_process"
+            parameters: dict = {"name": dq_metric_name or aggregation_process, "granularity": granularity,
+                                "cutoff": now - timedelta(days=retention_days), "batch_size": batch_size}
+            rollup: str = (
+                "rollup AS (" +
+                "    INSERT INTO dq_result_rollup (bucket_start, bucket_granularity, " +
+                "    computed_on_data_element_id, calculated_by_dq_metric, calculated_by_aggregation_process, " +
+                "    result_count, minimum_value, maximum_value, sum_value, last_value, last_timestamp) " +
+                "    SELECT date_trunc(CAST(:granularity AS TEXT), creation_timestamp), " +
+                "    CAST(:granularity AS TEXT), computed_on_data_element_id, calculated_by_dq_metric, " +
+                "    calculated_by_aggregation_process, count(*), min(result_value), max(result_value), " +
+                "    sum(result_value), (array_agg(result_value ORDER BY creation_timestamp DESC))[1], " +
+                "    max(creation_timestamp) " +
+                "    FROM compacted GROUP BY 1, 3, 4, 5 " +
+                f"    ON CONFLICT (computed_on_data_element_id, {column}, bucket_granularity, bucket_start) " +
+                f"    WHERE {column} IS NOT NULL " +
+                "    DO UPDATE SET result_count = dq_result_rollup.result_count + EXCLUDED.result_count, " +
+                "    minimum_value = least(dq_result_rollup.minimum_value, EXCLUDED.minimum_value), " +
+                "    maximum_value = greatest(dq_result_rollup.maximum_value, EXCLUDED.maximum_value), " +
+                "    sum_value = dq_result_rollup.sum_value + EXCLUDED.sum_value, " +
+                "    last_value = CASE WHEN EXCLUDED.last_timestamp >= dq_result_rollup.last_timestamp " +
+                "        THEN EXCLUDED.last_value ELSE dq_result_rollup.last_value END, " +
+                "    last_timestamp = greatest(dq_result_rollup.last_timestamp, EXCLUDED.last_timestamp)) ")
+            sources: tuple[str, ...] = (
+                # The rows are addressed by partition and physical location, since dq_result_row has no primary key
+                "WITH compacted AS (" +
+                "    DELETE FROM dq_result_row WHERE (tableoid, ctid) IN (" +
+                "        SELECT tableoid, ctid FROM dq_result_row " +
+                f"        WHERE {column} = :name " +
+                "        AND creation_timestamp < date_trunc(CAST(:granularity AS TEXT), CAST(:cutoff AS TIMESTAMP)) " +
+                "        LIMIT :batch_size) " +
+                "    RETURNING *), ",
+                # Batches are selected until they comprise the batch size, whereby the first one is always selected
+                "WITH batch AS (" +
+                "    DELETE FROM dq_result_batch WHERE dq_result_batch_id IN (" +
+                "        SELECT dq_result_batch_id FROM (" +
+                "            SELECT dq_result_batch_id, result_count, " +
+                "            sum(result_count) OVER (ORDER BY dq_result_batch_id) AS running_count " +
+                f"            FROM dq_result_batch WHERE {column} = :name " +
+                "            AND creation_timestamp < date_trunc(CAST(:granularity AS TEXT), " +
+                "                                                CAST(:cutoff AS TIMESTAMP))) AS candidate " +
+                "        WHERE running_count - result_count < :batch_size) " +
+                "    RETURNING *), " +
+                "compacted AS (" +
+                "    SELECT batch.creation_timestamp, CAST(entry.result_value AS NUMERIC) AS result_value, " +
+                "    entry.data_element_id AS computed_on_data_element_id, batch.calculated_by_dq_metric, " +
+                "    batch.calculated_by_aggregation_process " +
+                "    FROM batch CROSS JOIN LATERAL unnest(batch.data_element_ids, batch.result_values) " +
+                "    AS entry (data_element_id, result_value)), ")
+            for source in sources:
+                while True:
+                    with self._connect() as connection:
+                        batch: int = connection.execute(text(source + rollup + "SELECT count(*) FROM compacted"),
+                                                        parameters).scalar()
+                        self._commit(connection)
+                    compacted += batch
+                    if batch < batch_size:
+                        break
+
+        # Monthly partitions preceding all retention periods only hold DQ results without a retention policy
+        earliest_cutoff: date = (now - timedelta(days=max(policy[2] for policy in policies) + 7)).date()
+        with self._connect() as connection:
+            partitions: list[str] = connection.execute(text(
+                "SELECT child.relname FROM pg_inherits JOIN pg_class AS child ON child.oid = pg_inherits.inhrelid " +
+                "WHERE pg_inherits.inhparent = CAST('dq_result_row' AS REGCLASS) " +
+                "AND child.relname ~ '^dq_result_row_[0-9]{4}_[0-9]{2}$'")).scalars().all()
+            for partition in sorted(partitions):
+                month: date = datetime.strptime(partition, "dq_result_row_%Y_%m").date()
+                following_month: date = date(month.year + month.month // 12, month.month % 12 + 1, 1)
+                if following_month > earliest_cutoff or \
+                        connection.execute(text(f"SELECT EXISTS (SELECT FROM {partition})")).scalar():
+                    continue
+                connection.execute(text(f"DROP TABLE {partition}"))
+                self._partitioned_months.discard((sharding.current_shard.get(), month))
+                logging.info(f"The empty partition \"{partition}\" of the table \"dq_result_row\" has been dropped.")
+            self._commit(connection)
+
+        # Data elements may have been deleted together with the DQ results, e.g., by cascading foreign keys, such that
+        # storing them again would assign new surrogate keys
+        self._forget_data_element_ids()
+        instrumentation.count("rows_compacted", compacted)
+        return compacted
+
+    @_routed(combine=lambda partitions: partitions[0])
+    def create_dq_result_partitions(self, months_ahead: int = 2, since: datetime | None = None) -> list[str]:
+        """Creates the monthly partitions of the table `dq_result_row`, unless they already exist.
+        The partitions for the current month and the following months are also created automatically when DQ results
+        are stored. Creating partitions ahead of time avoids that DQ results are stored in the default partition of
+        the table, e.g., if they are inserted using SQL.
+
+        Args:
+            months_ahead: The number of months following the first month for which partitions are created.
+                Defaults to 2.
+            since: A point in time within the first month for which a partition is created. Defaults to `None`,
+                which means that the current month is the first month.
+
+        Returns:
+            The names of the partitions.
+        """
+        first_month: date = (since or datetime.now(tz=timezone.utc)).date().replace(day=1)
+        months: list[date] = [date(first_month.year + (first_month.month - 1 + offset) // 12,
+                                   (first_month.month - 1 + offset) % 12 + 1, 1)
+                              for offset in range(months_ahead + 1)]
+
+        with self._connect() as connection:
+            partitions: list[str] = [connection.execute(text("SELECT create_dq_result_partition(:month)"),
+                                                        {"month": month}).scalar()
+                                     for month in months]
+            self._commit(connection)
+
+        # Within a session, the partitions only exist once it is committed, hence they are not remembered
+        if not self._in_session():
+            self._partitioned_months.update((sharding.current_shard.get(), month) for month in months)
+        return partitions
+
+    def _ensure_dq_result_partition(self, timestamp: datetime) -> None:
+        """Ensures that the partition of the table `dq_result_row` for the month of a creation timestamp and the
+        partition for the following month exist. If they cannot be created, a warning is logged and the DQ results
+        are stored in the default partition.
+
+        Args:
+            timestamp: The creation timestamp of DQ results to be stored."""
+        month: date = timestamp.date().replace(day=1)
+        if (sharding.current_shard.get(), month) in self._partitioned_months:
+            return
+        try:
+            self.create_dq_result_partitions(months_ahead=1, since=timestamp)
+        except DBAPIError as error:
+            if not self._in_session():
+                self._partitioned_months.add((sharding.current_shard.get(), month))
+            logging.warning(f"The partition of the table \"dq_result_row\" for the month {month:%Y-%m} cannot be " +
+                            f"created, hence DQ results of this month are stored in its default partition:\n" +
+                            f"{error.orig}")
+
+    @_routed(combine=sum)
+    def execute_aggregation_process(self, name: str) -> int:
+        """Executes an aggregation process stored in DaQSS and stores its DQ aggregation results.
+
+        The query of the aggregation process must return a column `global_identifier`, which contains the global
+        identifier of the data element on which an aggregation result is computed, and the columns referenced by
+        its constraints and aggregation functions. Unless aggregate functions, e.g., `avg(price)`, are used, the
+        query must return one row per data element. For each data element, the aggregation function paired with
+        the first fulfilled constraint is used, whereby the constraint `else` is checked last.
+
+        If all constraints and aggregation functions only consist of numeric literals, column names, arithmetic,
+        comparison, and logical operators, and the aggregate functions `avg`, `sum`, `min`, `max`, and `count`,
+        the aggregation is performed by PostgreSQL and the results are stored using `INSERT ... SELECT`, such that no
+        values are transferred to the client.
+        Otherwise, the values returned by the query are retrieved and aggregated on the client using
+        [`DataFrame.eval`][pandas.DataFrame.eval].
+        If DaQSS is sharded, the aggregation process is executed on all shards in parallel, whereby its query only
+        accesses the data elements and DQ results stored on the respective shard.
+
+        Args:
+            name: The name of the aggregation process to be executed.
+
+        Returns:
+            The number of DQ aggregation results stored.
+
+        Raises:
+            ValueError: If the aggregation process does not exist, or if it can neither be executed by PostgreSQL
+                nor on the client.
+        """
+        with self._connect() as connection:
+            query: str | None = connection.execute(text(
+                "SELECT aggregation_query_for_values FROM aggregation_process " +
+                "WHERE aggregation_process_name = :name"),
+                {"name": name}).scalar()
+            constraints_and_functions: list[tuple[str, str]] = [tuple(row) for row in connection.execute(text(
+                "SELECT aggregation_constraint.aggregation_constraint_formula, " +
+                "aggregation_function.aggregation_function_expression " +
+                "FROM aggregation_process_is_based_on " +
+                "JOIN aggregation_constraint ON aggregation_process_is_based_on.aggregation_constraint_name = " +
+                "    aggregation_constraint.aggregation_constraint_name " +
+                "JOIN aggregation_function ON aggregation_process_is_based_on.aggregation_function_name = " +
+                "    aggregation_function.aggregation_function_name " +
+                "WHERE aggregation_process_is_based_on.aggregation_process_name = :name " +
+                "ORDER BY lower(trim(aggregation_constraint.aggregation_constraint_formula)) = :else, " +
+                "aggregation_process_is_based_on.aggregation_constraint_name"),
+                {"name": name, "else": aggregation_execution.ELSE})]
+        if query is None or len(constraints_and_functions) == 0:
+            raise ValueError(f"There is no aggregation process with the name \"{name}\" that has a query and " +
+                             "at least one pair of a constraint and an aggregation function.")
+
+        try:
+            case_expression, aggregated = aggregation_execution.to_sql(constraints_and_functions)
+        except ValueError as error:
+            logging.info(f"The aggregation process \"{name}\" is executed on the client, since {error}")
+            case_expression, aggregated = None, False
+
+        timestamp: datetime = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        self._ensure_dq_result_partition(timestamp)
+        parameters: dict = {"timestamp": timestamp, "agg": name}
+
+        with self._connect() as connection:
+            connection.execute(text(
+                "CREATE TEMPORARY TABLE aggregation_result_staging (global_identifier TEXT, " +
+                "result_value NUMERIC) ON COMMIT DROP"))
+            if case_expression is not None:
+                connection.execute(text(
+                    "INSERT INTO aggregation_result_staging (global_identifier, result_value) " +
+                    f"SELECT aggregation_values.global_identifier, CAST({case_expression} AS NUMERIC) " +
+                    f"FROM ({query}) AS aggregation_values" +
+                    (" GROUP BY aggregation_values.global_identifier" if aggregated else "")))
+            else:
+                query_result: ResultProxy = connection.execute(text(query))
+                values: pandas.DataFrame = pandas.DataFrame.from_records(query_result.fetchall(),
+                                                                         columns=list(query_result.keys()))
+                if "global_identifier" not in values.columns:
+                    raise ValueError(f"The query of the aggregation process \"{name}\" does not return a column " +
+                                     "\"global_identifier\".")
+                try:
+                    results: pandas.Series = aggregation_execution.evaluate(constraints_and_functions, values)
+                except Exception as error:
+                    raise ValueError(f"The aggregation process \"{name}\" can neither be executed by PostgreSQL " +
+                                     f"nor on the client: {error}") from error
+                _copy_dataframe_into_table(connection, "aggregation_result_staging", pandas.DataFrame(
+                    {"global_identifier": values["global_identifier"].to_numpy(),
+                     "result_value": results.to_numpy()}))
+
+            staged_results: str = ("SELECT CAST(:timestamp AS TIMESTAMP), staging.result_value, " +
+                                   "data_element.data_element_id, CAST(NULL AS TEXT), CAST(:agg AS TEXT) " +
+                                   "FROM aggregation_result_staging AS staging JOIN data_element " +
+                                   "ON data_element.data_element_global_identifier = staging.global_identifier " +
+                                   "WHERE staging.result_value IS NOT NULL")
+            stored: int = connection.execute(text(
+                "INSERT INTO dq_result_row " +
+                "(creation_timestamp, result_value, computed_on_data_element_id, " +
+                "calculated_by_dq_metric, calculated_by_aggregation_process) " + staged_results),
+                parameters).rowcount
+            _upsert_latest_dq_results(connection, staged_results, parameters, False)
+            not_stored: int = connection.execute(text(
+                "SELECT count(*) FROM aggregation_result_staging WHERE result_value IS NOT NULL")).scalar() - stored
+            connection.execute(text("DROP TABLE aggregation_result_staging"))
+            self._commit(connection)
+
+        instrumentation.count("rows_attempted", stored + not_stored)
+        instrumentation.count("rows_stored", stored)
+        instrumentation.count("rows_rejected", not_stored)
+        if not_stored > 0:
+            logging.warning(f"{not_stored} DQ aggregation results of the aggregation process \"{name}\" cannot " +
+                            "be stored, since the data elements they were computed on are not represented in DaQSS.")
+        return stored
+
+    @_routed(_shard_of_data_element("parent"))
+    def _copy_dq_results_out(self, query: str, parameters: dict, parent: str | None) -> Iterator["pyarrow.RecordBatch"]:
+        """Streams the DQ results returned by a query as record batches using PostgreSQL `COPY`.
+
+        Args:
+            query: The query, as compiled by `_dq_results_query`.
+            parameters: The parameters of the query.
+            parent: The global identifier of the parent data element by which the query filters, which determines
+                the shard that is queried if DaQSS is sharded. Otherwise, all shards are queried in parallel.
+
+        Returns:
+            An iterator over record batches of the schema `columnar.DQ_RESULT_SCHEMA`."""
+        columnar = _import_columnar()
+        with self._connect() as connection:
+            yield from _copy_query_out(connection, query, parameters, columnar.read_copy_output)
+
+    def export_dq_results(self,
+                          path: str,
+                          dq_metric: Callable | str | None = None,
+                          aggregation_process: str | None = None,
+                          parent: str | None = None,
+                          level_of_data_granularity: LevelOfDataGranularity | None = None,
+                          since: datetime | None = None,
+                          until: datetime | None = None,
+                          value_range: tuple[float | None, float | None] | None = None,
+                          file_format: str | None = None) -> int:
+        """Exports DQ results together with the data elements they were computed on into an
+        [Apache Parquet](https://parquet.apache.org/) or an
+        [Apache Arrow IPC](https://arrow.apache.org/docs/format/Columnar.html#ipc-file-format) file, e.g., for backing
+        them up or for migrating them to another instance of DaQSS using
+        [`import_dq_results`][src.daqss.api.DaQSS.import_dq_results]. The DQ results are filtered like by
+        [`retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results] and are streamed from PostgreSQL using
+        `COPY`, whose output is parsed into record batches by [PyArrow](https://arrow.apache.org/docs/python/) and
+        written to the file, such that no Python object is created per DQ result and the memory required stays
+        bounded. The file can be loaded into a [Pandas DataFrame][pandas.DataFrame], e.g., using
+        [`pandas.read_parquet`][pandas.read_parquet].
+
+        This method requires the optional dependency `pyarrow`, which is installed by running
+        `pip install "daqss[arrow] @ git+https://github.com/johannesschrott/daqss.git"`.
+
+        Args:
+            path: The path of the file, which is replaced if it exists.
+            dq_metric: The DQ metric, or its name, that computed the DQ results. Defaults to `None`, which means
+                that DQ results are not filtered by DQ metric.
+            aggregation_process: The name of the aggregation process that computed the DQ results.
+                Defaults to `None`, which means that DQ results are not filtered by aggregation process.
+            parent: The global identifier of the parent of the data elements the DQ results were computed on.
+                Defaults to `None`, which means that DQ results are not filtered by parent data element.
+            level_of_data_granularity: The level of data granularity of the data elements the DQ results were
+                computed on. Defaults to `None`, which means that DQ results are not filtered by level.
+            since: Only DQ results created at or after this point in time (in UTC) are exported.
+            until: Only DQ results created before this point in time (in UTC) are exported.
+            value_range: A tuple containing the minimum and the maximum result value (both inclusive) of the
+                DQ results to be exported. Either of them may be `None` for an open range.
+            file_format: Either `parquet` or `arrow`. Defaults to `None`, which means that the format is derived from
+                the suffix of the path, i.e., `.parquet` or `.pq` for Parquet, and `.arrow`, `.feather`, or `.ipc`
+                for Arrow IPC.
+
+        Returns:
+            The number of DQ results exported. The file contains them in the columns `global_identifier`,
+            `local_identifier`, `level_of_data_granularity`, `parent_identifier`, `creation_timestamp`,
+            `result_value`, `dq_metric`, and `aggregation_process`.
+
+        ??? example
+            ``` python
+            d.export_dq_results("completeness.parquet", dq_metric="arith_mean_completeness_per_row",
+                                since=datetime(2025, 1, 1))
+            print(pandas.read_parquet("completeness.parquet").describe())
+            ```
+        """
+        columnar = _import_columnar()
+        requested_format: str = columnar.file_format(path, file_format)
+        query, parameters = _dq_results_query(dq_metric, aggregation_process, parent, level_of_data_granularity,
+                                              since, until, value_range)
+
+        exported: int = 0
+        writer = columnar.Writer(path, requested_format)
+        try:
+            for batch in self._copy_dq_results_out(query, parameters, parent):
+                writer.write(batch)
+                exported += batch.num_rows
+        except BaseException:
+            writer.close()
+            os.remove(path)
+            raise
+        writer.close()
+
+        instrumentation.count("rows_retrieved", exported)
+        return exported
+
+    def import_dq_results(self, path: str, file_format: str | None = None, batch_size: int = 100_000) -> int:
+        """Imports DQ results from an [Apache Parquet](https://parquet.apache.org/) or an
+        [Apache Arrow IPC](https://arrow.apache.org/docs/format/Columnar.html#ipc-file-format) file created by
+        [`export_dq_results`][src.daqss.api.DaQSS.export_dq_results], e.g., for restoring a backup or for migrating
+        DQ results between instances of DaQSS. The file may also be created by other tools, as long as it contains
+        the columns described for [`export_dq_results`][src.daqss.api.DaQSS.export_dq_results].
+
+        The file is read in record batches, each of which is serialized by
+        [PyArrow](https://arrow.apache.org/docs/python/) and streamed into a temporary staging table using
+        PostgreSQL `COPY`, from which it is merged into the tables `data_element`, `dq_result_row`, and
+        `dq_result_latest` using set-based statements within its own transaction. Data elements that are not
+        represented in DaQSS yet are stored, if their level of data granularity exists and their parent data element
+        either exists or is part of the same batch. DQ results that are already stored, either row by row or in a
+        batch of the table `dq_result_batch`, are skipped, hence a file can be imported repeatedly.
+        If DaQSS is sharded, each batch is split by the shards of the data elements, whose parts are imported in
+        parallel.
+
+        This method requires the optional dependency `pyarrow`, which is installed by running
+        `pip install "daqss[arrow] @ git+https://github.com/johannesschrott/daqss.git"`.
+
+        Args:
+            path: The path of the file.
+            file_format: Either `parquet` or `arrow`. Defaults to `None`, which means that the format is derived from
+                the suffix of the path.
+            batch_size: The maximum number of DQ results imported within one transaction. Defaults to 100 000.
+
+        Returns:
+            The number of DQ results imported.
+
+        ??? example
+            ``` python
+            d.import_dq_results("completeness.parquet")
+            ```
+        """
+        if batch_size < 1:
+            raise ValueError("The batch size must be positive.")
+        columnar = _import_columnar()
+        requested_format: str = columnar.file_format(path, file_format)
+
+        attempted: int = 0
+        imported: int = 0
+        router: sharding.ShardRouter | None = self._router
+        for batch in columnar.read_batches(path, requested_format, batch_size):
+            attempted += batch.num_rows
+            if router is None or sharding.current_shard.get() is not None:
+                imported += self._import_dq_result_batch(batch)
+                continue
+
+            global_identifiers: list[str | None] = batch.column("global_identifier").to_pylist()
+            shards: dict[str, int] = router.route(
+                {global_identifier: parent for global_identifier, parent
+                 in zip(global_identifiers, batch.column("parent_identifier").to_pylist())
+                 if global_identifier is not None})
+            parts: dict[int, pyarrow.RecordBatch] = columnar.split(
+                batch, [shards.get(global_identifier, 0) for global_identifier in global_identifiers])
+            imported += sum(router.run(lambda shard: self._import_dq_result_batch(parts[shard]), parts))
+
+        not_imported: int = attempted - imported
+        instrumentation.count("rows_attempted", attempted)
+        instrumentation.count("rows_stored", imported)
+        instrumentation.count("rows_rejected", not_imported)
+        if not_imported > 0:
+            logging.warning(f"{not_imported} DQ results of the file \"{path}\" have not been imported, since\n" +
+                            " - they are already stored, or\n" +
+                            " - their DQ metric or aggregation process is not stored in DaQSS, or\n" +
+                            " - their data element cannot be stored, or\n" +
+                            " - their creation timestamp or result value is missing.")
+        return imported
+
+    def _import_dq_result_batch(self, batch: "pyarrow.RecordBatch") -> int:
+        """Imports a record batch of DQ results within a single transaction, as described for
+        [`import_dq_results`][src.daqss.api.DaQSS.import_dq_results].
+
+        Args:
+            batch: A record batch of the schema `columnar.DQ_RESULT_SCHEMA`.
+
+        Returns:
+            The number of DQ results imported."""
+        columnar = _import_columnar()
+        for month in columnar.months(batch):
+            self._ensure_dq_result_partition(month)
+
+        with self._connect() as connection:
+            connection.execute(text(
+                "CREATE TEMPORARY TABLE dq_result_import (global_identifier TEXT, local_identifier TEXT, " +
+                "level_of_data_granularity TEXT, parent_identifier TEXT, creation_timestamp TIMESTAMP, " +
+                "result_value DOUBLE PRECISION, dq_metric TEXT, aggregation_process TEXT) ON COMMIT DROP"))
+            _copy_csv_into_table(connection, "dq_result_import", columnar.DQ_RESULT_SCHEMA.names,
+                                 columnar.to_copy_input(batch))
+
+            # Each run stores the data elements whose parents have been stored by the previous runs
+            store_data_elements: str = (
+                "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier, " +
+                "is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
+                "SELECT DISTINCT ON (staging.global_identifier) staging.global_identifier, " +
+                "staging.local_identifier, staging.level_of_data_granularity, staging.parent_identifier " +
+                "FROM dq_result_import AS staging " +
+                "JOIN levels_of_data_granularity ON level_name = staging.level_of_data_granularity " +
+                "WHERE staging.global_identifier IS NOT NULL " +
+                "AND NOT EXISTS (SELECT FROM data_element " +
+                "                WHERE data_element_global_identifier = staging.global_identifier) " +
+                "AND (staging.parent_identifier IS NULL OR EXISTS (" +
+                "    SELECT FROM data_element " +
+                "    WHERE data_element_global_identifier = staging.parent_identifier)) " +
+                "ON CONFLICT DO NOTHING")
+            while connection.execute(text(store_data_elements)).rowcount > 0:
+                continue
+
+            # DQ results that are already stored are removed from the staging table, whereby both tables are searched
+            # separately using their indexes. Only the batches of the same parent data elements and creation
+            # timestamps as staged DQ results are unnested.
+            for column, staged_column in (("calculated_by_dq_metric", "dq_metric"),
+                                          ("calculated_by_aggregation_process", "aggregation_process")):
+                connection.execute(text(
+                    "DELETE FROM dq_result_import AS staging USING data_element, dq_result_row " +
+                    "WHERE data_element.data_element_global_identifier = staging.global_identifier " +
+                    "AND dq_result_row.computed_on_data_element_id = data_element.data_element_id " +
+                    f"AND dq_result_row.{column} = staging.{staged_column} " +
+                    "AND dq_result_row.creation_timestamp = staging.creation_timestamp"))
+                connection.execute(text(
+                    "DELETE FROM dq_result_import AS staging USING data_element, (" +
+                    f"    SELECT batch.creation_timestamp, batch.{column} AS name, entry.data_element_id " +
+                    "    FROM dq_result_batch AS batch " +
+                    "    CROSS JOIN LATERAL unnest(batch.data_element_ids) AS entry (data_element_id) " +
+                    "    WHERE (batch.parent_data_element_id, batch.creation_timestamp) IN (" +
+                    "        SELECT parent.data_element_id, candidate.creation_timestamp " +
+                    "        FROM dq_result_import AS candidate JOIN data_element AS child " +
+                    "        ON child.data_element_global_identifier = candidate.global_identifier " +
+                    "        JOIN data_element AS parent " +
+                    "        ON parent.data_element_global_identifier = child.parent_data_element_global_identifier " +
+                    f"        WHERE candidate.{staged_column} IS NOT NULL) " +
+                    f"    AND batch.{column} IS NOT NULL) AS stored " +
+                    "WHERE data_element.data_element_global_identifier = staging.global_identifier " +
+                    "AND stored.data_element_id = data_element.data_element_id " +
+                    f"AND stored.name = staging.{staged_column} " +
+                    "AND stored.creation_timestamp = staging.creation_timestamp"))
+
+            staged_results: str = (
+                "SELECT DISTINCT ON (data_element.data_element_id, staging.dq_metric, " +
+                "                    staging.aggregation_process, staging.creation_timestamp) " +
+                "staging.creation_timestamp, staging.result_value, data_element.data_element_id, " +
+                "staging.dq_metric, staging.aggregation_process " +
+                "FROM dq_result_import AS staging JOIN data_element " +
+                "ON data_element.data_element_global_identifier = staging.global_identifier " +
+                "WHERE staging.creation_timestamp IS NOT NULL AND staging.result_value IS NOT NULL " +
+                "AND ((staging.aggregation_process IS NULL AND staging.dq_metric IN " +
+                "      (SELECT metric_name FROM dq_metric)) " +
+                "     OR (staging.dq_metric IS NULL AND staging.aggregation_process IN " +
+                "         (SELECT aggregation_process_name FROM aggregation_process)))")
+            # dq_result_latest is maintained first, since the DQ results are not staged anymore once stored
+            for column in ("dq_metric", "aggregation_process"):
+                _upsert_latest_dq_results(
+                    connection,
+                    "SELECT DISTINCT ON (computed_on_data_element_id, dq_metric, aggregation_process) * " +
+                    f"FROM ({staged_results}) AS staged (creation_timestamp, result_value, " +
+                    "computed_on_data_element_id, dq_metric, aggregation_process) " +
+                    f"WHERE {column} IS NOT NULL " +
+                    "ORDER BY computed_on_data_element_id, dq_metric, aggregation_process, " +
+                    "creation_timestamp DESC",
+                    {}, column == "dq_metric")
+            imported: int = connection.execute(text(
+                "INSERT INTO dq_result_row " +
+                "(creation_timestamp, result_value, computed_on_data_element_id, " +
+                "calculated_by_dq_metric, calculated_by_aggregation_process) " + staged_results)).rowcount
+            connection.execute(text("DROP TABLE dq_result_import"))
+            self._commit(connection)
+        return imported
+
+    def _unchanged_data_elements(self, name: str, parent_data_element: str,
+                                 fingerprints: pandas.Series) -> list[str]:
+        """Compares the fingerprints of data elements in bulk against the fingerprints stored when they were last
+        measured by a DQ metric.
+
+        Args:
+            name: The name of the DQ metric.
+            parent_data_element: The parent data element which contains the data elements.
+            fingerprints: The current fingerprints of the data elements, indexed by their local identifiers.
+
+        Returns:
+            The local identifiers of the data elements whose fingerprint is unchanged and which were measured by the
+            current implementation of the DQ metric.
+        """
+        staged: pandas.DataFrame = pandas.DataFrame({"local_identifier": fingerprints.index.map(str),
+                                                     "fingerprint": fingerprints.to_numpy()})
+        with self._connect() as connection:
+            connection.execute(text(
+                "CREATE TEMPORARY TABLE fingerprint_staging (local_identifier TEXT NOT NULL, " +
+                "fingerprint BIGINT NOT NULL) ON COMMIT DROP"))
+            _copy_dataframe_into_table(connection, "fingerprint_staging",
+                                       staged[staged["local_identifier"] != ""])
+            unchanged_identifiers: list[str] = connection.execute(text(
+                "SELECT staging.local_identifier FROM fingerprint_staging AS staging " +
+                "JOIN data_element ON data_element.data_element_global_identifier = " +
+                "    CAST(:parent_identifier AS TEXT) || '#' || staging.local_identifier " +
+                "JOIN data_element_fingerprint AS stored " +
+                "ON stored.data_element_id = data_element.data_element_id " +
+                "AND stored.measured_by_dq_metric = :metric_name AND stored.fingerprint = staging.fingerprint " +
+                "JOIN dq_metric ON dq_metric.metric_name = stored.measured_by_dq_metric " +
+                "AND dq_metric.implementation_hash IS NOT DISTINCT FROM stored.implementation_hash"),
+                {"parent_identifier": parent_data_element, "metric_name": name}).scalars().all()
+            connection.execute(text("DROP TABLE fingerprint_staging"))
+            self._commit(connection)
+
+        return unchanged_identifiers
+
+    @_routed(_shard_of_data_element("parent_data_element"))
+    def measure_dq_metric_incrementally(self, name: str, dataframe: pandas.DataFrame,
+                                        level_of_data_granularity: LevelOfDataGranularity,
+                                        parent_data_element: str,
+                                        chunk_size: int = _DQ_METRIC_CHUNK_SIZE,
+                                        max_workers: int | None = None) -> IncrementalMeasurement:
+        """Runs a DQ metric stored in DaQSS only on the rows or columns of a DataFrame that are new or have changed
+        since they were last measured by the DQ metric, and stores the DQ measurement results.
+
+        A fingerprint of each row or column is computed using vectorized hashing and is compared in bulk against
+        the fingerprints stored by previous measurements. Rows or columns whose fingerprint is unchanged, and which
+        were measured by the current implementation of the DQ metric, are skipped. The fingerprints of the measured
+        rows or columns are stored together with their DQ measurement results, such that the work of repeated
+        measurements scales with the number of changed rows or columns rather than with the size of the DataFrame.
+
+        Args:
+            name: The name of the DQ metric to be run.
+            dataframe: The data on which the DQ metric is run. Its row or column labels are used as local
+                identifiers of the data elements.
+            level_of_data_granularity: Either [`ROW`][src.daqss.levels_of_data_granularity.ROW] to compute one
+                result per row or [`COLUMN`][src.daqss.levels_of_data_granularity.COLUMN] to compute one result per
+                column of the DataFrame.
+            parent_data_element: The parent data element which contains the rows or columns of the DataFrame.
+            chunk_size: The maximum number of rows or columns that are processed at once.
+                Defaults to 100 000.
+            max_workers: The number of worker processes used for DQ metrics that are not vectorized.
+                Defaults to `None`, which means that one worker process per CPU core is used.
+
+        Returns:
+            An [`IncrementalMeasurement`][src.daqss.api.IncrementalMeasurement] containing the DQ measurement
+            results of the new or changed rows or columns, the labels of the unchanged rows or columns, and the
+            results that could not be stored.
+
+        ??? example
+            ``` python
+            d = DaQSS()
+            measurement = d.measure_dq_metric_incrementally("completeness", df, ROW, "customers")
+            print(f"{len(measurement.unchanged)} rows are unchanged")
+            ```
+        """
+        dq_metric, vectorized, axis = self._prepare_dq_metric_run(name, level_of_data_granularity)
+        fingerprints: pandas.Series = metric_execution.fingerprint(dataframe, axis)
+        unchanged = fingerprints.index.map(str).isin(
+            self._unchanged_data_elements(name, parent_data_element, fingerprints))
+        changed: pandas.DataFrame = dataframe.iloc[~unchanged] if axis == 1 else dataframe.iloc[:, ~unchanged]
+        if changed.shape[1 - axis] == 0:
+            results: pandas.Series = pandas.Series(dtype=float, name=name)
+            rejected: pandas.DataFrame = pandas.DataFrame(columns=["result_value", "reason"])
+        else:
+            results: pandas.Series = metric_execution.run(dq_metric, vectorized, changed, chunk_size, axis,
+                                                          max_workers)
+            results.name = name
+            rejected: pandas.DataFrame = self.store_dq_measurement_results_from_series(
+                dq_metric, level_of_data_granularity, parent_data_element, results, bulk=True,
+                fingerprints=fingerprints[~unchanged])
+
+        return IncrementalMeasurement(results, fingerprints.index[unchanged], rejected)
+
+    def result_sink(self, max_rows: int = 100_000, max_age_seconds: float = 1.0, capacity: int = 1_000_000,
+                    on_rejected: Callable[[pandas.DataFrame], None] | None = None) -> "ResultSink":
+        """Creates a [write-behind buffer][src.daqss.result_sink.ResultSink] for DQ results, which accepts DQ results
+        from many producers and stores them in large batches from a background worker. Putting DQ results into the
+        buffer does not wait for the database, unless the buffer is full, hence it suits streaming jobs that
+        produce small batches of DQ results continuously.
+
+        Args:
+            max_rows: The number of buffered DQ results at which the buffer is flushed. Defaults to 100 000.
+            max_age_seconds: The number of seconds after which buffered DQ results are flushed at the latest.
+                Defaults to 1.
+            capacity: The maximum number of DQ results that are held by the buffer until they have been committed.
+                Producers are blocked while the buffer is full. Defaults to 1 000 000.
+            on_rejected: A callable that receives the DQ results rejected by a flush. Defaults to `None`, which
+                means that rejected DQ results are only logged.
+
+        Returns:
+            The buffer, which must be closed to store the remaining DQ results, e.g., by using it as context
+            manager. Buffers that have not been closed are flushed when the interpreter exits.
+
+        ??? example
+            ``` python
+            with d.result_sink() as sink:
+                for batch in stream:
+                    sink.put_dq_measurement_results(arith_mean_completeness_per_row, ROW, table, batch)
+            ```
+        """
+        from daqss.result_sink import ResultSink
+
+        return ResultSink(self, max_rows, max_age_seconds, capacity, on_rejected)
 
     def retrieve_aggregation_constraint_formula_by_name(self, name: str) -> str:
         """Retrieves the formula of an aggregation constraint suitable for usage with CobADQ by its name.
@@ -82,7 +1575,11 @@ class DaQSS:
         Returns:
             A string that contains the formula of an aggregation constraint for usage with CobADQ.
         """
-        with self._engine.connect() as connection:
+        constraint = self.catalog.constraints.get(name)
+        if constraint is not None:
+            return constraint.formula
+
+        with self._connect() as connection:
             query_result: ResultProxy = connection.execute(
                 text(
                     """SELECT aggregation_constraint_formula 
@@ -103,7 +1600,11 @@ class DaQSS:
         Returns:
             A string that contains the expression an aggregation function for usage with CobADQ.
         """
-        with self._engine.connect() as connection:
+        function = self.catalog.functions.get(name)
+        if function is not None:
+            return function.expression
+
+        with self._connect() as connection:
             query_result: ResultProxy = connection.execute(
                 text(
                     """SELECT aggregation_function_expression 
@@ -124,7 +1625,15 @@ class DaQSS:
         Returns:
             A string that contains the specification of an aggregation directly for usage with CobADQ.
         """
-        with self._engine.connect() as connection:
+        process = self.catalog.processes.get(name)
+        if process is not None and len(process.constraints_and_functions) > 0 and \
+                all(constraint in self.catalog.constraints and function in self.catalog.functions
+                    for constraint, function in process.constraints_and_functions):
+            return "{" + ",".join(f"({self.catalog.constraints[constraint].formula}," +
+                                  f"{self.catalog.functions[function].expression})"
+                                  for constraint, function in process.constraints_and_functions) + "}"
+
+        with self._connect() as connection:
             query_result: ResultProxy = connection.execute(
                 text(
                     "SELECT '('||aggregation_constraint.aggregation_constraint_formula||'," +
@@ -148,13 +1657,36 @@ class DaQSS:
     def retrieve_dq_metric_implementation_by_name(self, name) -> Callable:
         """Retrieves the implementation of a metric in the form of a Python callable by its name.
 
+        Deserialized implementations are cached. As long as the implementation stored in DaQSS has not changed,
+        only its content hash is retrieved from the database.
+
                 Args:
                     name (str): The name of the metric implementation to be retrieved.
 
                 Returns:
                     The metric implementation in form of a callable.
                 """
-        with self._engine.connect() as connection:
+        metric = self.catalog.metrics.get(name)
+        if metric is not None and metric.implementation_hash is not None:
+            dq_metric: Callable | None = self._dq_metric_cache.get(name, metric.implementation_hash)
+            if dq_metric is not None:
+                return dq_metric
+
+        with self._connect() as connection:
+            query_result: ResultProxy = connection.execute(
+                text(
+                    "SELECT implementation_hash " +
+                    "FROM dq_metric " +
+                    "WHERE metric_name = :name"),
+                {"name": name}
+            )
+
+            implementation_hash: str | None = query_result.scalar()
+            if implementation_hash is not None:
+                dq_metric: Callable | None = self._dq_metric_cache.get(name, implementation_hash)
+                if dq_metric is not None:
+                    return dq_metric
+
             query_result: ResultProxy = connection.execute(
                 text(
                     "SELECT python_implementation " +
@@ -163,14 +1695,232 @@ class DaQSS:
                 {"name": name}
             )
 
-            byte_string: str | None = query_result.first()[0]
+            byte_string: bytes | None = query_result.scalar()
             if byte_string is None:
                 logging.error(f"There is no implementation for a DQ metric with the name \"{name}\".")
             else:
-                return dill.loads(byte_string)
+                instrumentation.count("dill_bytes_deserialized", len(byte_string))
+                return self._dq_metric_cache.put(name, hash_implementation(byte_string), byte_string)
+
+    @_routed(_shard_of_data_element("global_identifier"))
+    def retrieve_ancestors(self, global_identifier: str) -> pandas.DataFrame:
+        """Retrieves all data elements that contain a data element, i.e., its parent data element, the parent of its
+        parent data element, and so on.
+
+        Args:
+            global_identifier: The global identifier of the data element whose ancestors are retrieved.
+
+        Returns:
+            A DataFrame containing the ancestors in the columns `global_identifier`, `local_identifier`,
+            `level_of_data_granularity`, and `parent_identifier`, starting at the most coarse-granular ancestor.
+            It is empty if the data element has no ancestors or is not represented in DaQSS.
+        """
+        with self._connect() as connection:
+            query_result: ResultProxy = connection.execute(text(
+                "SELECT data_element_global_identifier AS global_identifier, " +
+                "data_element_local_identifier AS local_identifier, " +
+                "is_of_level_of_data_granularity AS level_of_data_granularity, " +
+                "parent_data_element_global_identifier AS parent_identifier " +
+                "FROM data_element " +
+                "WHERE data_element_path @> (SELECT data_element_path FROM data_element " +
+                "                            WHERE data_element_global_identifier = :g_id) " +
+                "AND data_element_global_identifier <> :g_id " +
+                "ORDER BY nlevel(data_element_path)"),
+                {"g_id": global_identifier})
+            rows: list[Row] = query_result.fetchall()
+            instrumentation.count("rows_retrieved", len(rows))
+            return pandas.DataFrame.from_records(rows, columns=list(query_result.keys()))
+
+    @_routed(_shard_of_data_element("global_identifier"))
+    def retrieve_descendants(self, global_identifier: str,
+                             level_of_data_granularity: LevelOfDataGranularity | None = None) -> pandas.DataFrame:
+        """Retrieves all data elements contained in a data element, i.e., its children, the children of its children,
+        and so on.
+
+        Args:
+            global_identifier: The global identifier of the data element whose descendants are retrieved.
+            level_of_data_granularity: Only descendants of this level of data granularity are retrieved.
+                Defaults to `None`, which means that descendants are not filtered by level.
+
+        Returns:
+            A DataFrame containing the descendants in the columns `global_identifier`, `local_identifier`,
+            `level_of_data_granularity`, and `parent_identifier`, ordered such that parents precede their children.
+            It is empty if the data element has no descendants or is not represented in DaQSS.
+
+        ??? example
+            ``` python
+            tables = d.retrieve_descendants("sqlite:///products.sqlite", level_of_data_granularity=TABLE)
+            ```
+        """
+        query: str = ("SELECT data_element_global_identifier AS global_identifier, " +
+                      "data_element_local_identifier AS local_identifier, " +
+                      "is_of_level_of_data_granularity AS level_of_data_granularity, " +
+                      "parent_data_element_global_identifier AS parent_identifier " +
+                      "FROM data_element " +
+                      "WHERE data_element_path <@ (SELECT data_element_path FROM data_element " +
+                      "                            WHERE data_element_global_identifier = :g_id) " +
+                      "AND data_element_global_identifier <> :g_id ")
+        parameters: dict = {"g_id": global_identifier}
+        if level_of_data_granularity is not None:
+            query += "AND is_of_level_of_data_granularity = :level "
+            parameters["level"] = level_of_data_granularity.name
+        query += "ORDER BY nlevel(data_element_path)"
+
+        with self._connect() as connection:
+            query_result: ResultProxy = connection.execute(text(query), parameters)
+            rows: list[Row] = query_result.fetchall()
+            instrumentation.count("rows_retrieved", len(rows))
+            return pandas.DataFrame.from_records(rows, columns=list(query_result.keys()))
+
+    @_routed(_shard_of_data_element("parent"))
+    def retrieve_dq_results(self,
+                            dq_metric: Callable | str | None = None,
+                            aggregation_process: str | None = None,
+                            parent: str | None = None,
+                            level_of_data_granularity: LevelOfDataGranularity | None = None,
+                            since: datetime | None = None,
+                            until: datetime | None = None,
+                            value_range: tuple[float | None, float | None] | None = None,
+                            chunk_size: int = 100_000,
+                            include_rollups: bool = False) -> Iterator[pandas.DataFrame]:
+        """Retrieves DQ results together with the data elements they were computed on. All filters are evaluated by
+        the database, and the results are streamed from a server-side cursor in chunks, such that the memory
+        required stays constant regardless of the number of DQ results retrieved. If DaQSS is sharded and no parent
+        data element is given, all shards are queried in parallel and the chunks are yielded in the order they
+        arrive.
+
+        Args:
+            dq_metric: The DQ metric, or its name, that computed the DQ results. Defaults to `None`, which means
+                that DQ results are not filtered by DQ metric.
+            aggregation_process: The name of the aggregation process that computed the DQ results.
+                Defaults to `None`, which means that DQ results are not filtered by aggregation process.
+            parent: The global identifier of the parent of the data elements the DQ results were computed on.
+                Defaults to `None`, which means that DQ results are not filtered by parent data element.
+            level_of_data_granularity: The level of data granularity of the data elements the DQ results were
+                computed on. Defaults to `None`, which means that DQ results are not filtered by level.
+            since: Only DQ results created at or after this point in time (in UTC) are retrieved.
+            until: Only DQ results created before this point in time (in UTC) are retrieved.
+            value_range: A tuple containing the minimum and the maximum result value (both inclusive) of the
+                DQ results to be retrieved. Either of them may be `None` for an open range.
+            chunk_size: The maximum number of DQ results contained in a chunk. Defaults to 100 000.
+            include_rollups: Whether DQ results that were compacted according to a
+                [retention policy][src.daqss.api.DaQSS.store_retention_policy] are retrieved as well. Each compacted
+                row summarizes a day or a week, whose start is used as creation timestamp and whose mean is used as
+                result value, hence the filters are applied to these. Defaults to `False`.
+
+        Returns:
+            An iterator over DataFrames, each containing a chunk of the DQ results in the columns
+            `global_identifier`, `local_identifier`, `level_of_data_granularity`, `parent_identifier`,
+            `creation_timestamp`, `result_value`, `dq_metric`, and `aggregation_process`. If compacted DQ results
+            are included, the chunks additionally contain the columns `tier`, which is either `raw` or `rollup`,
+            `result_count`, `minimum_value`, `maximum_value`, and `last_value`.
+
+        ??? example
+            ``` python
+            for chunk in d.retrieve_dq_results(dq_metric="arith_mean_completeness_per_row",
+                                               parent=fake_customer_global_identifier, value_range=(None, 0.5)):
+                print(chunk.nsmallest(5, "result_value"))
+            ```
+        """
+        query, parameters = _dq_results_query(dq_metric, aggregation_process, parent, level_of_data_granularity,
+                                              since, until, value_range, include_rollups=include_rollups)
+        with self._connect() as connection:
+            query_result: ResultProxy = connection.execute(text(query).execution_options(yield_per=chunk_size),
+                                                           parameters)
+            columns: list[str] = list(query_result.keys())
+            for partition in query_result.partitions():
+                instrumentation.count("rows_retrieved", len(partition))
+                yield pandas.DataFrame.from_records(partition, columns=columns)
+
+    @_routed(_shard_of_data_element("global_identifier"))
+    def retrieve_dq_results_in_subtree(self,
+                                       global_identifier: str,
+                                       dq_metric: Callable | str | None = None,
+                                       aggregation_process: str | None = None,
+                                       level_of_data_granularity: LevelOfDataGranularity | None = None,
+                                       since: datetime | None = None,
+                                       until: datetime | None = None,
+                                       value_range: tuple[float | None, float | None] | None = None,
+                                       chunk_size: int = 100_000,
+                                       include_rollups: bool = False) -> Iterator[pandas.DataFrame]:
+        """Retrieves the DQ results computed on a data element and on all data elements contained in it, e.g., all
+        DQ results computed anywhere within a database. Apart from the subtree of data elements, the DQ results are
+        filtered and streamed like by [`retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results].
+
+        Args:
+            global_identifier: The global identifier of the data element at the root of the subtree.
+            dq_metric: The DQ metric, or its name, that computed the DQ results. Defaults to `None`, which means
+                that DQ results are not filtered by DQ metric.
+            aggregation_process: The name of the aggregation process that computed the DQ results.
+                Defaults to `None`, which means that DQ results are not filtered by aggregation process.
+            level_of_data_granularity: The level of data granularity of the data elements the DQ results were
+                computed on. Defaults to `None`, which means that DQ results are not filtered by level.
+            since: Only DQ results created at or after this point in time (in UTC) are retrieved.
+            until: Only DQ results created before this point in time (in UTC) are retrieved.
+            value_range: A tuple containing the minimum and the maximum result value (both inclusive) of the
+                DQ results to be retrieved. Either of them may be `None` for an open range.
+            chunk_size: The maximum number of DQ results contained in a chunk. Defaults to 100 000.
+            include_rollups: Whether DQ results that were compacted according to a
+                [retention policy][src.daqss.api.DaQSS.store_retention_policy] are retrieved as well. Each compacted
+                row summarizes a day or a week, whose start is used as creation timestamp and whose mean is used as
+                result value, hence the filters are applied to these. Defaults to `False`.
+
+        Returns:
+            An iterator over DataFrames, each containing a chunk of the DQ results in the same columns as the chunks
+            returned by [`retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results].
+        """
+        query, parameters = _dq_results_query(dq_metric, aggregation_process, None, level_of_data_granularity,
+                                              since, until, value_range, subtree=global_identifier,
+                                              include_rollups=include_rollups)
+        with self._connect() as connection:
+            query_result: ResultProxy = connection.execute(text(query).execution_options(yield_per=chunk_size),
+                                                           parameters)
+            columns: list[str] = list(query_result.keys())
+            for partition in query_result.partitions():
+                instrumentation.count("rows_retrieved", len(partition))
+                yield pandas.DataFrame.from_records(partition, columns=columns)
+
+    @_routed(_shard_of_data_element("parent"),
+             combine=lambda frames: pandas.concat(frames, ignore_index=True))
+    def retrieve_latest_dq_results(self,
+                                   dq_metric: Callable | str | None = None,
+                                   aggregation_process: str | None = None,
+                                   parent: str | None = None,
+                                   level_of_data_granularity: LevelOfDataGranularity | None = None,
+                                   value_range: tuple[float | None, float | None] | None = None) -> pandas.DataFrame:
+        """Retrieves the most recent DQ result per data element and DQ metric or aggregation process.
+        The most recent DQ results are maintained whenever DQ results are stored, hence retrieving them does not
+        depend on the number of DQ results stored in the past. DQ results stored in batches are recorded when the most
+        recent DQ results are retrieved next, which only unnests the batches stored since then.
+
+        Args:
+            dq_metric: The DQ metric, or its name, that computed the DQ results. Defaults to `None`, which means
+                that DQ results are not filtered by DQ metric.
+            aggregation_process: The name of the aggregation process that computed the DQ results.
+                Defaults to `None`, which means that DQ results are not filtered by aggregation process.
+            parent: The global identifier of the parent of the data elements the DQ results were computed on.
+                Defaults to `None`, which means that DQ results are not filtered by parent data element.
+            level_of_data_granularity: The level of data granularity of the data elements the DQ results were
+                computed on. Defaults to `None`, which means that DQ results are not filtered by level.
+            value_range: A tuple containing the minimum and the maximum result value (both inclusive) of the
+                DQ results to be retrieved. Either of them may be `None` for an open range.
+
+        Returns:
+            A DataFrame containing the most recent DQ results in the same columns as the chunks returned by
+            [`retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results].
+        """
+        query, parameters = _dq_results_query(dq_metric, aggregation_process, parent, level_of_data_granularity,
+                                              value_range=value_range, table="dq_result_latest")
+        with self._connect() as connection:
+            connection.execute(text("SELECT refresh_dq_result_latest()"))
+            query_result: ResultProxy = connection.execute(text(query), parameters)
+            rows: list[Row] = query_result.fetchall()
+            self._commit(connection)
+            instrumentation.count("rows_retrieved", len(rows))
+            return pandas.DataFrame.from_records(rows, columns=list(query_result.keys()))
 
     def retrieve_levels_of_data_granularity(self) -> list[LevelOfDataGranularity]:
-        """Connects to the DaQSS database and retrieves the levels of data granularity known to DaQSS
+        """Retrieves the levels of data granularity known to DaQSS from the [catalog][src.daqss.catalog.Catalog]
         in the form of a list that contains instances of the
         [named tuple][src.daqss.level_of_data_granularity.LevelOfDataGranularity].
 
@@ -181,16 +1931,100 @@ class DaQSS:
                 Example result:\
                 `[("value", 0), ("row", 1)]`
             """
-        with self._engine.connect() as connection:
-            query_result: ResultProxy = connection.execute(
-                text("""SELECT level_name, ordering FROM levels_of_data_granularity ORDER BY ordering ASC""")
-            )
+        return self.catalog.levels
+
+    def retrieve_retention_policies(self) -> pandas.DataFrame:
+        """Retrieves the [retention policies][src.daqss.api.DaQSS.store_retention_policy] of all DQ metrics and
+        aggregation processes.
+
+        Returns:
+            A DataFrame containing one retention policy per row in the columns `dq_metric`, `aggregation_process`,
+            `retention_days`, and `granularity`.
+        """
+        with self._connect() as connection:
+            query_result: ResultProxy = connection.execute(text(
+                "SELECT applies_to_dq_metric AS dq_metric, applies_to_aggregation_process AS aggregation_process, " +
+                "raw_retention_days AS retention_days, rollup_granularity AS granularity " +
+                "FROM retention_policy ORDER BY applies_to_dq_metric, applies_to_aggregation_process"))
+            rows: list[Row] = query_result.fetchall()
+            instrumentation.count("rows_retrieved", len(rows))
+            return pandas.DataFrame.from_records(rows, columns=list(query_result.keys()))
+
+    def run_dq_metric(self, name: str, dataframe: pandas.DataFrame,
+                      level_of_data_granularity: LevelOfDataGranularity,
+                      chunk_size: int = _DQ_METRIC_CHUNK_SIZE, max_workers: int | None = None) -> pandas.Series:
+        """Runs a DQ metric stored in DaQSS on the data contained in a DataFrame.
+
+        Vectorized DQ metrics receive chunks of the DataFrame and return a series of results per chunk.
+        All other DQ metrics are applied to each row or column individually, whereby the chunks are processed in
+        parallel by a pool of worker processes.
 
-            result: list[LevelOfDataGranularity] = [LevelOfDataGranularity(name=row[0], ordering=row[1])
-                                                    for row in query_result]
+        Args:
+            name: The name of the DQ metric to be run.
+            dataframe: The data on which the DQ metric is run.
+            level_of_data_granularity: Either [`ROW`][src.daqss.levels_of_data_granularity.ROW] to compute one
+                result per row or [`COLUMN`][src.daqss.levels_of_data_granularity.COLUMN] to compute one result per
+                column of the DataFrame.
+            chunk_size: The maximum number of rows or columns that are processed at once.
+                Defaults to 100 000.
+            max_workers: The number of worker processes used for DQ metrics that are not vectorized.
+                Defaults to `None`, which means that one worker process per CPU core is used.
 
-            return result
+        Returns:
+            A series containing the DQ measurement results, indexed by the row or column labels of the DataFrame.
+            The series can directly be stored using
+            [`store_dq_measurement_results_from_series`][src.daqss.api.DaQSS.store_dq_measurement_results_from_series].
+        """
+        dq_metric, vectorized, axis = self._prepare_dq_metric_run(name, level_of_data_granularity)
+        results: pandas.Series = metric_execution.run(dq_metric, vectorized, dataframe, chunk_size, axis,
+                                                      max_workers)
+        results.name = name
+        return results
 
+    def _prepare_dq_metric_run(self, name: str,
+                               level_of_data_granularity: LevelOfDataGranularity) -> tuple[Callable, bool, int]:
+        """Retrieves everything needed to run a DQ metric stored in DaQSS on a DataFrame.
+
+        Args:
+            name: The name of the DQ metric to be run.
+            level_of_data_granularity: The level of data granularity on which the DQ metric is run.
+
+        Returns:
+            A tuple containing the implementation of the DQ metric, whether it is vectorized, and the axis of the
+            DataFrame along which it is run.
+        """
+        if level_of_data_granularity == ROW:
+            axis: int = 1
+        elif level_of_data_granularity == COLUMN:
+            axis: int = 0
+        else:
+            raise ValueError(f"DQ metrics can only be run on the level of data granularity \"{ROW.name}\" " +
+                             f"or \"{COLUMN.name}\".")
+
+        metric = self.catalog.metrics.get(name)
+        if metric is not None:
+            metric_information: tuple | None = (metric.vectorized, metric.level_of_data_granularity)
+        else:
+            with self._connect() as connection:
+                query_result: ResultProxy = connection.execute(
+                    text(
+                        "SELECT is_vectorized, designed_for_level_of_data_granularity " +
+                        "FROM dq_metric " +
+                        "WHERE metric_name = :name"),
+                    {"name": name}
+                )
+                metric_information: tuple | None = query_result.first()
+
+        if metric_information is None:
+            raise ValueError(f"There is no DQ metric with the name \"{name}\".")
+        if metric_information[1] != level_of_data_granularity.name:
+            logging.warning(f"The DQ metric \"{name}\" is designed for the level of data granularity " +
+                            f"\"{metric_information[1]}\", but it is run on the level of data granularity " +
+                            f"\"{level_of_data_granularity.name}\".")
+
+        return self.retrieve_dq_metric_implementation_by_name(name), metric_information[0], axis
+
+    @_synchronizing_shards
     def store_aggregation_constraint(self, name: str, description: str, constraint: str,
                                      level_of_data_granularity: LevelOfDataGranularity):
         """Stores an aggregation constraint in the database part of DaQSS.
@@ -205,19 +2039,21 @@ class DaQSS:
         """
 
         try:
-            with self._engine.connect() as connection:
+            with self._connect() as connection:
                 connection.execute(text(
                     "INSERT INTO aggregation_constraint (aggregation_constraint_name, aggregation_constraint_description, "
                     "aggregation_constraint_formula, covers_level_of_data_granularity) " +
                     "VALUES (:name, :description, :constraint, :lodg)"),
                     {"name": name, "description": description,
                      "constraint": constraint, "lodg": level_of_data_granularity.name})
-                connection.commit()
+                self._commit(connection)
         except IntegrityError:
             logging.warning(
                 f"The aggregation constraint with the name \"{name}\" cannot " +
                 f"be stored, since an aggregation constraint with the same name already exists.")
+        self.catalog.invalidate()
 
+    @_synchronizing_shards
     def store_aggregation_function(self, name: str, description: str, expression: str,
                                    source_level_of_data_granularity: LevelOfDataGranularity,
                                    target_level_of_data_granularity: LevelOfDataGranularity):
@@ -233,7 +2069,7 @@ class DaQSS:
                    target_level_of_data_granularity: The level of data granularity of the aggregation result.
                """
         try:
-            with self._engine.connect() as connection:
+            with self._connect() as connection:
                 connection.execute(text(
                     "INSERT INTO aggregation_function (aggregation_function_name, aggregation_function_description, "
                     "aggregation_function_expression, source_level_of_data_granularity, " +
@@ -241,12 +2077,14 @@ class DaQSS:
                     {"name": name, "description": description,
                      "expression": expression, "s_lodg": source_level_of_data_granularity.name,
                      "t_lodg": target_level_of_data_granularity.name})
-                connection.commit()
+                self._commit(connection)
         except IntegrityError:
             logging.warning(
                 f"The aggregation function with the name \"{name}\" cannot " +
                 f"be stored, since an aggregation function with the same name already exists.")
+        self.catalog.invalidate()
 
+    @_synchronizing_shards
     def store_aggregation_process(self, name: str, description: str, query_for_dq_results: str,
                                   constraints_and_functions: list[tuple[str, str]], dimensions: list[str]):
         """Stores an aggregation process in the database part of DaQSS.
@@ -262,7 +2100,7 @@ class DaQSS:
                 aggregation functions used within the aggregation process.
                """
         try:
-            with self._engine.connect() as connection:
+            with self._connect() as connection:
                 connection.execute(text(
                     "INSERT INTO aggregation_process (aggregation_process_name, aggregation_process_description, "
                     "aggregation_query_for_values) VALUES (:name, :description, :query)"
@@ -277,7 +2115,7 @@ class DaQSS:
                     ),
                         {"name": name, "constraint": pair[0],
                          "function": pair[1]})
-                connection.commit()
+                self._commit(connection)
         except IntegrityError as ie:
             logging.warning(
                 f"The aggregation process with the name \"{name}\" cannot " +
@@ -285,20 +2123,23 @@ class DaQSS:
                 " - it was tried to add a combination of constraint and aggregation function " +
                 "that was already associated with this aggregation process, or" +
                 " - the supplied constraints and aggregation functions targeted different levels of data granularity.")
-        for dimension_name in dimensions:
-            try:
-                with self._engine.connect() as connection:
-                    connection.execute(text(
-                        "INSERT INTO aggregation_process_computes_value_for_dimension " +
-                        "(aggregation_process_name, dimension_name) VALUES (:a_name, :d_name)"),
-                        {"a_name": name, "d_name": dimension_name})
-                    connection.commit()
-            except IntegrityError:
-                logging.warning(
-                    f"The aggregation process with the name \"{name}\" cannot be associated with the " +
-                    f"DQ dimension \"{dimension_name}\", since\n - this association is already in place, " +
-                    f"or \n - the dimension \"{dimension_name}\" does not exist.")
-
+        with self._connect() as connection:
+            for dimension_name in dimensions:
+                try:
+                    with connection.begin_nested():
+                        connection.execute(text(
+                            "INSERT INTO aggregation_process_computes_value_for_dimension " +
+                            "(aggregation_process_name, dimension_name) VALUES (:a_name, :d_name)"),
+                            {"a_name": name, "d_name": dimension_name})
+                except IntegrityError:
+                    logging.warning(
+                        f"The aggregation process with the name \"{name}\" cannot be associated with the " +
+                        f"DQ dimension \"{dimension_name}\", since\n - this association is already in place, " +
+                        f"or \n - the dimension \"{dimension_name}\" does not exist.")
+            self._commit(connection)
+        self.catalog.invalidate()
+
+    @_synchronizing_shards
     def store_dq_dimension(self, name: str, description: str or None = None, is_subdimension_of: str or None = None):
         """Stores a DQ dimension in the database part of DaQSS.
 
@@ -308,12 +2149,12 @@ class DaQSS:
             is_subdimension_of: The name of the dimension of which this dimension is a sub-dimension.
             """
         try:
-            with self._engine.connect() as connection:
+            with self._connect() as connection:
                 if is_subdimension_of is not None:
-                    result: list[Row] = list(connection.execute(
-                        text("SELECT * FROM dq_dimension WHERE dimension_name = :dimension_name"),
-                        {"dimension_name": is_subdimension_of}).fetchall())
-                    if len(result) < 1:
+                    # Dimensions stored since the catalog snapshot has been loaded are looked up in the database
+                    if is_subdimension_of not in self.catalog.dimensions and connection.execute(
+                            text("SELECT 1 FROM dq_dimension WHERE dimension_name = :dimension_name"),
+                            {"dimension_name": is_subdimension_of}).first() is None:
                         raise ValueError(f"The supplied parent dimension \"{is_subdimension_of}\" does not exist.")
 
                     if description is not None:
@@ -340,15 +2181,17 @@ class DaQSS:
                             """INSERT INTO dq_dimension (dimension_name)
                              VALUES (:name)"""),
                             {"name": name})
-                connection.commit()
+                self._commit(connection)
 
         except IntegrityError:
             logging.warning(
                 f"A DQ dimension with the name \"{name}\" cannot be created," +
                 f" since a dimension with the same name already exists.")
+        self.catalog.invalidate()
 
+    @_synchronizing_shards
     def store_dq_metric(self, dq_metric: Callable, dimensions: list[str],
-                        level_of_data_granularity: LevelOfDataGranularity):
+                        level_of_data_granularity: LevelOfDataGranularity, vectorized: bool = False):
         """Store the Python implementation of a DQ metric in the connected PostgreSQL database.
 
                 Args:
@@ -356,6 +2199,10 @@ class DaQSS:
                     dimensions (list[str]): The DQ dimensions for which the DQ metric computes values.
                     level_of_data_granularity (LevelOfDataGranularity): The level of data granularity on which the
                         DQ Metric operates.
+                    vectorized (bool, optional): Declares whether the DQ metric receives a whole
+                        [DataFrame][pandas.DataFrame] and returns a [Series][pandas.Series] containing one result
+                        per row or column. Defaults to `False`, which means that the DQ metric is applied to each
+                        row or column individually.
                     """
         dq_metric_name = getattr(dq_metric, '__name__', repr(dq_metric))
         # 1. param: the object of which the name attribute should be retrieved
@@ -368,32 +2215,42 @@ class DaQSS:
         # 2. param: specifies that the '__doc__' attribute should be retrieved
         # 3. param: if the object has no docstring, set the variable to None
 
+        import dill
+
         dq_metric_serialized = dill.dumps(dq_metric)
+        instrumentation.count("dill_bytes_serialized", len(dq_metric_serialized))
 
         try:
-            with self._engine.connect() as connection:
+            with self._connect() as connection:
                 connection.execute(text(
                     """INSERT INTO dq_metric (metric_name, metric_description, python_implementation, 
-                    designed_for_level_of_data_granularity) VALUES (:name, :description, :implementation, :lodg)"""),
+                    implementation_hash, designed_for_level_of_data_granularity, is_vectorized)
+                    VALUES (:name, :description, :implementation, :hash, :lodg, :vectorized)"""),
                     {"name": dq_metric_name, "description": dq_metric_description,
-                     "implementation": dq_metric_serialized, "lodg": level_of_data_granularity.name})
-                connection.commit()
+                     "implementation": dq_metric_serialized, "hash": hash_implementation(dq_metric_serialized),
+                     "lodg": level_of_data_granularity.name,
+                     "vectorized": vectorized})
+                self._commit(connection)
         except IntegrityError:
             logging.warning(
                 f"A DQ metric with the name \"{dq_metric_name}\" cannot be stored, " +
                 f"since a metric with the same name already exists.")
 
-        for dimension_name in dimensions:
-            try:
-                with self._engine.connect() as connection:
-                    connection.execute(text(
-                        """INSERT INTO metric_computes_value_for_dimension (metric_name, dimension_name) VALUES (:m_name, :d_name)"""),
-                        {"m_name": dq_metric_name, "d_name": dimension_name})
-                    connection.commit()
-            except IntegrityError:
-                logging.warning(
-                    f"""The DQ metric with the name \"{dq_metric_name}\" cannot be associated with the DQ dimension \"{dimension_name}\", since\n - this association is already in place, or \n the dimension \"{dimension_name}\" does not exist.""")
-
+        with self._connect() as connection:
+            for dimension_name in dimensions:
+                try:
+                    with connection.begin_nested():
+                        connection.execute(text(
+                            """INSERT INTO metric_computes_value_for_dimension (metric_name, dimension_name) VALUES (:m_name, :d_name)"""),
+                            {"m_name": dq_metric_name, "d_name": dimension_name})
+                except IntegrityError:
+                    logging.warning(
+                        f"""The DQ metric with the name \"{dq_metric_name}\" cannot be associated with the DQ dimension \"{dimension_name}\", since\n - this association is already in place, or \n the dimension \"{dimension_name}\" does not exist.""")
+            self._commit(connection)
+        self.catalog.invalidate()
+
+    @_routed(lambda router, arguments: router.route(
+        {arguments["global_identifier"]: arguments["parent_identifier"]})[arguments["global_identifier"]])
     def store_data_element(self,
                            global_identifier: str,
                            local_identifier: str,
@@ -409,23 +2266,26 @@ class DaQSS:
                 The unique identifier of a data element in which this data element is contained.
                 Defaults to None, which means that the data element is not contained in any other data element.
             """
+        instrumentation.count("rows_attempted")
         if parent_identifier is None:
             try:
-                with self._engine.connect() as connection:
+                with self._connect() as connection:
                     connection.execute(text(
                         "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier, " +
                         "is_of_level_of_data_granularity) VALUES (:g_id, :l_id, :lodg)"),
                         {"g_id": global_identifier,
                          "l_id": local_identifier,
                          "lodg": level_of_data_granularity.name})
-                    connection.commit()
+                    self._commit(connection)
+                instrumentation.count("rows_stored")
             except IntegrityError:
+                instrumentation.count("rows_rejected")
                 logging.warning(
                     f"The data element with the global_identifier \"{global_identifier}\" cannot " +
                     f"be stored, since an data element with the same global_identifier already exists.")
         else:
             try:
-                with self._engine.connect() as connection:
+                with self._connect() as connection:
                     connection.execute(text(
                         "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier, " +
                         "is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
@@ -434,18 +2294,344 @@ class DaQSS:
                          "l_id": local_identifier,
                          "lodg": level_of_data_granularity.name,
                          "parent_identifier": parent_identifier})
-                    connection.commit()
+                    self._commit(connection)
+                instrumentation.count("rows_stored")
             except IntegrityError:
+                instrumentation.count("rows_rejected")
                 logging.warning(
                     f"The data element with the global_identifier \"{global_identifier}\" cannot " +
                     f"be stored, since \n - an data element with the same global_identifier already exists, or\n " +
                     f"- the provided parent data element global_identifier \"{parent_identifier} does not exist.")
 
+    def store_data_elements(self, data_elements: Iterable[DataElement | tuple]) -> pandas.DataFrame:
+        """Stores the representations of many data elements in the connected PostgreSQL database within a single
+        transaction.
+
+        The data elements are ordered such that parents are stored before their children. Hence, the data elements
+        may be supplied in any order, and parent data elements may either be part of the supplied data elements or
+        already be represented in DaQSS. If a data element is supplied more than once, its first occurrence is used.
+
+        Args:
+            data_elements: The data elements to be stored, either as trees of
+                [`DataElement`][src.daqss.api.DataElement] instances or as tuples of the form
+                `(global_identifier, local_identifier, level_of_data_granularity, parent_identifier)`.
+
+        Returns:
+            A DataFrame indexed by the global identifiers of the supplied data elements. Its column `status` is
+            either `new`, `existing`, or `rejected`. For rejected data elements, the column `reason` describes why
+            they could not be stored.
+
+        ??? example
+            ``` python
+            d.store_data_elements([
+                DataElement("sqlite:///products.sqlite", "products.sqlite", DATABASE, children=[
+                    DataElement("sqlite:///products.sqlite/ca_products", "ca_products", TABLE),
+                    DataElement("sqlite:///products.sqlite/us_products", "us_products", TABLE)])])
+            ```
+        """
+        records: dict[str, DataElement] = {}
+        pending: list[DataElement] = [DataElement(*data_element) for data_element in data_elements]
+        pending.reverse()
+        while len(pending) > 0:
+            record: DataElement = pending.pop()
+            records.setdefault(record.global_identifier, record)
+            pending.extend(reversed([DataElement(*child)._replace(parent_identifier=record.global_identifier)
+                                     for child in record.children]))
+
+        router: sharding.ShardRouter | None = self._router
+        if router is None or sharding.current_shard.get() is not None:
+            return self._store_data_elements(records)
+
+        # Whole trees are stored on the same shard, hence the parents of the data elements are found on their shard
+        shards: dict[str, int] = router.route({global_identifier: record.parent_identifier
+                                               for global_identifier, record in records.items()})
+        grouped: dict[int, dict[str, DataElement]] = {}
+        for global_identifier, record in records.items():
+            grouped.setdefault(shards[global_identifier], {})[global_identifier] = record
+        result: pandas.DataFrame = pandas.concat(router.run(
+            lambda shard: self._store_data_elements(grouped.get(shard, {})), sorted(grouped) or [0]))
+        router.remember((global_identifier, shards[global_identifier])
+                        for global_identifier in result.index[result["status"] != "rejected"])
+        return result
+
+    def _store_data_elements(self, records: dict[str, DataElement]) -> pandas.DataFrame:
+        """Stores data elements within a single transaction, as described for
+        [`store_data_elements`][src.daqss.api.DaQSS.store_data_elements].
+
+        Args:
+            records: The data elements, keyed by their global identifiers, whose children have already been
+                supplied as separate data elements referencing them as parent.
+
+        Returns:
+            The DataFrame described for [`store_data_elements`][src.daqss.api.DaQSS.store_data_elements]."""
+        statuses: dict[str, tuple[str, str | None]] = {}
+
+        depths: dict[str, int | None] = {}
+        for global_identifier in records:
+            path: list[str] = []
+            path_elements: set[str] = set()
+            current: str | None = global_identifier
+            while current in records and current not in depths and current not in path_elements:
+                path.append(current)
+                path_elements.add(current)
+                current = records[current].parent_identifier
+            if current in path_elements or (current in depths and depths[current] is None):
+                depth: int | None = None
+            else:
+                depth: int | None = depths.get(current, -1)
+            for element in reversed(path):
+                depth = None if depth is None else depth + 1
+                depths[element] = depth
+
+        external_parents: set[str] = {record.parent_identifier for record in records.values()
+                                      if record.parent_identifier is not None
+                                      and record.parent_identifier not in records}
+
+        with self._connect() as connection:
+            existing_parents: set[str] = set()
+            if len(external_parents) > 0:
+                existing_parents = set(connection.execute(text(
+                    "SELECT data_element_global_identifier FROM data_element " +
+                    "WHERE data_element_global_identifier = ANY(:parents)"),
+                    {"parents": list(external_parents)}).scalars().all())
+            levels: set[str] = set(connection.execute(text(
+                "SELECT level_name FROM levels_of_data_granularity")).scalars().all())
+
+            accepted: list[DataElement] = []
+            for global_identifier in sorted((g for g in records if depths[g] is not None), key=depths.get):
+                record: DataElement = records[global_identifier]
+                parent: str | None = record.parent_identifier
+                level: str = getattr(record.level_of_data_granularity, "name", record.level_of_data_granularity)
+                if level not in levels:
+                    statuses[global_identifier] = ("rejected", f"the level of data granularity \"{level}\" " +
+                                                   "does not exist")
+                elif parent is not None and parent not in records and parent not in existing_parents:
+                    statuses[global_identifier] = ("rejected", f"the parent data element \"{parent}\" " +
+                                                   "does not exist")
+                elif parent is not None and parent in statuses and statuses[parent][0] == "rejected":
+                    statuses[global_identifier] = ("rejected", f"the parent data element \"{parent}\" " +
+                                                   "was rejected")
+                else:
+                    accepted.append(record._replace(level_of_data_granularity=level))
+            for global_identifier in records:
+                if depths[global_identifier] is None:
+                    statuses[global_identifier] = ("rejected", "the data element is contained in itself " +
+                                                   "through a cycle of parent data elements")
+
+            staged: pandas.DataFrame = pandas.DataFrame({
+                "global_identifier": [record.global_identifier for record in accepted],
+                "local_identifier": [record.local_identifier for record in accepted],
+                "level_of_data_granularity": [record.level_of_data_granularity for record in accepted],
+                "parent_identifier": [record.parent_identifier for record in accepted],
+                "depth": [depths[record.global_identifier] for record in accepted]})
+
+            connection.execute(text(
+                "CREATE TEMPORARY TABLE data_element_staging (global_identifier TEXT NOT NULL, " +
+                "local_identifier TEXT, level_of_data_granularity TEXT NOT NULL, parent_identifier TEXT, " +
+                "depth INTEGER NOT NULL) ON COMMIT DROP"))
+            _copy_dataframe_into_table(connection, "data_element_staging", staged)
+            new_data_element_ids: list[Row] = connection.execute(text(
+                "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier, " +
+                "is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
+                "SELECT global_identifier, local_identifier, level_of_data_granularity, parent_identifier " +
+                "FROM data_element_staging ORDER BY depth " +
+                "ON CONFLICT DO NOTHING " +
+                "RETURNING data_element_global_identifier, data_element_id")).all()
+            new: set[str] = {row[0] for row in new_data_element_ids}
+            self._remember_data_element_ids(new_data_element_ids)
+            connection.execute(text("DROP TABLE data_element_staging"))
+            self._commit(connection)
+
+        for record in accepted:
+            statuses[record.global_identifier] = ("new", None) if record.global_identifier in new \
+                else ("existing", None)
+
+        result: pandas.DataFrame = pandas.DataFrame.from_dict(statuses, orient="index", columns=["status", "reason"])
+        result.index.name = "global_identifier"
+        rejected_count: int = int((result["status"] == "rejected").sum())
+        instrumentation.count("rows_attempted", len(result))
+        instrumentation.count("rows_stored", len(result) - rejected_count)
+        instrumentation.count("rows_rejected", rejected_count)
+        if rejected_count > 0:
+            logging.warning(f"{rejected_count} data elements cannot be stored, since\n" +
+                            " - their parent data element does not exist, or\n" +
+                            " - they are contained in themselves through a cycle of parent data elements, or\n" +
+                            " - their level of data granularity does not exist.")
+        return result
+
+    def _store_dq_results_from_series_in_bulk(self,
+                                              level_of_data_granularity: LevelOfDataGranularity,
+                                              parent_data_element: str,
+                                              values: pandas.Series,
+                                              timestamp: datetime,
+                                              dq_metric_name: str | None = None,
+                                              aggregation_process: str | None = None,
+                                              fingerprints: pandas.Series | None = None,
+                                              timestamps: pandas.Series | None = None,
+                                              batched: bool = False) -> pandas.DataFrame:
+        """Stores multiple DQ result values within a single transaction. The values are streamed into a temporary
+        staging table using PostgreSQL `COPY` and are merged from there into the tables `data_element` and
+        `dq_result_row` using set-based statements.
+
+        Args:
+            level_of_data_granularity: The level of data granularity of the individual result values.
+            parent_data_element: The parent data element which contains the individual result values to be stored.
+            values: A Pandas series of values that contains the computed result values and the local identifiers of
+                their corresponding data values.
+            timestamp: The creation timestamp that is stored for all result values.
+            dq_metric_name: The name of the DQ metric that computed the result values, if they are measurement
+                results.
+            aggregation_process: The name of the aggregation process that computed the result values, if they are
+                aggregation results.
+            fingerprints: The fingerprints of the measured data elements, indexed like the values, which are stored
+                if the values are measurement results.
+            timestamps: The creation timestamps of the individual result values, aligned with the values, which
+                replace the common creation timestamp. In this case, the same data element may occur multiple times
+                with different creation timestamps.
+            batched: Whether the result values are stored in the table `dq_result_batch` instead of the table
+                `dq_result_row`, i.e., as one row per creation timestamp instead of one row per result value.
+
+        Returns:
+            A DataFrame containing the result values that could not be stored and the reason for their rejection.
+        """
+        rejected: list[pandas.DataFrame] = []
+
+        local_identifiers: pandas.Index = values.index.map(str)
+        result_values: pandas.Series = pandas.to_numeric(values, errors="coerce")
+
+        creation_timestamps = (pandas.Series(pandas.Timestamp(timestamp), index=values.index) if timestamps is None
+                               else pandas.to_datetime(timestamps)).to_numpy()
+        missing_identifier = values.index.to_series().isna().to_numpy() | (local_identifiers == "")
+        duplicated_identifier = pandas.MultiIndex.from_arrays([local_identifiers, creation_timestamps]) \
+            .duplicated(keep="first") & ~missing_identifier
+        missing_value = values.isna().to_numpy() & ~(missing_identifier | duplicated_identifier)
+        not_numeric = result_values.isna().to_numpy() & values.notna().to_numpy() & \
+            ~(missing_identifier | duplicated_identifier)
+        rejected.append(_rejected_rows(values, missing_identifier, "no local identifier was provided"))
+        rejected.append(_rejected_rows(values, duplicated_identifier,
+                                       "a result value for the same data element was provided before"))
+        rejected.append(_rejected_rows(values, missing_value, "no result value was provided"))
+        rejected.append(_rejected_rows(values, not_numeric, "the result value is not numeric"))
+
+        accepted = ~(missing_identifier | duplicated_identifier | missing_value | not_numeric)
+        staged: pandas.DataFrame = pandas.DataFrame({"local_identifier": local_identifiers[accepted],
+                                                     "result_value": result_values.to_numpy()[accepted],
+                                                     "creation_timestamp": creation_timestamps[accepted]})
+        if fingerprints is not None:
+            staged["fingerprint"] = fingerprints[~fingerprints.index.duplicated()].astype("Int64") \
+                .reindex(values.index).to_numpy()[accepted]
+        parameters: dict = {"parent_identifier": parent_data_element,
+                            "lodg": level_of_data_granularity.name, "metric_name": dq_metric_name,
+                            "agg": aggregation_process}
+
+        with self._connect() as connection:
+            connection.execute(text(
+                "CREATE TEMPORARY TABLE dq_result_staging (local_identifier TEXT NOT NULL, " +
+                "result_value DOUBLE PRECISION NOT NULL, creation_timestamp TIMESTAMP NOT NULL, fingerprint BIGINT) " +
+                "ON COMMIT DROP"))
+            _copy_dataframe_into_table(connection, "dq_result_staging", staged)
+
+            parameters["parent_data_element_id"] = self._data_element_id(connection, parent_data_element)
+            if parameters["parent_data_element_id"] is None:
+                self._rollback(connection)
+                rejected.append(_rejected_rows(values, accepted,
+                                               "the provided parent data element is not represented in DaQSS"))
+                return pandas.concat(rejected)
+
+            # Both tables are searched separately using their indexes, whereby only the batches of the parent data
+            # element with the staged creation timestamps are unnested
+            result_filter: str = ("calculated_by_dq_metric = CAST(:metric_name AS TEXT)" if dq_metric_name is not None
+                                  else "calculated_by_aggregation_process = CAST(:agg AS TEXT)")
+            conflicting: list[Row] = connection.execute(text(
+                "DELETE FROM dq_result_staging AS staging USING data_element, dq_result_row " +
+                "WHERE data_element.data_element_global_identifier = " +
+                "    CAST(:parent_identifier AS TEXT) || '#' || staging.local_identifier " +
+                "AND dq_result_row.computed_on_data_element_id = data_element.data_element_id " +
+                f"AND dq_result_row.{result_filter} " +
+                "AND dq_result_row.creation_timestamp = staging.creation_timestamp " +
+                "AND dq_result_row.creation_timestamp BETWEEN " +
+                "    (SELECT min(creation_timestamp) FROM dq_result_staging) " +
+                "    AND (SELECT max(creation_timestamp) FROM dq_result_staging) " +
+                "RETURNING staging.local_identifier, staging.creation_timestamp"),
+                parameters).all()
+            conflicting += connection.execute(text(
+                "DELETE FROM dq_result_staging AS staging USING data_element, (" +
+                "    SELECT batch.creation_timestamp, entry.data_element_id FROM dq_result_batch AS batch " +
+                "    CROSS JOIN LATERAL unnest(batch.data_element_ids) AS entry (data_element_id) " +
+                "    WHERE batch.parent_data_element_id = CAST(:parent_data_element_id AS BIGINT) " +
+                "    AND batch.creation_timestamp IN (SELECT creation_timestamp FROM dq_result_staging) " +
+                f"    AND batch.{result_filter}) AS stored " +
+                "WHERE data_element.data_element_global_identifier = " +
+                "    CAST(:parent_identifier AS TEXT) || '#' || staging.local_identifier " +
+                "AND stored.data_element_id = data_element.data_element_id " +
+                "AND stored.creation_timestamp = staging.creation_timestamp " +
+                "RETURNING staging.local_identifier, staging.creation_timestamp"),
+                parameters).all()
+            is_conflicting = pandas.MultiIndex.from_arrays([local_identifiers, creation_timestamps]).isin(
+                [(row[0], pandas.Timestamp(row[1])) for row in conflicting])
+            if len(conflicting) > 0:
+                rejected.append(_rejected_rows(values, accepted & is_conflicting,
+                                               "a result value for the same data element and creation timestamp " +
+                                               "is already stored"))
+
+            try:
+                connection.execute(text(
+                    "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier, " +
+                    "is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
+                    "SELECT CAST(:parent_identifier AS TEXT) || '#' || local_identifier, local_identifier, " +
+                    "CAST(:lodg AS TEXT), CAST(:parent_identifier AS TEXT) " +
+                    "FROM (SELECT DISTINCT local_identifier FROM dq_result_staging) AS staging " +
+                    "ON CONFLICT DO NOTHING"),
+                    parameters)
+                staged_results: str = ("SELECT staging.creation_timestamp, staging.result_value, " +
+                                       "data_element.data_element_id, " +
+                                       "CAST(:metric_name AS TEXT), CAST(:agg AS TEXT) " +
+                                       "FROM dq_result_staging AS staging JOIN data_element " +
+                                       "ON data_element.data_element_global_identifier = " +
+                                       "    CAST(:parent_identifier AS TEXT) || '#' || staging.local_identifier")
+                if batched:
+                    _insert_dq_result_batches(connection, staged_results, parameters)
+                else:
+                    connection.execute(text(
+                        "INSERT INTO dq_result_row " +
+                        "(creation_timestamp, result_value, computed_on_data_element_id, " +
+                        "calculated_by_dq_metric, calculated_by_aggregation_process) " + staged_results),
+                        parameters)
+                # Batches are recorded in dq_result_latest once it is read, such that storing them writes no row per
+                # result value. Otherwise, only the most recent result value of each data element is a candidate.
+                if not batched:
+                    _upsert_latest_dq_results(connection,
+                                              "SELECT DISTINCT ON (staged.data_element_id) * " +
+                                              f"FROM ({staged_results}) AS staged (creation_timestamp, " +
+                                              "result_value, data_element_id, dq_metric, aggregation_process) " +
+                                              "ORDER BY staged.data_element_id, staged.creation_timestamp DESC",
+                                              parameters, dq_metric_name is not None)
+                if dq_metric_name is not None and fingerprints is not None:
+                    _upsert_fingerprints(connection,
+                                         "SELECT DISTINCT ON (data_element.data_element_id) " +
+                                         "data_element.data_element_id, staging.fingerprint " +
+                                         "FROM dq_result_staging AS staging JOIN data_element " +
+                                         "ON data_element.data_element_global_identifier = " +
+                                         "    CAST(:parent_identifier AS TEXT) || '#' || staging.local_identifier " +
+                                         "ORDER BY data_element.data_element_id, staging.creation_timestamp DESC",
+                                         parameters)
+                connection.execute(text("DROP TABLE dq_result_staging"))
+                self._commit(connection)
+            except IntegrityError:
+                self._rollback(connection)
+                rejected.append(_rejected_rows(values, accepted & ~is_conflicting,
+                                               "the DQ metric or aggregation process is not stored in DaQSS"))
+
+        return pandas.concat(rejected)
+
+    @_routed(_shard_of_data_element("parent_data_element"))
     def store_dq_aggregation_results_from_series(self,
                                                  aggregation_process: str,
                                                  level_of_data_granularity: LevelOfDataGranularity,
                                                  parent_data_element: str,
-                                                 values: pandas.Series):
+                                                 values: pandas.Series,
+                                                 bulk: bool = False,
+                                                 batched: bool = False) -> pandas.DataFrame:
         """Stores multiple result values computed by a DQ aggregation process.
         If they do not exist, the representations of the data of which the DQ was computed are created.
 
@@ -455,43 +2641,233 @@ class DaQSS:
             parent_data_element: The parent data element which contains the individual result values to be stored.
             values: A Pandas series of values that contains the computed result values and the local identifiers of
                 their corresponding data values.
+            bulk: If set to `True`, all result values are stored within a single transaction using PostgreSQL
+                `COPY`, which is substantially faster for large series. Otherwise, each result value is stored
+                in its own transaction. Defaults to `False`.
+            batched: If set to `True`, all result values are stored as a single row of the table `dq_result_batch`,
+                which holds the surrogate keys of the data elements and the result values as arrays compressed by
+                PostgreSQL, instead of one row per result value in the table `dq_result_row`. This reduces the
+                storage and the write cost of large series substantially and implies `bulk`. The result values are
+                retrieved like all others, also by SQL queries of the view `dq_result`, e.g., the queries of
+                aggregation processes. They are recorded as the most recent DQ results once these are retrieved or
+                DQ results are compacted. Defaults to `False`.
+
+        Returns:
+            A DataFrame, indexed by the local identifiers of the rejected result values, that contains the result
+            values that could not be stored in the column `result_value` and the reason in the column `reason`.
         """
-        timestamp: str = datetime.now(tz=timezone.utc).isoformat()
-        show_warning: bool = False
-        for index, value in values.items():
-            try:
-                with self._engine.connect() as connection:
-                    data_element = parent_data_element + "#" + str(index)
-                    connection.execute(text(
-                        "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier," +
-                        " is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
-                        "VALUES (:g_id, :l_id, :lodg, :parent_identifier) " +
-                        "ON CONFLICT DO NOTHING "),
-                        {"g_id": data_element,
-                         "l_id": str(index),
-                         "lodg": level_of_data_granularity.name,
-                         "parent_identifier": parent_data_element})
-                    connection.execute(text(
-                        "INSERT INTO dq_result " +
-                        "(creation_timestamp, result_value, computed_on_data_element_global_id," +
-                        " calculated_by_aggregation_process) VALUES (:timestamp, :result_value, :data_element, :agg)"),
-                        {"timestamp": timestamp, "result_value": value, "data_element": data_element,
-                         "agg": aggregation_process})
-                connection.commit()
-            except IntegrityError as ie:
-                show_warning = True
+        timestamp: datetime = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        self._ensure_dq_result_partition(timestamp)
 
-        if show_warning:
+        if bulk or batched:
+            rejected: pandas.DataFrame = self._store_dq_results_from_series_in_bulk(
+                level_of_data_granularity, parent_data_element, values, timestamp,
+                aggregation_process=aggregation_process, batched=batched)
+        else:
+            rejected_indices: list = []
+            rejected_values: list = []
+            for index, value in values.items():
+                try:
+                    with self._connect() as connection:
+                        data_element_id: int = self._intern_data_element(
+                            connection, parent_data_element + "#" + str(index), str(index),
+                            level_of_data_granularity, parent_data_element)
+                        connection.execute(text(
+                            "INSERT INTO dq_result_row " +
+                            "(creation_timestamp, result_value, computed_on_data_element_id," +
+                            " calculated_by_aggregation_process) VALUES (:timestamp, :result_value, :data_element, :agg)"),
+                            {"timestamp": timestamp, "result_value": value, "data_element": data_element_id,
+                             "agg": aggregation_process})
+                        _upsert_latest_dq_results(connection,
+                                                  "VALUES (:timestamp, :result_value, :data_element, NULL, :agg)",
+                                                  {"timestamp": timestamp, "result_value": value,
+                                                   "data_element": data_element_id, "agg": aggregation_process},
+                                                  False)
+                        self._commit(connection)
+                except IntegrityError as ie:
+                    rejected_indices.append(index)
+                    rejected_values.append(value)
+
+            rejected: pandas.DataFrame = pandas.DataFrame({"result_value": rejected_values}, index=rejected_indices)
+            rejected["reason"] = "storing the result value violated an integrity constraint"
+
+        instrumentation.count("rows_attempted", len(values))
+        instrumentation.count("rows_stored", len(values) - len(rejected))
+        instrumentation.count("rows_rejected", len(rejected))
+        if len(rejected) > 0:
             logging.warning(
-                f"At least one DQ aggregation result cannot be stored, since for at least one result value\n" +
+                f"{len(rejected)} DQ aggregation results cannot be stored, since for these result values\n" +
                 f" - no data element global_identifier was provided, or\n" +
                 f" - the DQ aggregation computed two results for the same data element, or\n" +
                 f" - the provided parent data element is not represented in DaQSS")
+        return rejected
+
+    @_routed(_shard_of_data_element("parent_data_element"))
+    def store_dq_measurement_results_from_dataframe(self, dataframe: pandas.DataFrame,
+                                                    level_of_data_granularity: LevelOfDataGranularity,
+                                                    parent_data_element: str,
+                                                    batched: bool = False) -> pandas.DataFrame:
+        """Stores the result values of multiple DQ metrics computed on the same data elements, e.g., of several DQ
+        metrics run on the rows of the same table, within a single transaction. All result values are created at
+        the same point in time.
+
+        Compared to storing the result values of each DQ metric using
+        [`store_dq_measurement_results_from_series`][src.daqss.api.DaQSS.store_dq_measurement_results_from_series],
+        the data elements are stored and looked up only once for all DQ metrics. The DataFrame is reshaped into one
+        row per result value by Pandas, streamed into temporary staging tables using PostgreSQL `COPY`, and merged
+        into the tables `dq_result_row` and `dq_result_latest` using one statement each.
+
+        Args:
+            dataframe: The result values, whose columns are named after the DQ metrics that computed them and whose
+                index contains the local identifiers of the data elements they were computed on.
+            level_of_data_granularity: The level of data granularity of the data elements.
+            parent_data_element: The parent data element which contains the data elements.
+            batched: If set to `True`, the result values of each DQ metric are stored as a single row of the table
+                `dq_result_batch` instead of one row per result value in the table `dq_result_row`, as described for
+                [`store_dq_measurement_results_from_series`][src.daqss.api.DaQSS.store_dq_measurement_results_from_series].
+                Defaults to `False`.
 
+        Returns:
+            A DataFrame, indexed by the local identifiers of the rejected result values, that contains the result
+            values that could not be stored in the column `result_value`, the name of their DQ metric in the column
+            `dq_metric`, and the reason in the column `reason`.
+
+        ??? example
+            ``` python
+            results = pandas.DataFrame({"arith_mean_completeness_per_row": arith_mean_completeness_per_row(df),
+                                        "validity_of_email": validity_of_email(df)})
+            d.store_dq_measurement_results_from_dataframe(results, ROW, fake_customer_global_identifier)
+            ```
+        """
+        timestamp: datetime = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        self._ensure_dq_result_partition(timestamp)
+
+        with self._connect() as connection:
+            metric_names: pandas.Index = pandas.Index([str(getattr(column, "__name__", column))
+                                                       for column in dataframe.columns])
+            local_identifiers: pandas.Index = dataframe.index.map(str)
+            missing_identifier = dataframe.index.to_series().isna().to_numpy() | (local_identifiers == "")
+            duplicated_identifier = local_identifiers.duplicated(keep="first") & ~missing_identifier
+            unknown_names: set[str] = {name for name in metric_names if name not in self.catalog.metrics}
+            if len(unknown_names) > 0:
+                # The snapshot may not include DQ metrics stored recently by other processes
+                unknown_names -= set(connection.execute(text(
+                    "SELECT metric_name FROM dq_metric WHERE metric_name = ANY(:names)"),
+                    {"names": list(unknown_names)}).scalars().all())
+            unknown_metric = metric_names.isin(list(unknown_names))
+            duplicated_metric = metric_names.duplicated(keep="first") & ~unknown_metric
+
+            # Reshapes the result values into one row per result value, which references its row and its column
+            positions: pandas.DataFrame = dataframe.set_axis(range(len(dataframe)), axis=0) \
+                .set_axis(range(len(dataframe.columns)), axis=1)
+            supplied: pandas.DataFrame = positions.melt(var_name="metric_position", value_name="supplied_value",
+                                                        ignore_index=False)
+            row_positions = supplied.index.to_numpy()
+            metric_positions = supplied["metric_position"].to_numpy()
+            result_values: pandas.Series = pandas.to_numeric(supplied["supplied_value"], errors="coerce") \
+                .astype("float64")
+
+            reasons: pandas.Series = pandas.Series(None, index=range(len(supplied)), dtype="object")
+            for mask, reason in ((missing_identifier[row_positions], "no local identifier was provided"),
+                                 (duplicated_identifier[row_positions],
+                                  "a result value for the same data element was provided before"),
+                                 (unknown_metric[metric_positions], "the DQ metric is not stored in DaQSS"),
+                                 (duplicated_metric[metric_positions],
+                                  "a result value of the same DQ metric was provided before"),
+                                 (supplied["supplied_value"].isna().to_numpy(), "no result value was provided"),
+                                 (result_values.isna().to_numpy(), "the result value is not numeric")):
+                reasons.loc[mask & reasons.isna().to_numpy()] = reason
+            accepted = reasons.isna().to_numpy()
+
+            def rejected_values(mask, reason: str | None = None) -> pandas.DataFrame:
+                return pandas.DataFrame({"result_value": supplied["supplied_value"].to_numpy()[mask],
+                                         "dq_metric": metric_names.take(metric_positions[mask]),
+                                         "reason": reasons.to_numpy()[mask] if reason is None else reason},
+                                        index=dataframe.index.take(row_positions[mask]))
+
+            rejected: list[pandas.DataFrame] = [rejected_values(~accepted)]
+            staged_values: pandas.DataFrame = pandas.DataFrame({"row_position": row_positions[accepted],
+                                                                "metric_position": metric_positions[accepted] + 1,
+                                                                "result_value": result_values.to_numpy()[accepted]})
+            staged_rows: pandas.DataFrame = pandas.DataFrame({"row_position": range(len(dataframe)),
+                                                              "local_identifier": local_identifiers})
+            staged_rows = staged_rows[staged_rows["row_position"].isin(staged_values["row_position"])]
+            parameters: dict = {"parent_identifier": parent_data_element, "lodg": level_of_data_granularity.name,
+                                "timestamp": timestamp, "metric_names": list(metric_names)}
+
+            connection.execute(text(
+                "CREATE TEMPORARY TABLE data_element_staging (row_position INTEGER NOT NULL, " +
+                "local_identifier TEXT NOT NULL, data_element_id BIGINT) ON COMMIT DROP"))
+            connection.execute(text(
+                "CREATE TEMPORARY TABLE dq_result_staging (row_position INTEGER NOT NULL, " +
+                "metric_position INTEGER NOT NULL, result_value DOUBLE PRECISION NOT NULL) ON COMMIT DROP"))
+            _copy_dataframe_into_table(connection, "data_element_staging", staged_rows)
+            _copy_dataframe_into_table(connection, "dq_result_staging", staged_values)
+
+            parameters["parent_data_element_id"] = self._data_element_id(connection, parent_data_element)
+            if parameters["parent_data_element_id"] is None:
+                self._rollback(connection)
+                rejected.append(rejected_values(accepted,
+                                                "the provided parent data element is not represented in DaQSS"))
+            else:
+                try:
+                    # The data elements are stored and looked up once for all DQ metrics
+                    connection.execute(text(
+                        "INSERT INTO data_element (data_element_global_identifier, data_element_local_identifier, " +
+                        "is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
+                        "SELECT CAST(:parent_identifier AS TEXT) || '#' || local_identifier, local_identifier, " +
+                        "CAST(:lodg AS TEXT), CAST(:parent_identifier AS TEXT) FROM data_element_staging " +
+                        "ON CONFLICT DO NOTHING"),
+                        parameters)
+                    connection.execute(text(
+                        "UPDATE data_element_staging AS staging SET data_element_id = data_element.data_element_id " +
+                        "FROM data_element WHERE data_element.data_element_global_identifier = " +
+                        "    CAST(:parent_identifier AS TEXT) || '#' || staging.local_identifier"),
+                        parameters)
+                    staged_results: str = ("SELECT CAST(:timestamp AS TIMESTAMP), staging.result_value, " +
+                                           "data_element_staging.data_element_id, " +
+                                           "(CAST(:metric_names AS TEXT[]))[staging.metric_position], " +
+                                           "CAST(NULL AS TEXT) " +
+                                           "FROM dq_result_staging AS staging " +
+                                           "JOIN data_element_staging USING (row_position)")
+                    if batched:
+                        _insert_dq_result_batches(connection, staged_results, parameters)
+                    else:
+                        connection.execute(text(
+                            "INSERT INTO dq_result_row " +
+                            "(creation_timestamp, result_value, computed_on_data_element_id, " +
+                            "calculated_by_dq_metric, calculated_by_aggregation_process) " + staged_results),
+                            parameters)
+                        _upsert_latest_dq_results(connection, staged_results, parameters, True)
+                    connection.execute(text("DROP TABLE dq_result_staging"))
+                    connection.execute(text("DROP TABLE data_element_staging"))
+                    self._commit(connection)
+                except IntegrityError:
+                    self._rollback(connection)
+                    rejected.append(rejected_values(accepted, "storing the result values violated an integrity " +
+                                                              "constraint"))
+
+        rejected_frame: pandas.DataFrame = pandas.concat(rejected)
+        instrumentation.count("rows_attempted", len(supplied))
+        instrumentation.count("rows_stored", len(supplied) - len(rejected_frame))
+        instrumentation.count("rows_rejected", len(rejected_frame))
+        if len(rejected_frame) > 0:
+            logging.warning(
+                f"{len(rejected_frame)} DQ measurement results cannot be stored, since for these result values\n" +
+                f" - no data element global_identifier was provided, or\n" +
+                f" - two results were provided for the same data element and DQ metric, or\n" +
+                f" - the DQ metric is not stored in DaQSS, or\n" +
+                f" - the provided parent data element is not represented in DaQSS")
+        return rejected_frame
+
+    @_routed(_shard_of_data_element("parent_data_element"))
     def store_dq_measurement_results_from_series(self, dq_metric: Callable,
                                                  level_of_data_granularity: LevelOfDataGranularity,
                                                  parent_data_element: str,
-                                                 values: pandas.Series):
+                                                 values: pandas.Series,
+                                                 bulk: bool = False,
+                                                 fingerprints: pandas.Series | None = None,
+                                                 batched: bool = False) -> pandas.DataFrame:
         """Stores multiple result values computed by a DQ metric.
         If they do not exist, the representations of the data of which the DQ was computed are created.
 
@@ -501,34 +2877,132 @@ class DaQSS:
             level_of_data_granularity: The level of data granularity of the individual result values.
             parent_data_element: The parent data element which contains the individual result values to be stored.
             values: A Pandas series of values that contains the computed result values and the local identifiers of
-                their corresponding data values."""
-        timestamp: str = datetime.now(tz=timezone.utc).isoformat()
-        show_warning: bool = False
+                their corresponding data values.
+            bulk: If set to `True`, all result values are stored within a single transaction using PostgreSQL
+                `COPY`, which is substantially faster for large series. Otherwise, each result value is stored
+                in its own transaction. Defaults to `False`.
+            fingerprints: A series of fingerprints of the content of the measured data elements, indexed like the
+                values, as computed by `metric_execution.fingerprint`.
+                The fingerprints are stored next to the result values, such that unchanged data elements can be
+                skipped by [`measure_dq_metric_incrementally`][src.daqss.api.DaQSS.measure_dq_metric_incrementally].
+                Defaults to `None`, which means that no fingerprints are stored.
+            batched: If set to `True`, all result values are stored as a single row of the table `dq_result_batch`,
+                which holds the surrogate keys of the data elements and the result values as arrays compressed by
+                PostgreSQL, instead of one row per result value in the table `dq_result_row`. This reduces the
+                storage and the write cost of large series substantially and implies `bulk`. The result values are
+                retrieved like all others, also by SQL queries of the view `dq_result`, e.g., the queries of
+                aggregation processes. They are recorded as the most recent DQ results once these are retrieved or
+                DQ results are compacted. Defaults to `False`.
 
-        for index, value in values.items():
-            try:
-                with self._engine.connect() as connection:
-                    data_element = parent_data_element + "#" + str(index)
-                    connection.execute(text(
-                        "INSERT INTO data_element (data_element_global_identifier,  data_element_local_identifier, " +
-                        "is_of_level_of_data_granularity, parent_data_element_global_identifier) " +
-                        "VALUES (:g_id, :l_id, :lodg, :parent_identifier) " +
-                        "ON CONFLICT DO NOTHING "),
-                        {"g_id": data_element, "l_id": str(index), "lodg": level_of_data_granularity.name,
-                         "parent_identifier": parent_data_element})
-                    connection.execute(text(
-                        "INSERT INTO dq_result " +
-                        "(creation_timestamp, result_value, computed_on_data_element_global_id," +
-                        " calculated_by_dq_metric) VALUES (:timestamp, :result_value, :data_element, :metric_name)"),
-                        {"timestamp": timestamp, "result_value": value, "data_element": data_element,
-                         "metric_name": dq_metric.__name__})
-                    connection.commit()
-            except IntegrityError as ie:
-                show_warning = True
-
-        if show_warning:
+        Returns:
+            A DataFrame, indexed by the local identifiers of the rejected result values, that contains the result
+            values that could not be stored in the column `result_value` and the reason in the column `reason`.
+        """
+        timestamp: datetime = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        self._ensure_dq_result_partition(timestamp)
+
+        if bulk or batched:
+            rejected: pandas.DataFrame = self._store_dq_results_from_series_in_bulk(
+                level_of_data_granularity, parent_data_element, values, timestamp,
+                dq_metric_name=dq_metric.__name__, fingerprints=fingerprints, batched=batched)
+        else:
+            if fingerprints is not None:
+                fingerprints = fingerprints[~fingerprints.index.duplicated()]
+            rejected_indices: list = []
+            rejected_values: list = []
+            for index, value in values.items():
+                try:
+                    with self._connect() as connection:
+                        data_element_id: int = self._intern_data_element(
+                            connection, parent_data_element + "#" + str(index), str(index),
+                            level_of_data_granularity, parent_data_element)
+                        connection.execute(text(
+                            "INSERT INTO dq_result_row " +
+                            "(creation_timestamp, result_value, computed_on_data_element_id," +
+                            " calculated_by_dq_metric) VALUES (:timestamp, :result_value, :data_element, :metric_name)"),
+                            {"timestamp": timestamp, "result_value": value, "data_element": data_element_id,
+                             "metric_name": dq_metric.__name__})
+                        _upsert_latest_dq_results(connection,
+                                                  "VALUES (:timestamp, :result_value, :data_element, :metric_name, NULL)",
+                                                  {"timestamp": timestamp, "result_value": value,
+                                                   "data_element": data_element_id, "metric_name": dq_metric.__name__},
+                                                  True)
+                        if fingerprints is not None and index in fingerprints.index:
+                            _upsert_fingerprints(connection,
+                                                 "VALUES (CAST(:data_element AS BIGINT), " +
+                                                 "CAST(:fingerprint AS BIGINT))",
+                                                 {"data_element": data_element_id, "metric_name": dq_metric.__name__,
+                                                  "fingerprint": int(fingerprints.loc[index])})
+                        self._commit(connection)
+                except IntegrityError as ie:
+                    rejected_indices.append(index)
+                    rejected_values.append(value)
+
+            rejected: pandas.DataFrame = pandas.DataFrame({"result_value": rejected_values}, index=rejected_indices)
+            rejected["reason"] = "storing the result value violated an integrity constraint"
+
+        instrumentation.count("rows_attempted", len(values))
+        instrumentation.count("rows_stored", len(values) - len(rejected))
+        instrumentation.count("rows_rejected", len(rejected))
+        if len(rejected) > 0:
             logging.warning(
-                f"At least one DQ measurement result cannot be stored, since for at least one result value\n" +
+                f"{len(rejected)} DQ measurement results cannot be stored, since for these result values\n" +
                 f" - no data element global_identifier was provided, or\n" +
                 f" - the DQ metric computed two results for the same data element, or\n" +
                 f" - the provided parent data element is not represented in DaQSS")
+        return rejected
+
+    @_synchronizing_shards
+    def store_retention_policy(self, retention_days: int, dq_metric: Callable | str | None = None,
+                               aggregation_process: str | None = None, granularity: str = "day"):
+        """Stores the retention policy of a DQ metric or an aggregation process, or replaces its existing retention
+        policy. DQ results older than the retention period are compacted into one row per data element and day or
+        week by [`compact_dq_results`][src.daqss.api.DaQSS.compact_dq_results], and can still be retrieved using the
+        option `include_rollups` of [`retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results].
+        DQ results of DQ metrics and aggregation processes without a retention policy are kept forever.
+
+        Args:
+            retention_days: The number of days for which DQ results are kept at full resolution.
+            dq_metric: The DQ metric, or its name, to which the retention policy applies.
+            aggregation_process: The name of the aggregation process to which the retention policy applies.
+            granularity: The period per which older DQ results are compacted, either `day` or `week`.
+                Defaults to `day`.
+
+        Raises:
+            ValueError: If not exactly one DQ metric or aggregation process is given, if the retention period is not
+                positive, or if the granularity is neither `day` nor `week`.
+        """
+        if (dq_metric is None) == (aggregation_process is None):
+            raise ValueError("A retention policy applies either to a DQ metric or to an aggregation process.")
+        if retention_days < 1:
+            raise ValueError("The retention period must comprise at least one day.")
+        if granularity not in _ROLLUP_GRANULARITIES:
+            raise ValueError(f"The granularity of a retention policy must be one of {', '.join(_ROLLUP_GRANULARITIES)}.")
+
+        column: str = "applies_to_dq_metric" if dq_metric is not None else "applies_to_aggregation_process"
+        try:
+            with self._connect() as connection:
+                connection.execute(text(
+                    "INSERT INTO retention_policy (applies_to_dq_metric, applies_to_aggregation_process, " +
+                    "raw_retention_days, rollup_granularity) " +
+                    "VALUES (:dq_metric, :aggregation_process, :retention_days, :granularity) " +
+                    f"ON CONFLICT ({column}) WHERE {column} IS NOT NULL " +
+                    "DO UPDATE SET raw_retention_days = EXCLUDED.raw_retention_days, " +
+                    "rollup_granularity = EXCLUDED.rollup_granularity"),
+                    {"dq_metric": getattr(dq_metric, "__name__", dq_metric),
+                     "aggregation_process": aggregation_process, "retention_days": retention_days,
+                     "granularity": granularity})
+                self._commit(connection)
+        except IntegrityError:
+            logging.warning(f"The retention policy cannot be stored, since the DQ metric or aggregation process " +
+                            f"\"{getattr(dq_metric, '__name__', dq_metric) or aggregation_process}\" does not exist.")
+
+    def synchronize_shards(self) -> None:
+        """Copies the catalog, i.e., the levels of data granularity, DQ dimensions, DQ metrics, aggregation
+        constraints, aggregation functions, and aggregation processes, as well as the retention policies, from the
+        primary database to all shards, such that DQ results stored on the shards can reference them. The catalog is
+        copied automatically whenever it is changed using DaQSS, hence this method only needs to be called after
+        the catalog has been changed using SQL or a shard has been added. It does nothing if DaQSS is not sharded.
+        """
+        if self._router is not None:
+            self._router.synchronize_catalog(self._engine)
@@ -0,0 +1,339 @@
+import asyncio
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Iterable
+
+import pandas
+import sqlalchemy.engine.base
+from sqlalchemy import text
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
+
+from daqss import LevelOfDataGranularity
+from daqss import api
+from daqss import metric_execution
+from daqss.api import DaQSS, DataElement, IncrementalMeasurement
+
+
+class AsyncDaQSS:
+    """Instances of the class AsyncDaQSS provide the same functions as instances of the class
+    [`DaQSS`][src.daqss.api.DaQSS] as coroutines, such that many of them can proceed concurrently on a single
+    event loop. The connection to the database is established using SQLAlchemy's
+    [asynchronous engine][sqlalchemy.ext.asyncio.AsyncEngine] and the driver
+    [asyncpg](https://magicstack.github.io/asyncpg/), which is installed by
+    `pip install "daqss[async] @ git+https://github.com/johannesschrott/daqss.git"`.
+    Like for the class DaQSS, the connection to the database is configured using
+    [environment variables][src.daqss.environment_variables.EnvironmentVariables].
+
+    ??? example
+        ``` python
+        d = AsyncDaQSS()
+        await asyncio.gather(*[d.store_dq_measurement_results_from_series(metric, ROW, table, results, bulk=True)
+                               for table, results in results_per_table.items()])
+        await d.close()
+        ```
+    """
+
+    def __init__(self) -> None:
+        """Initializes a new AsyncDaQSS instance that can connect to a DaQSS database. Each function call uses its
+        own connection from a pool of connections, which is configured like the pool of the class DaQSS.
+        Like for the class DaQSS, the pool is created on the first access of the database."""
+        self._lazy_engine: AsyncEngine | None = None
+
+        self._daqss: DaQSS = DaQSS()
+        """The DaQSS instance whose synchronous implementation is run on the connections of the asynchronous
+        engine."""
+
+    @property
+    def _engine(self) -> AsyncEngine:
+        """The [AsyncEngine][sqlalchemy.ext.asyncio.AsyncEngine] object is used for connecting to the DaQSS
+        database when the methods provided by this class are used. It is created on first access."""
+        if self._lazy_engine is None:
+            self._lazy_engine = create_async_engine(api._connection_string("asyncpg"), **api._pool_options())
+            api._instrument_engine(self._lazy_engine.sync_engine)
+        return self._lazy_engine
+
+    async def _run(self, method: Callable, *args: Any, **kwargs: Any) -> Any:
+        """Runs a method of the class DaQSS on a connection of the asynchronous engine without blocking the event
+        loop while waiting for the database.
+
+        Args:
+            method: The method of the class DaQSS to be run.
+            *args: The positional arguments passed to the method.
+            **kwargs: The keyword arguments passed to the method.
+
+        Returns:
+            The return value of the method."""
+        async with self._engine.connect() as connection:
+            return await connection.run_sync(self._run_bound, method, args, kwargs)
+
+    def _run_bound(self, connection: sqlalchemy.engine.base.Connection, method: Callable,
+                   args: tuple, kwargs: dict) -> Any:
+        token = api._bound_connection.set((self._daqss, connection, False))
+        try:
+            return method(self._daqss, *args, **kwargs)
+        finally:
+            api._bound_connection.reset(token)
+
+    def connect(self) -> AsyncConnection:
+        """Returns the SQLAlchemy [AsyncConnection][sqlalchemy.ext.asyncio.AsyncConnection] to directly
+        query the system using SQL.
+
+        Returns:
+            The connection with DaQSS that can be used to query it using SQL."""
+        return self._engine.connect()
+
+    async def close(self) -> None:
+        """Closes all pooled connections to the database."""
+        if self._lazy_engine is not None:
+            await self._lazy_engine.dispose()
+
+    async def compact_dq_results(self, batch_size: int = 100_000) -> int:
+        """Asynchronous counterpart of [`DaQSS.compact_dq_results`][src.daqss.api.DaQSS.compact_dq_results]."""
+        return await self._run(DaQSS.compact_dq_results, batch_size)
+
+    async def create_dq_result_partitions(self, months_ahead: int = 2, since: datetime | None = None) -> list[str]:
+        """Asynchronous counterpart of
+        [`DaQSS.create_dq_result_partitions`][src.daqss.api.DaQSS.create_dq_result_partitions]."""
+        return await self._run(DaQSS.create_dq_result_partitions, months_ahead, since)
+
+    async def execute_aggregation_process(self, name: str) -> int:
+        """Asynchronous counterpart of
+        [`DaQSS.execute_aggregation_process`][src.daqss.api.DaQSS.execute_aggregation_process]."""
+        return await self._run(DaQSS.execute_aggregation_process, name)
+
+    async def export_dq_results(self,
+                                path: str,
+                                dq_metric: Callable | str | None = None,
+                                aggregation_process: str | None = None,
+                                parent: str | None = None,
+                                level_of_data_granularity: LevelOfDataGranularity | None = None,
+                                since: datetime | None = None,
+                                until: datetime | None = None,
+                                value_range: tuple[float | None, float | None] | None = None,
+                                file_format: str | None = None) -> int:
+        """Asynchronous counterpart of [`DaQSS.export_dq_results`][src.daqss.api.DaQSS.export_dq_results].
+        The output of `COPY` is spooled to a temporary file, which is converted and written while the event loop is
+        blocked."""
+        return await self._run(DaQSS.export_dq_results, path, dq_metric, aggregation_process, parent,
+                               level_of_data_granularity, since, until, value_range, file_format)
+
+    async def import_dq_results(self, path: str, file_format: str | None = None, batch_size: int = 100_000) -> int:
+        """Asynchronous counterpart of [`DaQSS.import_dq_results`][src.daqss.api.DaQSS.import_dq_results].
+        Each record batch is read and serialized while the event loop is blocked."""
+        return await self._run(DaQSS.import_dq_results, path, file_format, batch_size)
+
+    async def measure_dq_metric_incrementally(self, name: str, dataframe: pandas.DataFrame,
+                                              level_of_data_granularity: LevelOfDataGranularity,
+                                              parent_data_element: str,
+                                              chunk_size: int = api._DQ_METRIC_CHUNK_SIZE,
+                                              max_workers: int | None = None) -> IncrementalMeasurement:
+        """Asynchronous counterpart of
+        [`DaQSS.measure_dq_metric_incrementally`][src.daqss.api.DaQSS.measure_dq_metric_incrementally].
+        The fingerprints are computed and the DQ metric is run in a separate thread, such that the event loop is not
+        blocked."""
+        dq_metric, vectorized, axis = await self._run(DaQSS._prepare_dq_metric_run, name, level_of_data_granularity)
+        fingerprints: pandas.Series = await asyncio.to_thread(metric_execution.fingerprint, dataframe, axis)
+        unchanged = fingerprints.index.map(str).isin(
+            await self._run(DaQSS._unchanged_data_elements, name, parent_data_element, fingerprints))
+        changed: pandas.DataFrame = dataframe.iloc[~unchanged] if axis == 1 else dataframe.iloc[:, ~unchanged]
+        if changed.shape[1 - axis] == 0:
+            results: pandas.Series = pandas.Series(dtype=float, name=name)
+            rejected: pandas.DataFrame = pandas.DataFrame(columns=["result_value", "reason"])
+        else:
+            results: pandas.Series = await asyncio.to_thread(metric_execution.run, dq_metric, vectorized, changed,
+                                                             chunk_size, axis, max_workers)
+            results.name = name
+            rejected: pandas.DataFrame = await self._run(DaQSS.store_dq_measurement_results_from_series, dq_metric,
+                                                         level_of_data_granularity, parent_data_element, results,
+                                                         True, fingerprints[~unchanged])
+        return IncrementalMeasurement(results, fingerprints.index[unchanged], rejected)
+
+    async def retrieve_aggregation_constraint_formula_by_name(self, name: str) -> str:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_aggregation_constraint_formula_by_name`][src.daqss.api.DaQSS.retrieve_aggregation_constraint_formula_by_name]."""
+        return await self._run(DaQSS.retrieve_aggregation_constraint_formula_by_name, name)
+
+    async def retrieve_aggregation_function_expression_by_name(self, name: str) -> str:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_aggregation_function_expression_by_name`][src.daqss.api.DaQSS.retrieve_aggregation_function_expression_by_name]."""
+        return await self._run(DaQSS.retrieve_aggregation_function_expression_by_name, name)
+
+    async def retrieve_aggregation_process_by_name_as_aggregation_specification(self, name: str) -> str:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_aggregation_process_by_name_as_aggregation_specification`][src.daqss.api.DaQSS.retrieve_aggregation_process_by_name_as_aggregation_specification]."""
+        return await self._run(DaQSS.retrieve_aggregation_process_by_name_as_aggregation_specification, name)
+
+    async def retrieve_ancestors(self, global_identifier: str) -> pandas.DataFrame:
+        """Asynchronous counterpart of [`DaQSS.retrieve_ancestors`][src.daqss.api.DaQSS.retrieve_ancestors]."""
+        return await self._run(DaQSS.retrieve_ancestors, global_identifier)
+
+    async def retrieve_descendants(self, global_identifier: str,
+                                   level_of_data_granularity: LevelOfDataGranularity | None = None
+                                   ) -> pandas.DataFrame:
+        """Asynchronous counterpart of [`DaQSS.retrieve_descendants`][src.daqss.api.DaQSS.retrieve_descendants]."""
+        return await self._run(DaQSS.retrieve_descendants, global_identifier, level_of_data_granularity)
+
+    async def retrieve_dq_metric_implementation_by_name(self, name) -> Callable:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_dq_metric_implementation_by_name`][src.daqss.api.DaQSS.retrieve_dq_metric_implementation_by_name]."""
+        return await self._run(DaQSS.retrieve_dq_metric_implementation_by_name, name)
+
+    async def retrieve_dq_results(self,
+                                  dq_metric: Callable | str | None = None,
+                                  aggregation_process: str | None = None,
+                                  parent: str | None = None,
+                                  level_of_data_granularity: LevelOfDataGranularity | None = None,
+                                  since: datetime | None = None,
+                                  until: datetime | None = None,
+                                  value_range: tuple[float | None, float | None] | None = None,
+                                  chunk_size: int = 100_000,
+                                  include_rollups: bool = False) -> AsyncIterator[pandas.DataFrame]:
+        """Asynchronous counterpart of [`DaQSS.retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results],
+        which returns an asynchronous iterator over the chunks of DQ results."""
+        query, parameters = api._dq_results_query(dq_metric, aggregation_process, parent, level_of_data_granularity,
+                                                  since, until, value_range, include_rollups=include_rollups)
+        async with self._engine.connect() as connection:
+            query_result = await connection.stream(text(query).execution_options(yield_per=chunk_size), parameters)
+            columns: list[str] = list(query_result.keys())
+            async for partition in query_result.partitions():
+                yield pandas.DataFrame.from_records(partition, columns=columns)
+
+    async def retrieve_dq_results_in_subtree(self,
+                                             global_identifier: str,
+                                             dq_metric: Callable | str | None = None,
+                                             aggregation_process: str | None = None,
+                                             level_of_data_granularity: LevelOfDataGranularity | None = None,
+                                             since: datetime | None = None,
+                                             until: datetime | None = None,
+                                             value_range: tuple[float | None, float | None] | None = None,
+                                             chunk_size: int = 100_000,
+                                             include_rollups: bool = False) -> AsyncIterator[pandas.DataFrame]:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_dq_results_in_subtree`][src.daqss.api.DaQSS.retrieve_dq_results_in_subtree],
+        which returns an asynchronous iterator over the chunks of DQ results."""
+        query, parameters = api._dq_results_query(dq_metric, aggregation_process, None, level_of_data_granularity,
+                                                  since, until, value_range, subtree=global_identifier,
+                                                  include_rollups=include_rollups)
+        async with self._engine.connect() as connection:
+            query_result = await connection.stream(text(query).execution_options(yield_per=chunk_size), parameters)
+            columns: list[str] = list(query_result.keys())
+            async for partition in query_result.partitions():
+                yield pandas.DataFrame.from_records(partition, columns=columns)
+
+    async def retrieve_latest_dq_results(self,
+                                         dq_metric: Callable | str | None = None,
+                                         aggregation_process: str | None = None,
+                                         parent: str | None = None,
+                                         level_of_data_granularity: LevelOfDataGranularity | None = None,
+                                         value_range: tuple[float | None, float | None] | None = None
+                                         ) -> pandas.DataFrame:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_latest_dq_results`][src.daqss.api.DaQSS.retrieve_latest_dq_results]."""
+        return await self._run(DaQSS.retrieve_latest_dq_results, dq_metric, aggregation_process, parent,
+                               level_of_data_granularity, value_range)
+
+    async def retrieve_levels_of_data_granularity(self) -> list[LevelOfDataGranularity]:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_levels_of_data_granularity`][src.daqss.api.DaQSS.retrieve_levels_of_data_granularity]."""
+        return await self._run(DaQSS.retrieve_levels_of_data_granularity)
+
+    async def retrieve_retention_policies(self) -> pandas.DataFrame:
+        """Asynchronous counterpart of
+        [`DaQSS.retrieve_retention_policies`][src.daqss.api.DaQSS.retrieve_retention_policies]."""
+        return await self._run(DaQSS.retrieve_retention_policies)
+
+    async def run_dq_metric(self, name: str, dataframe: pandas.DataFrame,
+                            level_of_data_granularity: LevelOfDataGranularity,
+                            chunk_size: int = api._DQ_METRIC_CHUNK_SIZE,
+                            max_workers: int | None = None) -> pandas.Series:
+        """Asynchronous counterpart of [`DaQSS.run_dq_metric`][src.daqss.api.DaQSS.run_dq_metric].
+        The DQ metric is run in a separate thread, such that the event loop is not blocked."""
+        dq_metric, vectorized, axis = await self._run(DaQSS._prepare_dq_metric_run, name, level_of_data_granularity)
+        results: pandas.Series = await asyncio.to_thread(metric_execution.run, dq_metric, vectorized, dataframe,
+                                                         chunk_size, axis, max_workers)
+        results.name = name
+        return results
+
+    async def store_aggregation_constraint(self, name: str, description: str, constraint: str,
+                                           level_of_data_granularity: LevelOfDataGranularity):
+        """Asynchronous counterpart of
+        [`DaQSS.store_aggregation_constraint`][src.daqss.api.DaQSS.store_aggregation_constraint]."""
+        return await self._run(DaQSS.store_aggregation_constraint, name, description, constraint,
+                               level_of_data_granularity)
+
+    async def store_aggregation_function(self, name: str, description: str, expression: str,
+                                         source_level_of_data_granularity: LevelOfDataGranularity,
+                                         target_level_of_data_granularity: LevelOfDataGranularity):
+        """Asynchronous counterpart of
+        [`DaQSS.store_aggregation_function`][src.daqss.api.DaQSS.store_aggregation_function]."""
+        return await self._run(DaQSS.store_aggregation_function, name, description, expression,
+                               source_level_of_data_granularity, target_level_of_data_granularity)
+
+    async def store_aggregation_process(self, name: str, description: str, query_for_dq_results: str,
+                                        constraints_and_functions: list[tuple[str, str]], dimensions: list[str]):
+        """Asynchronous counterpart of
+        [`DaQSS.store_aggregation_process`][src.daqss.api.DaQSS.store_aggregation_process]."""
+        return await self._run(DaQSS.store_aggregation_process, name, description, query_for_dq_results,
+                               constraints_and_functions, dimensions)
+
+    async def store_dq_dimension(self, name: str, description: str or None = None,
+                                 is_subdimension_of: str or None = None):
+        """Asynchronous counterpart of [`DaQSS.store_dq_dimension`][src.daqss.api.DaQSS.store_dq_dimension]."""
+        return await self._run(DaQSS.store_dq_dimension, name, description, is_subdimension_of)
+
+    async def store_dq_metric(self, dq_metric: Callable, dimensions: list[str],
+                              level_of_data_granularity: LevelOfDataGranularity, vectorized: bool = False):
+        """Asynchronous counterpart of [`DaQSS.store_dq_metric`][src.daqss.api.DaQSS.store_dq_metric]."""
+        return await self._run(DaQSS.store_dq_metric, dq_metric, dimensions, level_of_data_granularity, vectorized)
+
+    async def store_data_element(self,
+                                 global_identifier: str,
+                                 local_identifier: str,
+                                 level_of_data_granularity: LevelOfDataGranularity,
+                                 parent_identifier: str | None = None):
+        """Asynchronous counterpart of [`DaQSS.store_data_element`][src.daqss.api.DaQSS.store_data_element]."""
+        return await self._run(DaQSS.store_data_element, global_identifier, local_identifier,
+                               level_of_data_granularity, parent_identifier)
+
+    async def store_data_elements(self, data_elements: Iterable[DataElement | tuple]) -> pandas.DataFrame:
+        """Asynchronous counterpart of [`DaQSS.store_data_elements`][src.daqss.api.DaQSS.store_data_elements]."""
+        return await self._run(DaQSS.store_data_elements, list(data_elements))
+
+    async def store_dq_aggregation_results_from_series(self,
+                                                       aggregation_process: str,
+                                                       level_of_data_granularity: LevelOfDataGranularity,
+                                                       parent_data_element: str,
+                                                       values: pandas.Series,
+                                                       bulk: bool = False,
+                                                       batched: bool = False) -> pandas.DataFrame:
+        """Asynchronous counterpart of
+        [`DaQSS.store_dq_aggregation_results_from_series`][src.daqss.api.DaQSS.store_dq_aggregation_results_from_series]."""
+        return await self._run(DaQSS.store_dq_aggregation_results_from_series, aggregation_process,
+                               level_of_data_granularity, parent_data_element, values, bulk, batched)
+
+    async def store_dq_measurement_results_from_dataframe(self, dataframe: pandas.DataFrame,
+                                                          level_of_data_granularity: LevelOfDataGranularity,
+                                                          parent_data_element: str,
+                                                          batched: bool = False) -> pandas.DataFrame:
+        """Asynchronous counterpart of
+        [`DaQSS.store_dq_measurement_results_from_dataframe`][src.daqss.api.DaQSS.store_dq_measurement_results_from_dataframe]."""
+        return await self._run(DaQSS.store_dq_measurement_results_from_dataframe, dataframe,
+                               level_of_data_granularity, parent_data_element, batched)
+
+    async def store_dq_measurement_results_from_series(self, dq_metric: Callable,
+                                                       level_of_data_granularity: LevelOfDataGranularity,
+                                                       parent_data_element: str,
+                                                       values: pandas.Series,
+                                                       bulk: bool = False,
+                                                       fingerprints: pandas.Series | None = None,
+                                                       batched: bool = False) -> pandas.DataFrame:
+        """Asynchronous counterpart of
+        [`DaQSS.store_dq_measurement_results_from_series`][src.daqss.api.DaQSS.store_dq_measurement_results_from_series]."""
+        return await self._run(DaQSS.store_dq_measurement_results_from_series, dq_metric,
+                               level_of_data_granularity, parent_data_element, values, bulk, fingerprints,
+                               batched)
+
+    async def store_retention_policy(self, retention_days: int, dq_metric: Callable | str | None = None,
+                                     aggregation_process: str | None = None, granularity: str = "day"):
+        """Asynchronous counterpart of [`DaQSS.store_retention_policy`][src.daqss.api.DaQSS.store_retention_policy]."""
+        return await self._run(DaQSS.store_retention_policy, retention_days, dq_metric, aggregation_process,
+                               granularity)
@@ -0,0 +1,275 @@
+"""Provides an in-memory snapshot of the catalog of DaQSS, i.e., of the levels of data granularity, DQ dimensions,
+DQ metrics, aggregation constraints, aggregation functions, and aggregation processes. The snapshot is loaded using a
+single query and is invalidated whenever PostgreSQL notifies that the catalog has changed. If notifications cannot
+be received, the version of the catalog is polled instead. While a connection is bound to DaQSS, the snapshot is
+loaded and polled through that connection."""
+import json
+import logging
+import select
+import threading
+import time
+from collections import namedtuple
+from typing import Callable
+
+from sqlalchemy import Connection, Engine, Row, text
+
+from daqss.levels_of_data_granularity import LevelOfDataGranularity
+
+CATALOG_CHANNEL: str = "daqss_catalog"
+"""The channel on which PostgreSQL notifies changes of the catalog."""
+
+DQDimension = namedtuple("DQDimension", ["name", "description", "parent"])
+"""A [named tuple][collections.namedtuple] that contains the `name`, the `description`, and the name of the `parent`
+of a DQ dimension, if it is a sub-dimension."""
+
+DQMetric = namedtuple("DQMetric", ["name", "description", "level_of_data_granularity", "implementation_hash",
+                                   "vectorized", "dimensions"])
+"""A [named tuple][collections.namedtuple] that contains the `name`, the `description`, the name of the
+`level_of_data_granularity`, the `implementation_hash`, whether the DQ metric is `vectorized`, and the names of the
+`dimensions` of a DQ metric."""
+
+AggregationConstraint = namedtuple("AggregationConstraint", ["name", "description", "formula",
+                                                             "level_of_data_granularity"])
+"""A [named tuple][collections.namedtuple] that contains the `name`, the `description`, the `formula`, and the name of
+the `level_of_data_granularity` of an aggregation constraint."""
+
+AggregationFunction = namedtuple("AggregationFunction", ["name", "description", "expression",
+                                                         "source_level_of_data_granularity",
+                                                         "target_level_of_data_granularity"])
+"""A [named tuple][collections.namedtuple] that contains the `name`, the `description`, the `expression`, and the
+names of the `source_level_of_data_granularity` and the `target_level_of_data_granularity` of an aggregation
+function."""
+
+AggregationProcess = namedtuple("AggregationProcess", ["name", "description", "query", "constraints_and_functions",
+                                                       "dimensions"])
+"""A [named tuple][collections.namedtuple] that contains the `name`, the `description`, the `query`, the pairs of
+names of aggregation constraints and aggregation functions in `constraints_and_functions`, and the names of the
+`dimensions` of an aggregation process."""
+
+_CATALOG_QUERY: str = """SELECT catalog_version.version, CAST(json_build_object(
+    'levels', (SELECT coalesce(json_agg(json_build_array(level_name, ordering) ORDER BY ordering), '[]')
+               FROM levels_of_data_granularity),
+    'dimensions', (SELECT coalesce(json_agg(json_build_array(dimension_name, dimension_description,
+                                                             is_sub_dimension_of)), '[]')
+                   FROM dq_dimension),
+    'metrics', (SELECT coalesce(json_agg(json_build_array(
+                    metric_name, metric_description, designed_for_level_of_data_granularity, implementation_hash,
+                    is_vectorized,
+                    (SELECT coalesce(json_agg(dimension_name ORDER BY dimension_name), '[]')
+                     FROM metric_computes_value_for_dimension
+                     WHERE metric_computes_value_for_dimension.metric_name = dq_metric.metric_name))), '[]')
+                FROM dq_metric),
+    'constraints', (SELECT coalesce(json_agg(json_build_array(
+                        aggregation_constraint_name, aggregation_constraint_description,
+                        aggregation_constraint_formula, covers_level_of_data_granularity)), '[]')
+                    FROM aggregation_constraint),
+    'functions', (SELECT coalesce(json_agg(json_build_array(
+                      aggregation_function_name, aggregation_function_description, aggregation_function_expression,
+                      source_level_of_data_granularity, target_level_of_data_granularity)), '[]')
+                  FROM aggregation_function),
+    'processes', (SELECT coalesce(json_agg(json_build_array(
+                      aggregation_process_name, aggregation_process_description, aggregation_query_for_values,
+                      (SELECT coalesce(json_agg(json_build_array(aggregation_constraint_name,
+                                                                 aggregation_function_name)
+                                                ORDER BY aggregation_constraint_name), '[]')
+                       FROM aggregation_process_is_based_on
+                       WHERE aggregation_process_is_based_on.aggregation_process_name =
+                             aggregation_process.aggregation_process_name),
+                      (SELECT coalesce(json_agg(dimension_name ORDER BY dimension_name), '[]')
+                       FROM aggregation_process_computes_value_for_dimension
+                       WHERE aggregation_process_computes_value_for_dimension.aggregation_process_name =
+                             aggregation_process.aggregation_process_name))), '[]')
+                  FROM aggregation_process)) AS TEXT)
+FROM catalog_version"""
+"""Retrieves the version and the whole content of the catalog in a single round trip. The content is cast to text,
+such that it is decoded the same way regardless of the database driver."""
+
+
+class _Snapshot:
+    """The content of the catalog at a certain version."""
+
+    def __init__(self, version: int, content: dict) -> None:
+        self.version: int = version
+        self.levels: list[LevelOfDataGranularity] = [LevelOfDataGranularity(*level) for level in content["levels"]]
+        self.dimensions: dict[str, DQDimension] = {dimension[0]: DQDimension(*dimension)
+                                                   for dimension in content["dimensions"]}
+        self.metrics: dict[str, DQMetric] = {metric[0]: DQMetric(*metric[:5], tuple(metric[5]))
+                                             for metric in content["metrics"]}
+        self.constraints: dict[str, AggregationConstraint] = {constraint[0]: AggregationConstraint(*constraint)
+                                                              for constraint in content["constraints"]}
+        self.functions: dict[str, AggregationFunction] = {function[0]: AggregationFunction(*function)
+                                                          for function in content["functions"]}
+        self.processes: dict[str, AggregationProcess] = {
+            process[0]: AggregationProcess(*process[:3], [tuple(pair) for pair in process[3]], tuple(process[4]))
+            for process in content["processes"]}
+
+
+class Catalog:
+    """An in-memory snapshot of the catalog of DaQSS, which serves lookups without querying the database.
+
+    The snapshot is loaded on first use. Afterward, a background thread listens for the notifications that
+    PostgreSQL sends on the channel [`CATALOG_CHANNEL`][src.daqss.catalog.CATALOG_CHANNEL] whenever one of the
+    catalog tables changes, and the snapshot is loaded again on the next lookup after a notification. If the
+    notifications cannot be received, e.g., since a connection pooler in front of PostgreSQL does not support
+    `LISTEN`, the version of the catalog is polled instead. Changes that have not been committed yet are not part of
+    the snapshot, unless it is loaded through the connection that made them.
+
+    ??? example
+        ``` python
+        d = DaQSS()
+        print(d.catalog.sub_dimensions("Completeness"))
+        ```
+    """
+
+    def __init__(self, engine: Engine, poll_interval: float = 5.0,
+                 bound_connection: Callable[[], Connection | None] = lambda: None) -> None:
+        """Initializes a new catalog snapshot, which is loaded on first use.
+
+        Args:
+            engine: The engine used for loading the snapshot and for listening for notifications.
+            poll_interval: The number of seconds after which the version of the catalog is polled, if notifications
+                cannot be received. Defaults to 5.
+            bound_connection: A function that returns the connection through which the snapshot is loaded and
+                polled instead of a connection of the engine, e.g., the connection of an asynchronous engine that is
+                bound to the current call, or `None` if the engine is used. Notifications are only listened for
+                once the snapshot has been loaded using the engine. Defaults to a function that always returns
+                `None`."""
+        self._engine: Engine = engine
+        self._poll_interval: float = poll_interval
+        self._bound_connection: Callable[[], Connection | None] = bound_connection
+        self._snapshot: _Snapshot | None = None
+        self._stale: bool = True
+        self._last_poll: float = 0.0
+        self._lock: threading.Lock = threading.Lock()
+        self._listening: bool = False
+        self._listener: threading.Thread | None = None
+        self._closed: threading.Event = threading.Event()
+
+    @property
+    def levels(self) -> list[LevelOfDataGranularity]:
+        """The levels of data granularity, ordered by their ordering."""
+        return list(self._current().levels)
+
+    @property
+    def dimensions(self) -> dict[str, DQDimension]:
+        """The DQ dimensions, keyed by their names."""
+        return self._current().dimensions
+
+    @property
+    def metrics(self) -> dict[str, DQMetric]:
+        """The DQ metrics, keyed by their names."""
+        return self._current().metrics
+
+    @property
+    def constraints(self) -> dict[str, AggregationConstraint]:
+        """The aggregation constraints, keyed by their names."""
+        return self._current().constraints
+
+    @property
+    def functions(self) -> dict[str, AggregationFunction]:
+        """The aggregation functions, keyed by their names."""
+        return self._current().functions
+
+    @property
+    def processes(self) -> dict[str, AggregationProcess]:
+        """The aggregation processes, keyed by their names."""
+        return self._current().processes
+
+    def sub_dimensions(self, name: str) -> list[str]:
+        """Returns the names of all direct and indirect sub-dimensions of a DQ dimension.
+
+        Args:
+            name: The name of the DQ dimension.
+
+        Returns:
+            The names of the sub-dimensions, whereby each sub-dimension precedes its own sub-dimensions."""
+        dimensions: dict[str, DQDimension] = self._current().dimensions
+        result: list[str] = []
+        parents: list[str] = [name]
+        while len(parents) > 0:
+            children: list[str] = sorted(dimension.name for dimension in dimensions.values()
+                                         if dimension.parent in parents and dimension.name not in result)
+            result.extend(children)
+            parents = children
+        return result
+
+    def invalidate(self) -> None:
+        """Causes the snapshot to be loaded again on the next lookup."""
+        self._stale = True
+
+    def close(self) -> None:
+        """Stops listening for notifications. The snapshot is kept up to date by polling afterward."""
+        self._closed.set()
+
+    def _current(self) -> _Snapshot:
+        connection: Connection | None = self._bound_connection()
+        if connection is not None:
+            # The lock is not held, since a query on an asynchronous connection suspends the calling coroutine, while
+            # other coroutines of the same thread may wait for the lock
+            return self._refresh(connection)
+        with self._lock:
+            return self._refresh(None)
+
+    def _refresh(self, connection: Connection | None) -> _Snapshot:
+        """Loads the snapshot again if it is stale, or if its version is outdated and the interval for polling has
+        passed.
+
+        Args:
+            connection: The connection used for querying the catalog, or `None` if a connection of the engine is
+                used.
+
+        Returns:
+            The current snapshot."""
+        if self._snapshot is None or self._stale:
+            self._load(connection)
+        elif not self._listening and time.monotonic() - self._last_poll >= self._poll_interval:
+            self._last_poll = time.monotonic()
+            if self._query(connection, "SELECT version FROM catalog_version")[0] != self._snapshot.version:
+                self._load(connection)
+        return self._snapshot
+
+    def _query(self, connection: Connection | None, query: str) -> Row:
+        if connection is not None:
+            return connection.execute(text(query)).one()
+        with self._engine.connect() as connection:
+            return connection.execute(text(query)).one()
+
+    def _load(self, connection: Connection | None) -> None:
+        self._stale = False
+        version, content = self._query(connection, _CATALOG_QUERY)
+        self._snapshot = _Snapshot(version, json.loads(content))
+        self._last_poll = time.monotonic()
+
+        if connection is None and self._listener is None and self._engine.dialect.driver == "psycopg2" \
+                and not self._closed.is_set():
+            self._listener = threading.Thread(target=self._listen, name="daqss-catalog-listener", daemon=True)
+            self._listener.start()
+
+    def _listen(self) -> None:
+        """Listens for notifications on a dedicated connection, which is not taken from the connection pool, until
+        the catalog is closed or the connection fails."""
+        connection = None
+        try:
+            arguments, keyword_arguments = self._engine.dialect.create_connect_args(self._engine.url)
+            connection = self._engine.dialect.connect(*arguments, **keyword_arguments)
+            connection.autocommit = True
+            with connection.cursor() as cursor:
+                cursor.execute(f"LISTEN {CATALOG_CHANNEL}")
+            self._listening = True
+            # Changes committed before listening started are not notified anymore
+            self._stale = True
+
+            while not self._closed.is_set():
+                if select.select([connection], [], [], 1.0) == ([], [], []):
+                    continue
+                connection.poll()
+                if len(connection.notifies) > 0:
+                    connection.notifies.clear()
+                    self._stale = True
+        except Exception as error:
+            logging.warning("Changes of the catalog of DaQSS cannot be listened for, hence the version of the " +
+                            f"catalog is polled instead:\n{error}")
+        finally:
+            self._listening = False
+            if connection is not None:
+                connection.close()
@@ -0,0 +1,187 @@
+"""Provides the columnar export and import of DQ results as [Apache Parquet](https://parquet.apache.org/) or
+[Apache Arrow IPC](https://arrow.apache.org/docs/format/Columnar.html#ipc-file-format) files. The output of
+PostgreSQL `COPY` is parsed by the multithreaded CSV reader of [PyArrow](https://arrow.apache.org/docs/python/)
+into record batches, and record batches are serialized by it for `COPY`, such that no Python object is created per
+DQ result.
+
+This module requires the optional dependency `pyarrow`, which is installed by running
+`pip install "daqss[arrow] @ git+https://github.com/johannesschrott/daqss.git"`."""
+import os
+from datetime import datetime
+from typing import BinaryIO, Iterator
+
+import pyarrow
+import pyarrow.compute
+import pyarrow.csv
+import pyarrow.ipc
+import pyarrow.parquet
+
+PARQUET: str = "parquet"
+"""The format of Apache Parquet files."""
+
+ARROW: str = "arrow"
+"""The format of Apache Arrow IPC files, which are also known as Feather files."""
+
+_SUFFIXES: dict[str, str] = {".parquet": PARQUET, ".pq": PARQUET, ".arrow": ARROW, ".feather": ARROW, ".ipc": ARROW}
+
+DQ_RESULT_SCHEMA: pyarrow.Schema = pyarrow.schema([
+    ("global_identifier", pyarrow.string()),
+    ("local_identifier", pyarrow.string()),
+    ("level_of_data_granularity", pyarrow.string()),
+    ("parent_identifier", pyarrow.string()),
+    ("creation_timestamp", pyarrow.timestamp("us")),
+    ("result_value", pyarrow.float64()),
+    ("dq_metric", pyarrow.string()),
+    ("aggregation_process", pyarrow.string())])
+"""The schema of exported DQ results, whose columns match the columns returned by
+[`retrieve_dq_results`][src.daqss.api.DaQSS.retrieve_dq_results]."""
+
+_BLOCK_SIZE: int = 16 * 1024 * 1024
+"""The number of bytes of CSV that are parsed into a single record batch."""
+
+
+def file_format(path: str, requested_format: str | None = None) -> str:
+    """Determines the format of a file of DQ results.
+
+    Args:
+        path: The path of the file.
+        requested_format: Either `PARQUET` or `ARROW`. Defaults to `None`, which means that the format is derived
+            from the suffix of the path.
+
+    Returns:
+        The format of the file.
+
+    Raises:
+        ValueError: If the format is not supported or cannot be derived from the suffix of the path."""
+    if requested_format is None:
+        requested_format = _SUFFIXES.get(os.path.splitext(path)[1].lower())
+        if requested_format is None:
+            raise ValueError(f"The format of the file \"{path}\" cannot be derived from its suffix, which must be " +
+                             f"one of {', '.join(_SUFFIXES)}.")
+    if requested_format not in (PARQUET, ARROW):
+        raise ValueError(f"The format \"{requested_format}\" is not supported, it must be \"{PARQUET}\" or " +
+                         f"\"{ARROW}\".")
+    return requested_format
+
+
+def read_copy_output(source: BinaryIO) -> Iterator[pyarrow.RecordBatch]:
+    """Parses the output of `COPY ... TO STDOUT WITH (FORMAT csv)` of a query returning DQ results into record
+    batches. Unquoted empty values are parsed as missing values, quoted empty values as empty strings.
+
+    Args:
+        source: A binary file-like object that provides the output of `COPY`.
+
+    Returns:
+        An iterator over record batches of the schema `DQ_RESULT_SCHEMA`."""
+    reader: pyarrow.csv.CSVStreamingReader = pyarrow.csv.open_csv(
+        source,
+        read_options=pyarrow.csv.ReadOptions(column_names=DQ_RESULT_SCHEMA.names, block_size=_BLOCK_SIZE),
+        convert_options=pyarrow.csv.ConvertOptions(column_types=DQ_RESULT_SCHEMA, strings_can_be_null=True,
+                                                   quoted_strings_can_be_null=False))
+    for batch in reader:
+        yield batch
+
+
+class Writer:
+    """Writes record batches of DQ results to a Parquet or an Arrow IPC file."""
+
+    def __init__(self, path: str, requested_format: str) -> None:
+        """Creates the file, replacing any existing file.
+
+        Args:
+            path: The path of the file.
+            requested_format: Either `PARQUET` or `ARROW`."""
+        if requested_format == PARQUET:
+            self._writer = pyarrow.parquet.ParquetWriter(path, DQ_RESULT_SCHEMA)
+        else:
+            self._writer = pyarrow.ipc.new_file(path, DQ_RESULT_SCHEMA)
+
+    def write(self, batch: pyarrow.RecordBatch) -> None:
+        if self._writer is None:
+            raise ValueError("The file has already been closed.")
+        self._writer.write_batch(batch)
+
+    def close(self) -> None:
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+def read_batches(path: str, requested_format: str, batch_size: int) -> Iterator[pyarrow.RecordBatch]:
+    """Reads a Parquet or an Arrow IPC file of DQ results in record batches, such that the memory required stays
+    bounded for large files.
+
+    Args:
+        path: The path of the file.
+        requested_format: Either `PARQUET` or `ARROW`.
+        batch_size: The maximum number of DQ results contained in a record batch read from a Parquet file. Arrow IPC
+            files are read in the record batches they were written in.
+
+    Returns:
+        An iterator over record batches, which contain the columns of `DQ_RESULT_SCHEMA` cast to its types.
+
+    Raises:
+        ValueError: If a column of the schema is missing in the file."""
+    if requested_format == PARQUET:
+        parquet_file: pyarrow.parquet.ParquetFile = pyarrow.parquet.ParquetFile(path)
+        missing: set[str] = set(DQ_RESULT_SCHEMA.names) - set(parquet_file.schema_arrow.names)
+        if len(missing) > 0:
+            raise ValueError(f"The file \"{path}\" does not contain the columns {', '.join(sorted(missing))}.")
+        for batch in parquet_file.iter_batches(batch_size=batch_size, columns=DQ_RESULT_SCHEMA.names):
+            yield _conform(batch)
+        return
+
+    with pyarrow.memory_map(path) as source:
+        reader: pyarrow.ipc.RecordBatchFileReader = pyarrow.ipc.open_file(source)
+        missing: set[str] = set(DQ_RESULT_SCHEMA.names) - set(reader.schema.names)
+        if len(missing) > 0:
+            raise ValueError(f"The file \"{path}\" does not contain the columns {', '.join(sorted(missing))}.")
+        for index in range(reader.num_record_batches):
+            yield _conform(reader.get_batch(index))
+
+
+def _conform(batch: pyarrow.RecordBatch) -> pyarrow.RecordBatch:
+    return pyarrow.RecordBatch.from_arrays([batch.column(name).cast(field.type) for name, field in
+                                            zip(DQ_RESULT_SCHEMA.names, DQ_RESULT_SCHEMA)],
+                                           schema=DQ_RESULT_SCHEMA)
+
+
+def months(batch: pyarrow.RecordBatch) -> list[datetime]:
+    """Determines the months in which the DQ results of a record batch were created.
+
+    Args:
+        batch: A record batch of the schema `DQ_RESULT_SCHEMA`.
+
+    Returns:
+        The first points in time of the distinct months."""
+    first_days: pyarrow.Array = pyarrow.compute.unique(
+        pyarrow.compute.floor_temporal(batch.column("creation_timestamp"), unit="month"))
+    return [first_day.as_py() for first_day in first_days if first_day.is_valid]
+
+
+def to_copy_input(batch: pyarrow.RecordBatch) -> bytes:
+    """Serializes a record batch of DQ results for `COPY ... FROM STDIN WITH (FORMAT csv)`. All values are quoted,
+    such that missing values, which are written unquoted, are distinguished from empty strings.
+
+    Args:
+        batch: A record batch of the schema `DQ_RESULT_SCHEMA`.
+
+    Returns:
+        The CSV serialization of the record batch without header."""
+    sink: pyarrow.BufferOutputStream = pyarrow.BufferOutputStream()
+    pyarrow.csv.write_csv(batch, sink, write_options=pyarrow.csv.WriteOptions(include_header=False,
+                                                                              quoting_style="all_valid"))
+    return sink.getvalue().to_pybytes()
+
+
+def split(batch: pyarrow.RecordBatch, keys: list[int]) -> dict[int, pyarrow.RecordBatch]:
+    """Splits a record batch of DQ results by a key per DQ result, e.g., by the shard on which it is stored.
+
+    Args:
+        batch: A record batch of the schema `DQ_RESULT_SCHEMA`.
+        keys: The keys of the DQ results in the order of the record batch.
+
+    Returns:
+        The record batches containing the DQ results of each key in their original order, keyed by the keys."""
+    key_array: pyarrow.Array = pyarrow.array(keys, type=pyarrow.int64())
+    return {key: batch.filter(pyarrow.compute.equal(key_array, key)) for key in sorted(set(keys))}
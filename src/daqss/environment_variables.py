@@ -6,6 +6,10 @@ class EnvironmentVariables(Enum):
     For a description of how the environment variables are used and for examples please see the
     [dedicated documentation](environment_variables.md) page."""
 
+    DAQSS_CATALOG_POLL_INTERVAL = "DAQSS_CATALOG_POLL_INTERVAL"
+    """The number of seconds after which the version of the catalog of DaQSS is polled, if changes of the catalog
+    cannot be listened for."""
+
     DAQSS_DATABASE = "DAQSS_DATABASE"
     """The name of the database that holds the data of DaQSS."""
 
@@ -18,8 +22,40 @@ class EnvironmentVariables(Enum):
 
     """
 
+    DAQSS_METRIC_CACHE_DIRECTORY = "DAQSS_METRIC_CACHE_DIRECTORY"
+    """The directory in which the serialized Python implementations of DQ metrics are persisted, such that
+    they do not need to be downloaded again by subsequent processes. If not set, nothing is persisted."""
+
+    DAQSS_METRIC_CACHE_SIZE = "DAQSS_METRIC_CACHE_SIZE"
+    """The maximum number of deserialized Python implementations of DQ metrics that are held in memory by a
+    DaQSS instance."""
+
     DAQSS_PASSWORD = "DAQSS_PASSWORD"
     """The password used for connecting to the database that holds the data of DaQSS."""
 
+    DAQSS_POOL_MAX_OVERFLOW = "DAQSS_POOL_MAX_OVERFLOW"
+    """The number of connections that may be opened in addition to the connections held by the connection pool
+    when all of them are in use."""
+
+    DAQSS_POOL_PRE_PING = "DAQSS_POOL_PRE_PING"
+    """If set to `true`, connections are tested for liveness whenever they are taken from the connection pool."""
+
+    DAQSS_POOL_RECYCLE = "DAQSS_POOL_RECYCLE"
+    """The number of seconds after which a pooled connection is replaced by a new one. The value `-1` means that
+    connections are never replaced."""
+
+    DAQSS_POOL_SIZE = "DAQSS_POOL_SIZE"
+    """The number of connections to the database that are kept open in the connection pool."""
+
+    DAQSS_SHARD_HOSTS = "DAQSS_SHARD_HOSTS"
+    """A comma-separated list of the database hosts on which data elements and DQ results are stored, whereas the
+    catalog remains on the host given by `DAQSS_HOST`. Each value must include the address and port of a database
+    server. If not set, DaQSS is not sharded.
+
+     ??? example
+         An example value for this environment variable would be `localhost:5433,localhost:5434`.
+
+    """
+
     DAQSS_USERNAME = "DAQSS_USERNAME"
     """The username used for connecting to the database that holds the data of DaQSS."""
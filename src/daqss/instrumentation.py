@@ -0,0 +1,308 @@
+"""Provides the instrumentation of DaQSS. Each call of a public method of [`DaQSS`][src.daqss.api.DaQSS] is recorded
+as an [`OperationEvent`][src.daqss.instrumentation.OperationEvent], which contains its duration and counters such as
+the number of rows stored or rejected, the number of round trips to the database, the number of bytes of serialized DQ
+metrics, and the time spent waiting for a connection of the pool. The events are passed to the hooks registered using
+[`add_hook`][src.daqss.instrumentation.add_hook]. If no hook is registered, nothing is recorded.
+
+The [`PrometheusExporter`][src.daqss.instrumentation.PrometheusExporter] is a hook that aggregates the events into
+metrics in the Prometheus text format, which it serves via HTTP without requiring any external service.
+
+??? example
+    ``` python
+    exporter = PrometheusExporter()
+    add_hook(exporter)
+    exporter.serve(9464)  # The metrics are available at http://localhost:9464/metrics
+    ```
+"""
+import functools
+import inspect
+import logging
+import threading
+import time
+from collections import namedtuple
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Callable
+
+if TYPE_CHECKING:
+    from http.server import ThreadingHTTPServer
+
+OperationEvent = namedtuple("OperationEvent", ["operation", "duration_seconds", "counters", "error"])
+"""A [named tuple][collections.namedtuple] that describes a single call of a public method of DaQSS.
+It contains the name of the `operation`, i.e., of the method, its `duration_seconds`, a dictionary of `counters`, and
+the name of the type of the exception that ended the operation as `error`, or `None` if it succeeded.
+
+The counters that are recorded, if applicable, are:
+
+- `rows_attempted`, `rows_stored`, and `rows_rejected`: The numbers of data elements or DQ results that were supplied
+    to be stored, that were stored, and that were rejected.
+- `rows_retrieved`: The number of rows retrieved.
+- `rows_compacted`: The number of DQ results compacted according to retention policies.
+- `integrity_errors`: The number of integrity constraints violated while storing.
+- `round_trips`: The number of statements sent to the database, including the chunks of `COPY` statements.
+- `bytes_copied`: The number of bytes sent to the database using `COPY`.
+- `dill_bytes_serialized` and `dill_bytes_deserialized`: The numbers of bytes of the Dill serializations of DQ metrics
+    that were created or loaded.
+- `connection_wait_seconds`: The time spent waiting for a connection from the connection pool.
+
+Counters of operations that are called by other operations are also added to the calling operations."""
+
+_hooks: list[Callable[[OperationEvent], None]] = []
+"""The hooks to which the events of all operations are passed."""
+
+_hooks_lock: threading.Lock = threading.Lock()
+
+_operations: ContextVar[tuple["_Operation", ...]] = ContextVar("_operations", default=())
+"""The operations that are currently running within the current context, from the outermost to the innermost."""
+
+
+class _Operation:
+    """The counters of a running operation."""
+
+    def __init__(self, name: str) -> None:
+        self.name: str = name
+        self.counters: dict[str, float] = {}
+        self.duration: float = 0.0
+        self.error: str | None = None
+
+
+def add_hook(hook: Callable[[OperationEvent], None]) -> None:
+    """Registers a hook, to which an [`OperationEvent`][src.daqss.instrumentation.OperationEvent] is passed after each
+    call of a public method of DaQSS. Hooks are called in the thread that called the method, hence they should return
+    quickly. Exceptions raised by hooks are logged and do not affect DaQSS.
+
+    Args:
+        hook: A callable that receives the events."""
+    with _hooks_lock:
+        _hooks.append(hook)
+
+
+def remove_hook(hook: Callable[[OperationEvent], None]) -> None:
+    """Unregisters a hook registered using [`add_hook`][src.daqss.instrumentation.add_hook].
+
+    Args:
+        hook: The hook to be unregistered."""
+    with _hooks_lock:
+        if hook in _hooks:
+            _hooks.remove(hook)
+
+
+def count(counter: str, value: float = 1) -> None:
+    """Adds a value to a counter of all operations that are currently running within the current context.
+    If no operation is being recorded, nothing happens.
+
+    Args:
+        counter: The name of the counter.
+        value: The value to be added. Defaults to 1."""
+    for operation in _operations.get():
+        operation.counters[counter] = operation.counters.get(counter, 0) + value
+
+
+def _emit(operation: _Operation) -> None:
+    event: OperationEvent = OperationEvent(operation.name, operation.duration, dict(operation.counters),
+                                           operation.error)
+    for hook in list(_hooks):
+        try:
+            hook(event)
+        except Exception as error:
+            logging.warning(f"The instrumentation hook {hook!r} failed for the operation \"{operation.name}\":\n" +
+                            f"{error}")
+
+
+def instrumented(function: Callable) -> Callable:
+    """Wraps a method, such that each call of it is recorded as an operation named after the method. For generator
+    functions, the time spent in the generator until it is exhausted or closed is recorded, but not the time spent by
+    the consumer between the items.
+
+    Args:
+        function: The method to be instrumented.
+
+    Returns:
+        The instrumented method."""
+    if inspect.isgeneratorfunction(function):
+        @functools.wraps(function)
+        def generator_wrapper(*args, **kwargs):
+            if len(_hooks) == 0:
+                yield from function(*args, **kwargs)
+                return
+
+            operation: _Operation = _Operation(function.__name__)
+            generator = function(*args, **kwargs)
+            try:
+                while True:
+                    token = _operations.set(_operations.get() + (operation,))
+                    start: float = time.perf_counter()
+                    try:
+                        item = next(generator)
+                    except StopIteration:
+                        return
+                    finally:
+                        operation.duration += time.perf_counter() - start
+                        _operations.reset(token)
+                    yield item
+            except GeneratorExit:
+                raise
+            except BaseException as error:
+                operation.error = type(error).__name__
+                raise
+            finally:
+                generator.close()
+                _emit(operation)
+
+        return generator_wrapper
+
+    @functools.wraps(function)
+    def wrapper(*args, **kwargs):
+        if len(_hooks) == 0:
+            return function(*args, **kwargs)
+
+        operation: _Operation = _Operation(function.__name__)
+        token = _operations.set(_operations.get() + (operation,))
+        start: float = time.perf_counter()
+        try:
+            return function(*args, **kwargs)
+        except BaseException as error:
+            operation.error = type(error).__name__
+            raise
+        finally:
+            operation.duration = time.perf_counter() - start
+            _operations.reset(token)
+            _emit(operation)
+
+    return wrapper
+
+
+def instrument_public_methods(*excluded: str) -> Callable[[type], type]:
+    """Creates a class decorator that [instruments][src.daqss.instrumentation.instrumented] all public methods of a
+    class.
+
+    Args:
+        *excluded: The names of public methods that are not instrumented.
+
+    Returns:
+        The class decorator."""
+
+    def decorator(cls: type) -> type:
+        for name, member in list(vars(cls).items()):
+            if not name.startswith("_") and name not in excluded and inspect.isfunction(member):
+                setattr(cls, name, instrumented(member))
+        return cls
+
+    return decorator
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\"", "\\\"").replace("\n", "\\n")
+
+
+class PrometheusExporter:
+    """A hook that aggregates the events of operations into metrics in the
+    [Prometheus text format](https://prometheus.io/docs/instrumenting/exposition_formats/). The following metrics
+    are exported, each labeled by the name of the operation:
+
+    - `daqss_operation_duration_seconds`: A histogram of the durations of operations.
+    - `daqss_operation_errors_total`: The number of operations that raised an exception, additionally labeled by the
+        type of the exception.
+    - `daqss_operation_<counter>_total`: The sum of each counter of an
+        [`OperationEvent`][src.daqss.instrumentation.OperationEvent], e.g., `daqss_operation_rows_rejected_total`.
+    """
+
+    DEFAULT_BUCKETS: tuple[float, ...] = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0,
+                                          60.0)
+    """The default upper bounds of the buckets of the histogram of durations in seconds."""
+
+    def __init__(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> None:
+        """Initializes a new exporter without any recorded operations.
+
+        Args:
+            buckets: The upper bounds of the buckets of the histogram of durations in seconds, in ascending order.
+                Defaults to [`DEFAULT_BUCKETS`][src.daqss.instrumentation.PrometheusExporter.DEFAULT_BUCKETS]."""
+        self._buckets: tuple[float, ...] = tuple(buckets)
+        self._bucket_counts: dict[str, list[int]] = {}
+        self._duration_sums: dict[str, float] = {}
+        self._operation_counts: dict[str, int] = {}
+        self._errors: dict[tuple[str, str], int] = {}
+        self._counters: dict[tuple[str, str], float] = {}
+        self._lock: threading.Lock = threading.Lock()
+
+    def __call__(self, event: OperationEvent) -> None:
+        """Records the event of an operation.
+
+        Args:
+            event: The event to be recorded."""
+        with self._lock:
+            bucket_counts: list[int] = self._bucket_counts.setdefault(event.operation, [0] * len(self._buckets))
+            for index, bound in enumerate(self._buckets):
+                if event.duration_seconds <= bound:
+                    bucket_counts[index] += 1
+            self._duration_sums[event.operation] = self._duration_sums.get(event.operation, 0.0) + \
+                event.duration_seconds
+            self._operation_counts[event.operation] = self._operation_counts.get(event.operation, 0) + 1
+            if event.error is not None:
+                self._errors[(event.operation, event.error)] = self._errors.get((event.operation, event.error), 0) + 1
+            for counter, value in event.counters.items():
+                self._counters[(counter, event.operation)] = self._counters.get((counter, event.operation), 0) + value
+
+    def render(self) -> str:
+        """Renders the metrics recorded so far.
+
+        Returns:
+            The metrics in the Prometheus text format."""
+        lines: list[str] = ["# HELP daqss_operation_duration_seconds The duration of operations of DaQSS.",
+                            "# TYPE daqss_operation_duration_seconds histogram"]
+        with self._lock:
+            for operation in sorted(self._operation_counts):
+                label: str = f"operation=\"{_escape(operation)}\""
+                for bound, bucket_count in zip(self._buckets, self._bucket_counts[operation]):
+                    lines.append(f"daqss_operation_duration_seconds_bucket{{{label},le=\"{bound}\"}} {bucket_count}")
+                lines.append(f"daqss_operation_duration_seconds_bucket{{{label},le=\"+Inf\"}} " +
+                             f"{self._operation_counts[operation]}")
+                lines.append(f"daqss_operation_duration_seconds_sum{{{label}}} {self._duration_sums[operation]}")
+                lines.append(f"daqss_operation_duration_seconds_count{{{label}}} {self._operation_counts[operation]}")
+
+            lines.append("# HELP daqss_operation_errors_total The number of operations of DaQSS that raised an " +
+                         "exception.")
+            lines.append("# TYPE daqss_operation_errors_total counter")
+            for (operation, error), error_count in sorted(self._errors.items()):
+                lines.append(f"daqss_operation_errors_total{{operation=\"{_escape(operation)}\"," +
+                             f"error=\"{_escape(error)}\"}} {error_count}")
+
+            for counter in sorted({counter for counter, _ in self._counters}):
+                metric: str = f"daqss_operation_{counter}_total"
+                lines.append(f"# HELP {metric} The sum of the counter \"{counter}\" of operations of DaQSS.")
+                lines.append(f"# TYPE {metric} counter")
+                for (name, operation), value in sorted(self._counters.items()):
+                    if name == counter:
+                        lines.append(f"{metric}{{operation=\"{_escape(operation)}\"}} {value}")
+        return "\n".join(lines) + "\n"
+
+    def serve(self, port: int = 9464, address: str = "") -> "ThreadingHTTPServer":
+        """Serves the metrics via HTTP at the path `/metrics` in a background thread.
+
+        Args:
+            port: The port on which the metrics are served. Defaults to 9464.
+            address: The address on which the metrics are served. Defaults to all addresses.
+
+        Returns:
+            The HTTP server, which can be stopped by calling its method `shutdown`."""
+        from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+        exporter: PrometheusExporter = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_GET(self) -> None:
+                if self.path.split("?")[0] != "/metrics":
+                    self.send_error(404)
+                    return
+                body: bytes = exporter.render().encode()
+                self.send_response(200)
+                self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, format: str, *args) -> None:
+                pass
+
+        server: ThreadingHTTPServer = ThreadingHTTPServer((address, port), _Handler)
+        threading.Thread(target=server.serve_forever, name="daqss-prometheus-exporter", daemon=True).start()
+        return server
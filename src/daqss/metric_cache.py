@@ -0,0 +1,111 @@
+"""Provides a cache for deserialized Python implementations of DQ metrics, such that the Dill serialization of a
+DQ metric only needs to be downloaded and deserialized again when the implementation has changed."""
+import hashlib
+import os
+import tempfile
+import threading
+from collections import OrderedDict
+from typing import Callable
+
+
+def hash_implementation(serialized_dq_metric: bytes) -> str:
+    """Computes the content hash of the Dill serialization of a DQ metric, as it is stored in the column
+    `dq_metric.implementation_hash`.
+
+    Args:
+        serialized_dq_metric: The Dill serialization of a DQ metric.
+
+    Returns:
+        The hexadecimal SHA-256 digest of the serialization."""
+    return hashlib.sha256(serialized_dq_metric).hexdigest()
+
+
+class DQMetricCache:
+    """A size-bounded cache of deserialized DQ metrics, which evicts the least recently used DQ metric when it is
+    full. The cache is keyed by the name of a DQ metric and the content hash of its serialization.
+    Optionally, the serializations are persisted in a directory, where they are named after their content hash,
+    such that they survive the end of a process."""
+
+    def __init__(self, maximum_size: int = 128, directory: str | None = None) -> None:
+        """Initializes a new, empty cache of deserialized DQ metrics.
+
+        Args:
+            maximum_size: The maximum number of deserialized DQ metrics held in memory. Defaults to 128.
+            directory: The directory in which serializations of DQ metrics are persisted.
+                Defaults to `None`, which means that nothing is persisted."""
+        self._maximum_size: int = maximum_size
+        self._directory: str | None = directory
+        self._entries: OrderedDict[tuple[str, str], Callable] = OrderedDict()
+        self._lock: threading.Lock = threading.Lock()
+
+        if self._directory is not None:
+            os.makedirs(self._directory, exist_ok=True)
+
+    def _path(self, implementation_hash: str) -> str:
+        return os.path.join(self._directory, implementation_hash + ".dill")
+
+    def get(self, name: str, implementation_hash: str) -> Callable | None:
+        """Returns a deserialized DQ metric from memory or, if it has been persisted, from disk.
+
+        Args:
+            name: The name of the DQ metric.
+            implementation_hash: The content hash of the serialization of the DQ metric.
+
+        Returns:
+            The deserialized DQ metric or `None`, if it is not contained in the cache."""
+        with self._lock:
+            dq_metric: Callable | None = self._entries.get((name, implementation_hash))
+            if dq_metric is not None:
+                self._entries.move_to_end((name, implementation_hash))
+                return dq_metric
+
+        if self._directory is None or not os.path.isfile(self._path(implementation_hash)):
+            return None
+
+        with open(self._path(implementation_hash), "rb") as file:
+            serialized_dq_metric: bytes = file.read()
+        if hash_implementation(serialized_dq_metric) != implementation_hash:
+            return None
+
+        import dill
+
+        dq_metric = dill.loads(serialized_dq_metric)
+        self._remember(name, implementation_hash, dq_metric)
+        return dq_metric
+
+    def put(self, name: str, implementation_hash: str, serialized_dq_metric: bytes) -> Callable:
+        """Deserializes a DQ metric, adds it to the cache and, if configured, persists its serialization.
+
+        Args:
+            name: The name of the DQ metric.
+            implementation_hash: The content hash of the serialization of the DQ metric.
+            serialized_dq_metric: The Dill serialization of the DQ metric.
+
+        Returns:
+            The deserialized DQ metric."""
+        import dill
+
+        dq_metric: Callable = dill.loads(serialized_dq_metric)
+        self._remember(name, implementation_hash, dq_metric)
+
+        if self._directory is not None and not os.path.isfile(self._path(implementation_hash)):
+            file_descriptor, temporary_path = tempfile.mkstemp(dir=self._directory)
+            with os.fdopen(file_descriptor, "wb") as file:
+                file.write(serialized_dq_metric)
+            os.replace(temporary_path, self._path(implementation_hash))
+
+        return dq_metric
+
+    def clear(self) -> None:
+        """Removes all deserialized DQ metrics from memory. Persisted serializations are retained."""
+        with self._lock:
+            self._entries.clear()
+
+    def _remember(self, name: str, implementation_hash: str, dq_metric: Callable) -> None:
+        with self._lock:
+            for outdated_key in [key for key in self._entries if key[0] == name and key[1] != implementation_hash]:
+                del self._entries[outdated_key]
+            self._entries[(name, implementation_hash)] = dq_metric
+            self._entries.move_to_end((name, implementation_hash))
+            while len(self._entries) > self._maximum_size:
+                self._entries.popitem(last=False)
@@ -0,0 +1,178 @@
+"""Provides the chunked execution of DQ metrics on a [Pandas DataFrame][pandas.DataFrame]. Vectorized DQ metrics are
+applied to whole chunks of a DataFrame, while row-wise DQ metrics are applied to the chunks in parallel by a pool
+of worker processes."""
+import hashlib
+import math
+import multiprocessing
+import os
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Iterator
+
+import pandas
+
+_MIN_PARALLEL_SIZE: int = 1_000
+"""The number of rows or columns up to which a row-wise DQ metric is applied in the calling process, since starting
+worker processes costs more than it saves for such small DataFrames."""
+
+_worker_dq_metric: Callable | None = None
+"""The DQ metric that is applied by a worker process. It is set once per worker process by
+[`_initialize_worker`][src.daqss.metric_execution._initialize_worker]."""
+
+
+def _initialize_worker(serialized_dq_metric: bytes) -> None:
+    """Deserializes the DQ metric once when a worker process is started.
+    The Dill serialization is used, since DQ metrics retrieved from DaQSS cannot be pickled by reference.
+
+    Args:
+        serialized_dq_metric: The Dill serialization of the DQ metric to be applied by the worker process."""
+    import dill
+
+    global _worker_dq_metric
+    _worker_dq_metric = dill.loads(serialized_dq_metric)
+
+
+def _apply_to_chunk(chunk: pandas.DataFrame, axis: int) -> pandas.Series:
+    """Applies the DQ metric of the worker process to each row or each column of a chunk.
+
+    Args:
+        chunk: The chunk of the DataFrame to which the DQ metric is applied.
+        axis: `1` to apply the DQ metric to each row, `0` to apply it to each column.
+
+    Returns:
+        A series containing one DQ measurement result per row or column of the chunk."""
+    return chunk.apply(_worker_dq_metric, axis=axis)
+
+
+def iterate_chunks(dataframe: pandas.DataFrame, chunk_size: int, axis: int) -> Iterator[pandas.DataFrame]:
+    """Splits a DataFrame into chunks without copying its data.
+
+    Args:
+        dataframe: The DataFrame to be split.
+        chunk_size: The maximum number of rows or columns contained in a chunk.
+        axis: `1` to split the DataFrame into chunks of rows, `0` to split it into chunks of columns.
+
+    Returns:
+        An iterator over the chunks of the DataFrame."""
+    if axis == 1:
+        for start in range(0, len(dataframe.index), chunk_size):
+            yield dataframe.iloc[start:start + chunk_size]
+    else:
+        for start in range(0, len(dataframe.columns), chunk_size):
+            yield dataframe.iloc[:, start:start + chunk_size]
+
+
+def fingerprint(dataframe: pandas.DataFrame, axis: int) -> pandas.Series:
+    """Computes a 64-bit fingerprint of the values of each row or each column of a DataFrame using the vectorized
+    hashing of [`hash_pandas_object`][pandas.util.hash_pandas_object]. Equal values result in equal fingerprints
+    across processes and runs.
+
+    Args:
+        dataframe: The DataFrame whose rows or columns are fingerprinted.
+        axis: `1` to compute a fingerprint per row, `0` to compute a fingerprint per column.
+
+    Returns:
+        A series of signed 64-bit integers, indexed by the row or column labels of the DataFrame."""
+    if axis == 1:
+        hashes = pandas.util.hash_pandas_object(dataframe, index=False).to_numpy()
+        return pandas.Series(hashes.view("int64"), index=dataframe.index)
+
+    # The row labels are part of a column's content, such that reordered rows change its fingerprint
+    digests: list[int] = [
+        int.from_bytes(hashlib.blake2b(pandas.util.hash_pandas_object(dataframe.iloc[:, position]).to_numpy()
+                                       .tobytes(), digest_size=8).digest(), "little", signed=True)
+        for position in range(len(dataframe.columns))]
+    return pandas.Series(digests, index=dataframe.columns, dtype="int64")
+
+
+def run_vectorized(dq_metric: Callable, dataframe: pandas.DataFrame, chunk_size: int, axis: int) -> pandas.Series:
+    """Runs a vectorized DQ metric, which receives a whole chunk and returns a series of DQ measurement results.
+
+    Args:
+        dq_metric: The vectorized DQ metric to be run.
+        dataframe: The data on which the DQ metric is run.
+        chunk_size: The maximum number of rows or columns passed to the DQ metric at once.
+        axis: `1` if the DQ metric computes a result per row, `0` if it computes a result per column.
+
+    Returns:
+        A series containing one DQ measurement result per row or column of the DataFrame."""
+    if dataframe.shape[1 - axis] <= chunk_size:
+        return dq_metric(dataframe)
+    return pandas.concat([dq_metric(chunk) for chunk in iterate_chunks(dataframe, chunk_size, axis)])
+
+
+def run_row_wise(dq_metric: Callable, dataframe: pandas.DataFrame, chunk_size: int, axis: int,
+                 max_workers: int | None = None) -> pandas.Series:
+    """Runs a DQ metric, which is applied to each row or column individually, in parallel on chunks of the
+    DataFrame. The DataFrame is split evenly across the worker processes, while no chunk exceeds `chunk_size`. At most
+    two chunks per worker process are in flight at any time, such that the memory required stays bounded for large
+    DataFrames. Only DataFrames with at most 1 000 rows or columns are processed without starting worker processes.
+
+    The worker processes are started by a fork server instead of forking the calling process, since forking a
+    process that runs threads, such as the catalog listener or the threads of a connection pool, can deadlock the
+    child.
+
+    Args:
+        dq_metric: The DQ metric to be run.
+        dataframe: The data on which the DQ metric is run.
+        chunk_size: The maximum number of rows or columns passed to a worker process at once.
+        axis: `1` if the DQ metric computes a result per row, `0` if it computes a result per column.
+        max_workers: The number of worker processes. Defaults to `None`, which means that one worker process per
+            CPU core is used.
+
+    Returns:
+        A series containing one DQ measurement result per row or column of the DataFrame."""
+    if max_workers is None:
+        max_workers = os.cpu_count() or 1
+
+    size: int = dataframe.shape[1 - axis]
+    if size <= _MIN_PARALLEL_SIZE or max_workers == 1:
+        return dataframe.apply(dq_metric, axis=axis)
+
+    chunk_size = min(chunk_size, math.ceil(size / max_workers))
+
+    import dill
+
+    results: list[pandas.Series] = []
+    pending: deque[Future] = deque()
+    with ProcessPoolExecutor(max_workers=max_workers, mp_context=_process_context(),
+                             initializer=_initialize_worker, initargs=(dill.dumps(dq_metric),)) as pool:
+        for chunk in iterate_chunks(dataframe, chunk_size, axis):
+            pending.append(pool.submit(_apply_to_chunk, chunk, axis))
+            if len(pending) >= 2 * max_workers:
+                results.append(pending.popleft().result())
+        while len(pending) > 0:
+            results.append(pending.popleft().result())
+
+    return pandas.concat(results)
+
+
+def _process_context() -> multiprocessing.context.BaseContext:
+    """Returns the context used to start worker processes. The fork server is used where it is available, otherwise
+    worker processes are spawned, e.g. on Windows.
+
+    Returns:
+        The multiprocessing context used by the pool of worker processes."""
+    if "forkserver" in multiprocessing.get_all_start_methods():
+        return multiprocessing.get_context("forkserver")
+    return multiprocessing.get_context("spawn")
+
+
+def run(dq_metric: Callable, vectorized: bool, dataframe: pandas.DataFrame, chunk_size: int, axis: int,
+        max_workers: int | None = None) -> pandas.Series:
+    """Runs a DQ metric either using [`run_vectorized`][src.daqss.metric_execution.run_vectorized] or
+    [`run_row_wise`][src.daqss.metric_execution.run_row_wise].
+
+    Args:
+        dq_metric: The DQ metric to be run.
+        vectorized: Whether the DQ metric receives whole chunks of the DataFrame.
+        dataframe: The data on which the DQ metric is run.
+        chunk_size: The maximum number of rows or columns processed at once.
+        axis: `1` if the DQ metric computes a result per row, `0` if it computes a result per column.
+        max_workers: The number of worker processes used if the DQ metric is not vectorized.
+
+    Returns:
+        A series containing one DQ measurement result per row or column of the DataFrame."""
+    if vectorized:
+        return run_vectorized(dq_metric, dataframe, chunk_size, axis)
+    return run_row_wise(dq_metric, dataframe, chunk_size, axis, max_workers)
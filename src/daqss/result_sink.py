@@ -0,0 +1,392 @@
+"""Provides a write-behind buffer for DQ results, which decouples producers that store small batches of DQ results
+from many threads from the latency of committing them to the database."""
+import atexit
+import logging
+import threading
+import time
+from datetime import date, datetime, timezone
+from typing import TYPE_CHECKING, Callable
+
+import pandas
+from sqlalchemy.exc import DBAPIError, InterfaceError, OperationalError
+
+from daqss import api
+from daqss import instrumentation
+from daqss import sharding
+from daqss.levels_of_data_granularity import LevelOfDataGranularity
+
+if TYPE_CHECKING:
+    from daqss.api import DaQSS
+
+
+def _is_transient(error: Exception) -> bool:
+    """Determines whether an error is likely to disappear when storing the same DQ results again, e.g., since the
+    database was unavailable or the connection was lost.
+
+    Args:
+        error: The error raised while storing DQ results.
+
+    Returns:
+        Whether storing the DQ results is retried."""
+    return isinstance(error, (OperationalError, InterfaceError)) or \
+        (isinstance(error, DBAPIError) and error.connection_invalidated)
+
+
+class ResultSink:
+    """A write-behind buffer that accepts DQ results from many producers and stores them in large batches.
+
+    The DQ results put into the sink are buffered in memory together with the point in time they were put, which
+    is stored as their creation timestamp. A background worker flushes the buffer once it holds `max_rows` DQ
+    results or its oldest DQ results have been waiting for `max_age_seconds`. All DQ results of a flush are stored
+    within a single transaction, whereby the DQ results of the same DQ metric or aggregation process, level of data
+    granularity, and parent data element are merged and stored using PostgreSQL `COPY`. If DaQSS is sharded, the
+    DQ results of a flush are stored within one transaction per shard. While the sink holds
+    `capacity` DQ results that have not been committed yet, producers are blocked until a flush has completed.
+
+    If a flush fails due to a transient error, e.g., since the database is unavailable, the DQ results are kept and
+    the flush is retried after `max_age_seconds`. DQ results that are rejected, e.g., since their parent data element
+    does not exist, are logged and passed to the callback `on_rejected`, if given. This includes DQ results whose
+    storing fails due to any other error, e.g., since their DQ metric is not stored in DaQSS, which are discarded
+    instead of being retried, such that they cannot block the sink.
+
+    The sink is flushed and stopped by [`close`][src.daqss.result_sink.ResultSink.close], when the sink is used as
+    context manager, or when the interpreter exits. Sinks are created using
+    [`DaQSS.result_sink`][src.daqss.api.DaQSS.result_sink].
+
+    ??? example
+        ``` python
+        with d.result_sink(max_rows=50_000, max_age_seconds=2.0) as sink:
+            for batch in stream:
+                sink.put_dq_measurement_results(arith_mean_completeness_per_row, ROW, table, batch)
+        ```
+    """
+
+    def __init__(self, daqss: "DaQSS", max_rows: int = 100_000, max_age_seconds: float = 1.0,
+                 capacity: int = 1_000_000,
+                 on_rejected: Callable[[pandas.DataFrame], None] | None = None) -> None:
+        """Initializes a new sink and starts its background worker.
+
+        Args:
+            daqss: The DaQSS instance used for storing the DQ results.
+            max_rows: The number of buffered DQ results at which the buffer is flushed. Defaults to 100 000.
+            max_age_seconds: The number of seconds after which buffered DQ results are flushed at the latest.
+                Defaults to 1.
+            capacity: The maximum number of DQ results that are held by the sink until they have been committed.
+                Defaults to 1 000 000.
+            on_rejected: A callable that receives the DQ results rejected by a flush, in the format returned by
+                [`store_dq_measurement_results_from_series`][src.daqss.api.DaQSS.store_dq_measurement_results_from_series]
+                with the additional columns `parent_data_element`, `dq_metric`, and `aggregation_process`.
+                It is called by the background worker. Defaults to `None`."""
+        if max_rows < 1 or capacity < max_rows:
+            raise ValueError("The maximum number of rows must be positive and must not exceed the capacity.")
+        if max_age_seconds <= 0:
+            raise ValueError("The maximum age must be positive.")
+
+        self._daqss: DaQSS = daqss
+        self._max_rows: int = max_rows
+        self._max_age_seconds: float = max_age_seconds
+        self._capacity: int = capacity
+        self._on_rejected: Callable[[pandas.DataFrame], None] | None = on_rejected
+
+        self._buffer: dict[tuple, list[tuple[pandas.Series, datetime]]] = {}
+        """The buffered DQ results, keyed by their DQ metric, aggregation process, level of data granularity, and
+        parent data element."""
+
+        self._buffered_rows: int = 0
+        """The number of buffered DQ results."""
+
+        self._held_rows: int = 0
+        """The number of DQ results that are buffered or being flushed."""
+
+        self._oldest: float | None = None
+        """The monotonic time at which the oldest buffered DQ results were put."""
+
+        self._condition: threading.Condition = threading.Condition()
+        self._flush_requested: bool = False
+        self._flushes_completed: int = 0
+        self._closed: bool = False
+        self._error: Exception | None = None
+
+        self._worker: threading.Thread = threading.Thread(target=self._run, name="daqss-result-sink", daemon=True)
+        self._worker.start()
+        atexit.register(self._close_at_exit)
+
+    def __enter__(self) -> "ResultSink":
+        return self
+
+    def __exit__(self, *exception_info) -> None:
+        self.close()
+
+    def put_dq_measurement_results(self, dq_metric: Callable | str,
+                                   level_of_data_granularity: LevelOfDataGranularity,
+                                   parent_data_element: str,
+                                   values: pandas.Series,
+                                   timeout: float | None = None) -> None:
+        """Puts DQ results computed by a DQ metric into the sink, which stores them like
+        [`store_dq_measurement_results_from_series`][src.daqss.api.DaQSS.store_dq_measurement_results_from_series].
+
+        Args:
+            dq_metric: The DQ metric, or its name, that was used to compute the result values.
+            level_of_data_granularity: The level of data granularity of the individual result values.
+            parent_data_element: The parent data element which contains the individual result values to be stored.
+            values: A Pandas series of values that contains the computed result values and the local identifiers of
+                their corresponding data values.
+            timeout: The maximum number of seconds to wait while the sink is full. Defaults to `None`, which means
+                that the producer waits until the sink can accept the DQ results.
+
+        Raises:
+            TimeoutError: If the sink is still full after the timeout.
+            ValueError: If the sink has been closed."""
+        self._put((getattr(dq_metric, "__name__", dq_metric), None, level_of_data_granularity, parent_data_element),
+                  values, timeout)
+
+    def put_dq_aggregation_results(self, aggregation_process: str,
+                                   level_of_data_granularity: LevelOfDataGranularity,
+                                   parent_data_element: str,
+                                   values: pandas.Series,
+                                   timeout: float | None = None) -> None:
+        """Puts DQ results computed by an aggregation process into the sink, which stores them like
+        [`store_dq_aggregation_results_from_series`][src.daqss.api.DaQSS.store_dq_aggregation_results_from_series].
+
+        Args:
+            aggregation_process: The name of the aggregation process that was used to compute the result values.
+            level_of_data_granularity: The level of data granularity of the individual result values.
+            parent_data_element: The parent data element which contains the individual result values to be stored.
+            values: A Pandas series of values that contains the computed result values and the local identifiers of
+                their corresponding data values.
+            timeout: The maximum number of seconds to wait while the sink is full. Defaults to `None`, which means
+                that the producer waits until the sink can accept the DQ results.
+
+        Raises:
+            TimeoutError: If the sink is still full after the timeout.
+            ValueError: If the sink has been closed."""
+        self._put((None, aggregation_process, level_of_data_granularity, parent_data_element), values, timeout)
+
+    def _put(self, key: tuple, values: pandas.Series, timeout: float | None) -> None:
+        if len(values) == 0:
+            return
+        timestamp: datetime = datetime.now(tz=timezone.utc).replace(tzinfo=None)
+        # The producer may reuse its series after putting it
+        values = values.copy()
+        deadline: float | None = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            # A batch larger than the capacity is accepted once the sink is empty
+            while not self._closed and self._held_rows > 0 and self._held_rows + len(values) > self._capacity:
+                remaining: float | None = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError(f"The result sink is full, since it holds {self._held_rows} DQ results " +
+                                       "that have not been stored yet.")
+                self._condition.wait(remaining)
+            if self._closed:
+                raise ValueError("The result sink has been closed.")
+
+            self._buffer.setdefault(key, []).append((values, timestamp))
+            self._buffered_rows += len(values)
+            self._held_rows += len(values)
+            if self._oldest is None:
+                self._oldest = time.monotonic()
+            if self._buffered_rows >= self._max_rows:
+                self._condition.notify_all()
+
+    def flush(self, timeout: float | None = None) -> None:
+        """Requests that all DQ results put into the sink so far are stored, and waits until they have been
+        committed.
+
+        Args:
+            timeout: The maximum number of seconds to wait. Defaults to `None`, which means that there is no limit.
+
+        Raises:
+            TimeoutError: If the DQ results have not been committed after the timeout."""
+        deadline: float | None = None if timeout is None else time.monotonic() + timeout
+        with self._condition:
+            # A flush that is in progress does not store the DQ results buffered since it started
+            target: int = self._flushes_completed + (1 if self._held_rows > self._buffered_rows else 0) + \
+                (1 if self._buffered_rows > 0 else 0)
+            if self._buffered_rows > 0:
+                self._flush_requested = True
+                self._condition.notify_all()
+            while self._flushes_completed < target and self._worker.is_alive():
+                remaining: float | None = None if deadline is None else deadline - time.monotonic()
+                if remaining is not None and remaining <= 0:
+                    raise TimeoutError("The DQ results of the result sink have not been stored in time.")
+                self._condition.wait(remaining)
+
+    def close(self) -> None:
+        """Stores all buffered DQ results and stops the background worker. Afterward, no DQ results can be put into
+        the sink anymore.
+
+        Raises:
+            Exception: The exception raised by the last flush, if buffered DQ results could not be stored due to
+                a transient error, e.g., since the database is unavailable."""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join()
+        atexit.unregister(self._close_at_exit)
+        if self._error is not None:
+            raise self._error
+
+    def _close_at_exit(self) -> None:
+        try:
+            self.close()
+        except Exception as error:
+            logging.error(f"{self._held_rows} DQ results of a result sink cannot be stored at exit:\n{error}")
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._closed and not self._flush_requested and self._buffered_rows < self._max_rows and \
+                        (self._oldest is None or time.monotonic() - self._oldest < self._max_age_seconds):
+                    self._condition.wait(None if self._oldest is None else
+                                         self._max_age_seconds - (time.monotonic() - self._oldest))
+                if self._closed and self._buffered_rows == 0:
+                    return
+                buffer: dict[tuple, list[tuple[pandas.Series, datetime]]] = self._buffer
+                flushed_rows: int = self._buffered_rows
+                self._buffer = {}
+                self._buffered_rows = 0
+                self._oldest = None
+                self._flush_requested = False
+
+            try:
+                self._store_buffered_dq_results(buffer)
+                error: Exception | None = None
+            except Exception as exception:
+                error = exception
+
+            retried: bool = error is not None and _is_transient(error)
+            if error is not None and not retried:
+                logging.warning(f"{flushed_rows} DQ results of a result sink cannot be stored, hence they are " +
+                                f"discarded:\n{error}")
+                instrumentation.count("rows_rejected", flushed_rows)
+                self._report_rejected([_rejected_dq_results(key, batches, "storing the DQ results failed: " +
+                                                            str(error))
+                                       for key, batches in buffer.items()])
+
+            with self._condition:
+                if not retried:
+                    self._error = None
+                    self._held_rows -= flushed_rows
+                    self._flushes_completed += 1
+                else:
+                    logging.warning(f"{flushed_rows} DQ results of a result sink cannot be stored, hence storing " +
+                                    f"them is retried:\n{error}")
+                    for key, batches in buffer.items():
+                        self._buffer[key] = batches + self._buffer.get(key, [])
+                    self._buffered_rows += flushed_rows
+                    self._oldest = time.monotonic()
+                    self._error = error
+                self._condition.notify_all()
+                if retried:
+                    if self._closed:
+                        return
+                    self._condition.wait(self._max_age_seconds)
+
+    @instrumentation.instrumented
+    def _store_buffered_dq_results(self, buffer: dict[tuple, list[tuple[pandas.Series, datetime]]]) -> None:
+        """Stores the DQ results of a flush within a single transaction, or within one transaction per shard if DaQSS
+        is sharded.
+
+        Args:
+            buffer: The buffered DQ results, keyed by their DQ metric, aggregation process, level of data
+                granularity, and parent data element."""
+        router: sharding.ShardRouter | None = self._daqss._router
+        shards: dict[int | None, dict[tuple, list[tuple[pandas.Series, datetime]]]] = {}
+        for key, batches in buffer.items():
+            shards.setdefault(None if router is None else router.shard_of(key[3]), {})[key] = batches
+
+        rejected: list[pandas.DataFrame] = []
+        attempted: int = 0
+        for shard, shard_buffer in shards.items():
+            token = sharding.current_shard.set(shard)
+            try:
+                attempted += self._store_dq_results_on_current_shard(shard_buffer, rejected)
+            finally:
+                sharding.current_shard.reset(token)
+
+        rejected_count: int = sum(len(frame) for frame in rejected)
+        instrumentation.count("rows_attempted", attempted)
+        instrumentation.count("rows_stored", attempted - rejected_count)
+        instrumentation.count("rows_rejected", rejected_count)
+        if rejected_count > 0:
+            logging.warning(f"{rejected_count} DQ results of a result sink cannot be stored.")
+            self._report_rejected(rejected)
+
+    def _report_rejected(self, rejected: list[pandas.DataFrame]) -> None:
+        """Passes rejected DQ results to the callback `on_rejected`, if given.
+
+        Args:
+            rejected: The rejected DQ results, in the format passed to the callback."""
+        if self._on_rejected is None or len(rejected) == 0:
+            return
+        try:
+            self._on_rejected(pandas.concat(rejected))
+        except Exception as error:
+            logging.warning(f"The callback for rejected DQ results of a result sink failed:\n{error}")
+
+    def _store_dq_results_on_current_shard(self, buffer: dict[tuple, list[tuple[pandas.Series, datetime]]],
+                                           rejected: list[pandas.DataFrame]) -> int:
+        """Stores buffered DQ results within a single transaction on the shard to which the current call is routed,
+        or on the primary database if DaQSS is not sharded.
+
+        Args:
+            buffer: The buffered DQ results, keyed by their DQ metric, aggregation process, level of data
+                granularity, and parent data element.
+            rejected: The list to which the DQ results that cannot be stored are appended.
+
+        Returns:
+            The number of DQ results attempted to be stored."""
+        months: set[date] = {timestamp.date().replace(day=1) for batches in buffer.values()
+                             for _, timestamp in batches}
+        for month in sorted(months):
+            self._daqss._ensure_dq_result_partition(datetime(month.year, month.month, 1))
+
+        attempted: int = 0
+        with self._daqss._current_engine().connect() as connection:
+            token = api._bound_connection.set((self._daqss, connection, True))
+            try:
+                for (dq_metric_name, aggregation_process, level, parent), batches in buffer.items():
+                    values: pandas.Series = pandas.concat([values for values, _ in batches])
+                    timestamps: pandas.Series = pandas.concat([pandas.Series(pandas.Timestamp(timestamp),
+                                                                             index=values.index)
+                                                               for values, timestamp in batches])
+                    attempted += len(values)
+                    try:
+                        batch_rejected: pandas.DataFrame = self._daqss._store_dq_results_from_series_in_bulk(
+                            level, parent, values, timestamps.iloc[0], dq_metric_name=dq_metric_name,
+                            aggregation_process=aggregation_process, timestamps=timestamps)
+                    except Exception as error:
+                        if _is_transient(error):
+                            raise
+                        # The changes made for these DQ results have been rolled back to their savepoint
+                        logging.warning(f"{len(values)} DQ results of a result sink cannot be stored, hence they " +
+                                        f"are discarded:\n{error}")
+                        batch_rejected = pandas.DataFrame(
+                            {"result_value": values, "reason": f"storing the DQ results failed: {error}"},
+                            index=values.index)
+                    if len(batch_rejected) > 0:
+                        rejected.append(batch_rejected.assign(parent_data_element=parent, dq_metric=dq_metric_name,
+                                                              aggregation_process=aggregation_process))
+                connection.commit()
+            except Exception:
+                self._daqss._forget_data_element_ids()
+                raise
+            finally:
+                api._bound_connection.reset(token)
+        return attempted
+
+
+def _rejected_dq_results(key: tuple, batches: list[tuple[pandas.Series, datetime]], reason: str) -> pandas.DataFrame:
+    """Combines buffered DQ results that are discarded into the format passed to the callback `on_rejected`.
+
+    Args:
+        key: The DQ metric, aggregation process, level of data granularity, and parent data element of the DQ
+            results.
+        batches: The buffered DQ results together with the point in time they were put.
+        reason: The reason why the DQ results are discarded.
+
+    Returns:
+        A DataFrame, indexed by the local identifiers, that contains the result values and the reason."""
+    values: pandas.Series = pandas.concat([values for values, _ in batches])
+    return pandas.DataFrame({"result_value": values, "reason": reason}, index=values.index) \
+        .assign(parent_data_element=key[3], dq_metric=key[0], aggregation_process=key[1])
@@ -0,0 +1,314 @@
+"""Provides the routing of data elements and DQ results to the shards of a sharded DaQSS deployment, which is enabled
+by setting the environment variable `DAQSS_SHARD_HOSTS`.
+
+Each shard is a PostgreSQL database set up like the primary database of DaQSS. The catalog, i.e., the levels of data
+granularity, DQ dimensions, DQ metrics, aggregation constraints, aggregation functions, and aggregation processes, as
+well as the retention policies, is maintained on the primary database and copied to all shards, such that DQ results
+stored on a shard can reference it. Data elements and DQ results are stored on the shard determined by a hash of the
+global identifier of the top-level data element of their tree, hence a tree of data elements and all DQ results
+computed on it reside on the same shard."""
+import hashlib
+import queue
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextvars import ContextVar, copy_context
+from typing import Callable, Iterable, Iterator, TypeVar
+
+from sqlalchemy import Engine, Row, text
+
+T = TypeVar("T")
+
+CATALOG_TABLES: dict[str, tuple[str, ...]] = {
+    "levels_of_data_granularity": ("level_name",),
+    "dq_dimension": ("dimension_name",),
+    "dq_metric": ("metric_name",),
+    "metric_computes_value_for_dimension": ("metric_name", "dimension_name"),
+    "aggregation_constraint": ("aggregation_constraint_name",),
+    "aggregation_function": ("aggregation_function_name",),
+    "aggregation_process": ("aggregation_process_name",),
+    "aggregation_process_is_based_on": ("aggregation_process_name", "aggregation_constraint_name"),
+    "aggregation_process_computes_value_for_dimension": ("aggregation_process_name", "dimension_name"),
+    "retention_policy": ()}
+"""The tables copied from the primary database to the shards in an order that satisfies their foreign keys, together
+with the columns of their primary keys. Tables without a primary key are replaced as a whole."""
+
+_LOCATION_CACHE_SIZE: int = 1_000_000
+"""The maximum number of data elements whose shard is held in memory by a router."""
+
+current_shard: ContextVar[int | None] = ContextVar("current_shard", default=None)
+"""Holds the index of the shard to which the database accesses of the current call are routed, or `None` if they are
+not routed, i.e., if they access the primary database."""
+
+
+class ShardRouter:
+    """Routes data elements and DQ results to the shards of a sharded DaQSS deployment and fans out calls to all
+    shards in parallel."""
+
+    def __init__(self, engines: list[Engine]) -> None:
+        """Creates a router for shards.
+
+        Args:
+            engines: The engines used for connecting to the shards, whose order determines the index of each shard.
+                The order must therefore be the same for all processes accessing the shards."""
+        self.engines: list[Engine] = engines
+        self._locations: OrderedDict[str, int] = OrderedDict()
+        """Holds the shards of the data elements, keyed by their global identifiers, that have been located recently."""
+        self._locations_lock: threading.Lock = threading.Lock()
+
+    def shard_of_root(self, global_identifier: str) -> int:
+        """Determines the shard of a tree of data elements.
+
+        Args:
+            global_identifier: The global identifier of the top-level data element of the tree.
+
+        Returns:
+            The index of the shard, which is derived from a stable hash of the global identifier."""
+        digest: bytes = hashlib.blake2b(global_identifier.encode(), digest_size=8).digest()
+        return int.from_bytes(digest, "big") % len(self.engines)
+
+    def remember(self, locations: Iterable[tuple[str, int]]) -> None:
+        """Holds the shards of data elements in memory, whereby the least recently used ones are discarded if more
+        than `_LOCATION_CACHE_SIZE` are held.
+
+        Args:
+            locations: Pairs of the global identifier of a stored data element and the index of its shard."""
+        with self._locations_lock:
+            for global_identifier, shard in locations:
+                self._locations[global_identifier] = shard
+                self._locations.move_to_end(global_identifier)
+            while len(self._locations) > _LOCATION_CACHE_SIZE:
+                self._locations.popitem(last=False)
+
+    def locate(self, global_identifiers: Iterable[str]) -> dict[str, int]:
+        """Finds the shards on which data elements are stored. Data elements whose shard is not held in memory are
+        looked up on all shards in parallel.
+
+        Args:
+            global_identifiers: The global identifiers of the data elements.
+
+        Returns:
+            The indexes of the shards, keyed by the global identifiers of the data elements. Data elements that are
+            not stored on any shard are omitted."""
+        located: dict[str, int] = {}
+        missing: list[str] = []
+        with self._locations_lock:
+            for global_identifier in set(global_identifiers):
+                shard: int | None = self._locations.get(global_identifier)
+                if shard is None:
+                    missing.append(global_identifier)
+                else:
+                    self._locations.move_to_end(global_identifier)
+                    located[global_identifier] = shard
+        if len(missing) == 0:
+            return located
+
+        def find(shard: int) -> list[str]:
+            with self.engines[shard].connect() as connection:
+                return connection.execute(text(
+                    "SELECT data_element_global_identifier FROM data_element " +
+                    "WHERE data_element_global_identifier = ANY(:global_identifiers)"),
+                    {"global_identifiers": missing}).scalars().all()
+
+        found: dict[str, int] = {global_identifier: shard for shard, global_identifiers in enumerate(self.run(find))
+                                 for global_identifier in global_identifiers}
+        self.remember(found.items())
+        located.update(found)
+        return located
+
+    def shard_of(self, global_identifier: str) -> int:
+        """Determines the shard of a data element that is expected to be stored already.
+
+        Args:
+            global_identifier: The global identifier of the data element.
+
+        Returns:
+            The index of the shard on which the data element is stored, or `0` if it is not stored on any shard, such
+            that the call is still routed and rejects the data element like an unsharded DaQSS does."""
+        return self.locate([global_identifier]).get(global_identifier, 0)
+
+    def route(self, parents: dict[str, str | None]) -> dict[str, int]:
+        """Determines the shards of data elements to be stored. A data element that is already stored remains on
+        its shard. Otherwise, it is stored on the shard of its parent data element, which is either stored already
+        or part of the same data elements, or on the shard of its tree if it is a top-level data element.
+
+        Args:
+            parents: The global identifiers of the parent data elements, or `None` for top-level data elements, keyed
+                by the global identifiers of the data elements.
+
+        Returns:
+            The indexes of the shards, keyed by the global identifiers of the data elements. Data elements contained
+            in themselves through a cycle of parent data elements, or whose parent is neither stored nor supplied, are
+            routed to any shard, which rejects them."""
+        located: dict[str, int] = self.locate(set(parents) | {parent for parent in parents.values()
+                                                              if parent is not None})
+        shards: dict[str, int] = {}
+        for global_identifier in parents:
+            path: list[str] = []
+            path_elements: set[str] = set()
+            current: str | None = global_identifier
+            while current is not None and current not in shards and current not in located \
+                    and current in parents and current not in path_elements:
+                path.append(current)
+                path_elements.add(current)
+                current = parents[current]
+            if current is None:
+                shard: int = self.shard_of_root(path[-1])
+            elif current in shards:
+                shard: int = shards[current]
+            elif current in located:
+                shard: int = located[current]
+            else:
+                shard: int = self.shard_of_root(current)
+            shards.setdefault(global_identifier, shard)
+            for element in path:
+                shards[element] = shard
+        return shards
+
+    def run(self, function: Callable[[int], T], shards: Iterable[int] | None = None) -> list[T]:
+        """Calls a function for each of the shards in parallel, whereby the shard is the current shard within the
+        call.
+
+        Args:
+            function: The function, which receives the index of the shard.
+            shards: The indexes of the shards. Defaults to `None`, which means that the function is called for all
+                shards.
+
+        Returns:
+            The return values of the calls in the order of the shards.
+
+        Raises:
+            Exception: The first exception raised by a call, after all calls have finished."""
+        shards: list[int] = list(range(len(self.engines)) if shards is None else shards)
+        if len(shards) <= 1:
+            return [_call_on_shard(function, shard) for shard in shards]
+
+        with ThreadPoolExecutor(max_workers=len(shards), thread_name_prefix="daqss-shard") as executor:
+            futures: list[Future] = [executor.submit(copy_context().run, _call_on_shard, function, shard)
+                                     for shard in shards]
+            return [future.result() for future in futures]
+
+    def merge(self, function: Callable[[int], Iterator[T]], shards: Iterable[int] | None = None) -> Iterator[T]:
+        """Iterates over the iterators returned by a function for each of the shards in parallel and yields their
+        items in the order they arrive. At most one item per shard is buffered, such that the memory required stays
+        bounded.
+
+        Args:
+            function: The function, which receives the index of the shard.
+            shards: The indexes of the shards. Defaults to `None`, which means that the function is called for all
+                shards.
+
+        Returns:
+            An iterator over the items of all iterators."""
+        shards: list[int] = list(range(len(self.engines)) if shards is None else shards)
+        if len(shards) <= 1:
+            for shard in shards:
+                yield from _iterate_on_shard(function, shard)
+            return
+
+        items: queue.Queue = queue.Queue(maxsize=len(shards))
+        stopped: threading.Event = threading.Event()
+
+        def offer(entry: tuple[str, object]) -> bool:
+            while not stopped.is_set():
+                try:
+                    items.put(entry, timeout=0.1)
+                    return True
+                except queue.Full:
+                    continue
+            return False
+
+        def produce(shard: int) -> None:
+            try:
+                for item in _iterate_on_shard(function, shard):
+                    if not offer(("item", item)):
+                        return
+            except BaseException as error:
+                offer(("error", error))
+            finally:
+                offer(("done", None))
+
+        threads: list[threading.Thread] = [threading.Thread(target=copy_context().run, args=(produce, shard),
+                                                            name=f"daqss-shard-{shard}", daemon=True)
+                                           for shard in shards]
+        for thread in threads:
+            thread.start()
+        try:
+            running: int = len(threads)
+            while running > 0:
+                kind, value = items.get()
+                if kind == "done":
+                    running -= 1
+                elif kind == "error":
+                    raise value
+                else:
+                    yield value
+        finally:
+            stopped.set()
+            for thread in threads:
+                thread.join()
+
+    def synchronize_catalog(self, primary: Engine) -> None:
+        """Copies the tables listed in `CATALOG_TABLES` from the primary database to all shards in parallel.
+        Rows are inserted or updated, but not deleted, since DQ results on the shards may still reference them.
+
+        Args:
+            primary: The engine used for connecting to the primary database."""
+        tables: dict[str, tuple[list[str], list[Row]]] = {}
+        with primary.connect() as connection:
+            for table in CATALOG_TABLES:
+                query_result = connection.execute(text(f"SELECT * FROM {table}"))
+                tables[table] = (list(query_result.keys()), query_result.fetchall())
+
+        def synchronize(shard: int) -> None:
+            with self.engines[shard].connect() as connection:
+                for table, (columns, rows) in tables.items():
+                    key: tuple[str, ...] = CATALOG_TABLES[table]
+                    if len(key) == 0:
+                        connection.execute(text(f"DELETE FROM {table}"))
+                    if len(rows) == 0:
+                        continue
+                    # A single statement is used, since foreign keys are checked at its end, e.g., for sub-dimensions
+                    statement: str = (f"INSERT INTO {table} ({', '.join(columns)}) VALUES " +
+                                      ", ".join("(" + ", ".join(f":p{index}_{position}"
+                                                                for position in range(len(columns))) + ")"
+                                                for index in range(len(rows))))
+                    updated: list[str] = [column for column in columns if column not in key]
+                    if len(key) > 0:
+                        statement += f" ON CONFLICT ({', '.join(key)}) DO " + (
+                            "UPDATE SET " + ", ".join(f"{column} = EXCLUDED.{column}" for column in updated)
+                            if len(updated) > 0 else "NOTHING")
+                    connection.execute(text(statement), {f"p{index}_{position}": value
+                                                         for index, row in enumerate(rows)
+                                                         for position, value in enumerate(row)})
+                connection.commit()
+
+        self.run(synchronize)
+
+
+def _call_on_shard(function: Callable[[int], T], shard: int) -> T:
+    token = current_shard.set(shard)
+    try:
+        return function(shard)
+    finally:
+        current_shard.reset(token)
+
+
+def _iterate_on_shard(function: Callable[[int], Iterator[T]], shard: int) -> Iterator[T]:
+    """Iterates over the iterator returned by a function for a shard, whereby the shard is the current shard
+    whenever the iterator is advanced, but not while the consumer processes an item."""
+    iterator: Iterator[T] = function(shard)
+    try:
+        while True:
+            token = current_shard.set(shard)
+            try:
+                item: T = next(iterator)
+            except StopIteration:
+                return
+            finally:
+                current_shard.reset(token)
+            yield item
+    finally:
+        close: Callable | None = getattr(iterator, "close", None)
+        if close is not None:
+            close()
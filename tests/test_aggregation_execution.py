@@ -0,0 +1,97 @@
+import math
+import sqlite3
+
+import pandas
+import pytest
+
+from daqss import aggregation_execution
+
+
+def _column(name: str) -> str:
+    return f"aggregation_values.\"{name}\""
+
+
+def _evaluate_in_sql(constraints_and_functions: list[tuple[str, str]], values: pandas.DataFrame) -> list[float]:
+    """Evaluates the translated `CASE` expression on an SQLite table standing in for the subquery of an aggregation
+    process. The values must not be integral, since SQLite stores integral numeric values as integers."""
+    case_expression, aggregated = aggregation_execution.to_sql(constraints_and_functions)
+    assert not aggregated
+    with sqlite3.connect(":memory:") as connection:
+        values.to_sql("aggregation_values", connection, index=False)
+        return [math.nan if row[0] is None else row[0] for row in connection.execute(
+            f"SELECT {case_expression} FROM aggregation_values ORDER BY rowid")]
+
+
+def test_operator_precedence():
+    case_expression, aggregated = aggregation_execution.to_sql([("not a > 1 and b < 2 or c = 3", "a + b * -c"),
+                                                                ("else", "(a + b) * c")])
+    assert case_expression == (
+        f"CASE WHEN (((NOT ({_column('a')} > CAST('1' AS NUMERIC))) AND ({_column('b')} < CAST('2' AS NUMERIC))) " +
+        f"OR ({_column('c')} = CAST('3' AS NUMERIC))) THEN ({_column('a')} + ({_column('b')} * (-{_column('c')}))) " +
+        f"ELSE (({_column('a')} + {_column('b')}) * {_column('c')}) END")
+    assert not aggregated
+
+
+def test_comparison_operators_are_translated():
+    case_expression, _ = aggregation_execution.to_sql([("a == 1 or a != 2 or a <> 3", "a")])
+    assert "= CAST('1' AS NUMERIC)" in case_expression
+    assert case_expression.count("<>") == 2
+
+
+def test_else_must_be_last():
+    with pytest.raises(ValueError):
+        aggregation_execution.to_sql([("else", "a"), ("a > 1", "b")])
+
+
+def test_else_only():
+    assert aggregation_execution.to_sql([("ELSE", "avg(a)")]) == (f"avg({_column('a')})", True)
+
+
+def test_without_else_no_result():
+    case_expression, _ = aggregation_execution.to_sql([("a > 1", "a")])
+    assert case_expression.endswith("ELSE NULL END")
+
+
+def test_aggregate_and_plain_columns_are_rejected():
+    with pytest.raises(ValueError):
+        aggregation_execution.to_sql([("a > 1", "avg(b)")])
+    with pytest.raises(ValueError):
+        aggregation_execution.to_sql([("else", "sum(a) + b")])
+
+
+@pytest.mark.parametrize("expression", ["avg(avg(a))", "a +", "a > 1", "abs(a)", "a % 2"])
+def test_unsupported_expressions_are_rejected(expression: str):
+    with pytest.raises(ValueError):
+        aggregation_execution.to_sql([("else", expression)])
+
+
+def test_boolean_function_is_rejected():
+    with pytest.raises(ValueError):
+        aggregation_execution.to_sql([("a + 1", "a")])
+
+
+@pytest.mark.parametrize("constraints_and_functions", [
+    [("a > 1.5", "a * b"), ("else", "a - b")],
+    [("a = 2.5", "b"), ("a <> 0.5 and b < 2.5", "a + b"), ("else", "-a")],
+    [("a >= 1.5 or not b > 1.5", "a / b")],
+    [("else", "a / (b - 0.5)")],
+])
+def test_sql_and_pandas_agree(constraints_and_functions: list[tuple[str, str]]):
+    values: pandas.DataFrame = pandas.DataFrame({"a": [0.5, 1.5, 2.5, 3.5], "b": [0.5, 1.5, 0.0, 2.5]})
+    in_sql: list[float] = _evaluate_in_sql(constraints_and_functions, values)
+    on_client: pandas.Series = aggregation_execution.evaluate(constraints_and_functions, values)
+    assert on_client.tolist() == pytest.approx(in_sql, nan_ok=True)
+
+
+def test_division_by_zero_results_in_no_result():
+    values: pandas.DataFrame = pandas.DataFrame({"a": [1.0, -1.0, 2.0], "b": [0.0, 0.0, 4.0]})
+    results: pandas.Series = aggregation_execution.evaluate([("else", "a / b")], values)
+    assert results.isna().tolist() == [True, True, False]
+    assert results.iloc[2] == 0.5
+
+
+def test_equality_is_not_assignment():
+    values: pandas.DataFrame = pandas.DataFrame({"a": [1.0, 2.0], "b": [3.0, 4.0]})
+    results: pandas.Series = aggregation_execution.evaluate([("a = 2", "b"), ("else", "a")], values)
+    assert results.tolist() == [1.0, 4.0]
+    assert list(values.columns) == ["a", "b"]
@@ -0,0 +1,153 @@
+from datetime import datetime
+
+import pytest
+
+from daqss import api
+from daqss.api import DaQSS
+
+
+class _Result:
+    def __init__(self, value) -> None:
+        self._value = value
+
+    def scalar(self):
+        return self._value
+
+    def scalars(self) -> "_Result":
+        return self
+
+    def all(self):
+        return self._value
+
+    def fetchall(self):
+        return self._value or []
+
+    def keys(self) -> list[str]:
+        return []
+
+
+class _Savepoint:
+    is_active: bool = True
+
+    def commit(self) -> None:
+        pass
+
+    def rollback(self) -> None:
+        pass
+
+
+class _Connection:
+    """Stands in for a connection bound to DaQSS, which answers queries by the first matching prefix."""
+
+    def __init__(self, results: dict[str, object]) -> None:
+        self._results: dict[str, object] = results
+        self.statements: list[str] = []
+        self.commits: int = 0
+
+    def execute(self, statement, parameters: dict | None = None) -> _Result:
+        self.statements.append(str(statement))
+        for prefix, result in self._results.items():
+            if str(statement).startswith(prefix):
+                return _Result(result)
+        return _Result(None)
+
+    def begin_nested(self) -> _Savepoint:
+        return _Savepoint()
+
+    def commit(self) -> None:
+        self.commits += 1
+
+
+@pytest.fixture
+def daqss(monkeypatch) -> DaQSS:
+    monkeypatch.delenv("DAQSS_SHARD_HOSTS", raising=False)
+    monkeypatch.setattr(api, "_load_dotenv", lambda: None)
+    return DaQSS()
+
+
+def _bind(daqss: DaQSS, connection: _Connection, in_session: bool):
+    return api._bound_connection.set((daqss, connection, in_session))
+
+
+def _partition_creations(connection: _Connection) -> int:
+    return sum(statement.startswith("SELECT create_dq_result_partition") for statement in connection.statements)
+
+
+def test_partitions_are_remembered_once_committed(daqss):
+    connection: _Connection = _Connection({"SELECT create_dq_result_partition": "dq_result_row_2024_01"})
+    token = _bind(daqss, connection, False)
+    try:
+        daqss._ensure_dq_result_partition(datetime(2024, 1, 15))
+        daqss._ensure_dq_result_partition(datetime(2024, 1, 20))
+    finally:
+        api._bound_connection.reset(token)
+    assert _partition_creations(connection) == 2
+    assert connection.commits == 1
+
+
+def test_partitions_created_within_a_session_are_not_remembered(daqss):
+    connection: _Connection = _Connection({"SELECT create_dq_result_partition": "dq_result_row_2024_01"})
+    token = _bind(daqss, connection, True)
+    try:
+        daqss._ensure_dq_result_partition(datetime(2024, 1, 15))
+        daqss._ensure_dq_result_partition(datetime(2024, 1, 20))
+    finally:
+        api._bound_connection.reset(token)
+    # The session may be rolled back, hence the partitions are ensured again
+    assert _partition_creations(connection) == 4
+    assert connection.commits == 0
+    assert len(daqss._partitioned_months) == 0
+
+
+def test_compaction_discards_interned_data_element_ids(daqss):
+    daqss._remember_data_element_ids([("table#row", 1)])
+    connection: _Connection = _Connection({
+        "SELECT applies_to_dq_metric": [("metric", None, 30, "day")],
+        "WITH": 0,
+        "SELECT child.relname": []})
+    token = _bind(daqss, connection, False)
+    try:
+        assert daqss.compact_dq_results() == 0
+    finally:
+        api._bound_connection.reset(token)
+    assert daqss._cached_data_element_id("table#row") is None
+
+
+def test_compaction_records_batches_as_latest_beforehand(daqss):
+    connection: _Connection = _Connection({
+        "SELECT applies_to_dq_metric": [("metric", None, 30, "day")],
+        "WITH": 0,
+        "SELECT child.relname": []})
+    token = _bind(daqss, connection, False)
+    try:
+        daqss.compact_dq_results()
+    finally:
+        api._bound_connection.reset(token)
+    refreshes: list[int] = [position for position, statement in enumerate(connection.statements)
+                            if statement.startswith("SELECT refresh_dq_result_latest")]
+    compactions: list[int] = [position for position, statement in enumerate(connection.statements)
+                              if statement.startswith("WITH")]
+    assert len(refreshes) == 1
+    assert refreshes[0] < compactions[0]
+
+
+def test_latest_dq_results_record_batches_before_retrieval(daqss):
+    connection: _Connection = _Connection({})
+    token = _bind(daqss, connection, False)
+    try:
+        assert daqss.retrieve_latest_dq_results(dq_metric="metric").empty
+    finally:
+        api._bound_connection.reset(token)
+    assert connection.statements[0].startswith("SELECT refresh_dq_result_latest")
+    assert "FROM dq_result_latest" in connection.statements[1]
+    assert connection.commits == 1
+
+
+def test_interned_data_element_ids_are_bounded(daqss, monkeypatch):
+    monkeypatch.setattr(api, "_DATA_ELEMENT_ID_CACHE_SIZE", 2)
+    daqss._remember_data_element_ids([("a", 1), ("b", 2)])
+    assert daqss._cached_data_element_id("a") == 1
+    daqss._remember_data_element_ids([("c", 3)])
+    assert daqss._cached_data_element_id("b") is None
+    assert daqss._cached_data_element_id("a") == 1
+    assert daqss._cached_data_element_id("c") == 3
@@ -0,0 +1,82 @@
+import json
+
+from daqss.catalog import Catalog, DQDimension
+
+
+class _Result:
+    def __init__(self, row: tuple) -> None:
+        self._row = row
+
+    def one(self) -> tuple:
+        return self._row
+
+
+class _Connection:
+    """Stands in for a connection to a database whose catalog holds the given content."""
+
+    def __init__(self, content: dict) -> None:
+        self.version: int = 1
+        self.content: dict = {"levels": [["TABLE", 1], ["ROW", 3], ["COLUMN", 2]], "metrics": [],
+                              "constraints": [], "functions": [], "processes": []} | content
+        self.loads: int = 0
+
+    def execute(self, statement) -> _Result:
+        if str(statement) == "SELECT version FROM catalog_version":
+            return _Result((self.version,))
+        self.loads += 1
+        return _Result((self.version, json.dumps(self.content)))
+
+
+def _catalog(connection: _Connection, poll_interval: float = 5.0) -> Catalog:
+    return Catalog(None, poll_interval, lambda: connection)
+
+
+def _dimensions(*dimensions: tuple[str, str | None]) -> dict:
+    return {"dimensions": [[name, None, parent] for name, parent in dimensions]}
+
+
+def test_sub_dimensions_are_ordered_by_depth():
+    catalog: Catalog = _catalog(_Connection(_dimensions(
+        ("Completeness", None), ("Population Completeness", "Completeness"), ("Value Completeness", "Completeness"),
+        ("Column Completeness", "Value Completeness"), ("Accuracy", None), ("Syntactic Accuracy", "Accuracy"))))
+    assert catalog.sub_dimensions("Completeness") == ["Population Completeness", "Value Completeness",
+                                                      "Column Completeness"]
+    assert catalog.sub_dimensions("Column Completeness") == []
+    assert catalog.sub_dimensions("Unknown") == []
+
+
+def test_sub_dimensions_terminate_on_cycles():
+    catalog: Catalog = _catalog(_Connection(_dimensions(("A", "B"), ("B", "A"))))
+    assert set(catalog.sub_dimensions("A")) == {"A", "B"}
+
+
+def test_snapshot_is_loaded_once():
+    connection: _Connection = _Connection(_dimensions(("Completeness", None)))
+    catalog: Catalog = _catalog(connection)
+    assert catalog.dimensions == {"Completeness": DQDimension("Completeness", None, None)}
+    assert [level.name for level in catalog.levels] == ["TABLE", "ROW", "COLUMN"]
+    assert catalog.metrics == {}
+    assert connection.loads == 1
+
+
+def test_invalidated_snapshot_is_loaded_again():
+    connection: _Connection = _Connection(_dimensions(("Completeness", None)))
+    catalog: Catalog = _catalog(connection)
+    assert "Accuracy" not in catalog.dimensions
+    connection.content |= _dimensions(("Completeness", None), ("Accuracy", None))
+    assert "Accuracy" not in catalog.dimensions
+    catalog.invalidate()
+    assert "Accuracy" in catalog.dimensions
+    assert connection.loads == 2
+
+
+def test_outdated_snapshot_is_loaded_again_after_polling():
+    connection: _Connection = _Connection(_dimensions(("Completeness", None)))
+    catalog: Catalog = _catalog(connection, poll_interval=0)
+    assert "Accuracy" not in catalog.dimensions
+    assert connection.loads == 1
+
+    connection.content |= _dimensions(("Completeness", None), ("Accuracy", None))
+    connection.version += 1
+    assert "Accuracy" in catalog.dimensions
+    assert connection.loads == 2
@@ -0,0 +1,100 @@
+import pandas
+import pytest
+
+from daqss import metric_execution
+
+
+def _is_positive(values: pandas.Series) -> float:
+    return float(values["a"] > 0)
+
+
+@pytest.fixture
+def dataframe() -> pandas.DataFrame:
+    return pandas.DataFrame({"a": range(-5, 5), "b": range(10)}, index=[f"row_{i}" for i in range(10)])
+
+
+def test_iterate_chunks_of_rows(dataframe):
+    chunks = list(metric_execution.iterate_chunks(dataframe, 4, axis=1))
+    assert [len(chunk.index) for chunk in chunks] == [4, 4, 2]
+    pandas.testing.assert_frame_equal(pandas.concat(chunks), dataframe)
+
+
+def test_iterate_chunks_of_columns(dataframe):
+    chunks = list(metric_execution.iterate_chunks(dataframe, 1, axis=0))
+    assert [list(chunk.columns) for chunk in chunks] == [["a"], ["b"]]
+    assert all(len(chunk.index) == 10 for chunk in chunks)
+
+
+def test_iterate_chunks_of_empty_dataframe():
+    assert list(metric_execution.iterate_chunks(pandas.DataFrame({"a": []}), 4, axis=1)) == []
+
+
+def test_run_vectorized_passes_chunks(dataframe):
+    chunk_lengths: list[int] = []
+
+    def dq_metric(chunk: pandas.DataFrame) -> pandas.Series:
+        chunk_lengths.append(len(chunk.index))
+        return (chunk["a"] > 0).astype(float)
+
+    results = metric_execution.run_vectorized(dq_metric, dataframe, 3, axis=1)
+    assert chunk_lengths == [3, 3, 3, 1]
+    pandas.testing.assert_series_equal(results, (dataframe["a"] > 0).astype(float),
+                                       check_names=False)
+
+
+def test_run_vectorized_passes_whole_dataframe_if_it_fits_into_a_chunk(dataframe):
+    chunk_lengths: list[int] = []
+
+    def dq_metric(chunk: pandas.DataFrame) -> pandas.Series:
+        chunk_lengths.append(len(chunk.index))
+        return chunk["b"].astype(float)
+
+    metric_execution.run_vectorized(dq_metric, dataframe, 10, axis=1)
+    assert chunk_lengths == [10]
+
+
+def test_run_vectorized_per_column(dataframe):
+    results = metric_execution.run_vectorized(lambda chunk: chunk.sum(), dataframe, 1, axis=0)
+    assert results.to_dict() == {"a": -5, "b": 45}
+
+
+def test_run_row_wise_in_calling_process(dataframe):
+    results = metric_execution.run_row_wise(_is_positive, dataframe, 4, axis=1, max_workers=2)
+    pandas.testing.assert_series_equal(results, (dataframe["a"] > 0).astype(float),
+                                       check_names=False)
+
+
+def test_run_row_wise_in_worker_processes():
+    dataframe = pandas.DataFrame({"a": range(-1_500, 1_500)})
+    results = metric_execution.run_row_wise(_is_positive, dataframe, 100_000, axis=1, max_workers=2)
+    pandas.testing.assert_series_equal(results, (dataframe["a"] > 0).astype(float),
+                                       check_names=False)
+
+
+def test_run_row_wise_splits_rows_across_workers(monkeypatch):
+    chunk_sizes: list[int] = []
+    iterate_chunks = metric_execution.iterate_chunks
+
+    def recording_iterate_chunks(dataframe, chunk_size, axis):
+        chunk_sizes.append(chunk_size)
+        return iterate_chunks(dataframe, chunk_size, axis)
+
+    monkeypatch.setattr(metric_execution, "iterate_chunks", recording_iterate_chunks)
+    metric_execution.run_row_wise(_is_positive, pandas.DataFrame({"a": range(3_001)}), 100_000, axis=1,
+                                  max_workers=2)
+    metric_execution.run_row_wise(_is_positive, pandas.DataFrame({"a": range(3_001)}), 1_000, axis=1,
+                                  max_workers=2)
+    assert chunk_sizes == [1_501, 1_000]
+
+
+def test_fingerprint_of_rows_ignores_labels(dataframe):
+    relabeled = dataframe.set_axis([f"other_{i}" for i in range(10)], axis=0)
+    assert (metric_execution.fingerprint(dataframe, axis=1).to_numpy() ==
+            metric_execution.fingerprint(relabeled, axis=1).to_numpy()).all()
+
+
+def test_fingerprint_of_columns_depends_on_row_order(dataframe):
+    reordered = dataframe.iloc[::-1]
+    original = metric_execution.fingerprint(dataframe, axis=0)
+    assert original.dtype == "int64"
+    assert (original != metric_execution.fingerprint(reordered, axis=0)).all()
@@ -0,0 +1,164 @@
+import threading
+from contextlib import contextmanager
+
+import pandas
+import pytest
+from sqlalchemy.exc import OperationalError
+
+from daqss import ROW
+from daqss.result_sink import ResultSink
+
+
+class _Connection:
+    def __init__(self, daqss: "_DaQSS") -> None:
+        self._daqss = daqss
+
+    def commit(self) -> None:
+        if len(self._daqss.commit_failures) > 0:
+            raise self._daqss.commit_failures.pop(0)
+        self._daqss.commits += 1
+
+
+class _Engine:
+    def __init__(self, daqss: "_DaQSS") -> None:
+        self._daqss = daqss
+
+    @contextmanager
+    def connect(self):
+        yield _Connection(self._daqss)
+
+
+class _DaQSS:
+    """Stands in for DaQSS, recording the DQ results stored by a sink instead of storing them in a database."""
+
+    def __init__(self) -> None:
+        self._router = None
+        self.stored: list[tuple[str, pandas.Series]] = []
+        self.commits: int = 0
+        self.commit_failures: list[Exception] = []
+        self.failures: dict[str, list[Exception]] = {}
+        self.release: threading.Event = threading.Event()
+        self.release.set()
+
+    def _current_engine(self) -> _Engine:
+        return _Engine(self)
+
+    def _ensure_dq_result_partition(self, timestamp) -> None:
+        pass
+
+    def _forget_data_element_ids(self) -> None:
+        pass
+
+    def _store_dq_results_from_series_in_bulk(self, level, parent, values, timestamp, dq_metric_name=None,
+                                              aggregation_process=None, timestamps=None) -> pandas.DataFrame:
+        self.release.wait()
+        failures: list[Exception] = self.failures.get(parent, [])
+        if len(failures) > 0:
+            raise failures.pop(0)
+        self.stored.append((parent, values))
+        return pandas.DataFrame({"result_value": [], "reason": []})
+
+
+def _values(count: int, start: int = 0) -> pandas.Series:
+    return pandas.Series([float(value) for value in range(start, start + count)],
+                         index=[f"row_{value}" for value in range(start, start + count)])
+
+
+def _operational_error() -> OperationalError:
+    return OperationalError("COMMIT", {}, Exception("the server closed the connection unexpectedly"))
+
+
+def test_close_flushes_buffered_results():
+    daqss = _DaQSS()
+    sink = ResultSink(daqss, max_rows=100, max_age_seconds=60)
+    sink.put_dq_measurement_results("metric", ROW, "table", _values(3))
+    sink.put_dq_measurement_results("metric", ROW, "table", _values(2, start=3))
+    sink.close()
+    assert len(daqss.stored) == 1
+    assert list(daqss.stored[0][1].index) == [f"row_{value}" for value in range(5)]
+    with pytest.raises(ValueError):
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(1))
+
+
+def test_buffer_is_flushed_once_it_holds_max_rows():
+    daqss = _DaQSS()
+    with ResultSink(daqss, max_rows=4, max_age_seconds=60) as sink:
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(4))
+        sink.flush(timeout=5)
+        assert len(daqss.stored) == 1
+
+
+def test_flush_waits_until_results_are_committed():
+    daqss = _DaQSS()
+    with ResultSink(daqss, max_rows=100, max_age_seconds=60) as sink:
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(3))
+        sink.put_dq_aggregation_results("process", ROW, "other_table", _values(3))
+        sink.flush(timeout=5)
+        assert sorted(parent for parent, _ in daqss.stored) == ["other_table", "table"]
+        assert daqss.commits == 1
+
+
+def test_producers_are_blocked_while_the_sink_is_full():
+    daqss = _DaQSS()
+    daqss.release.clear()
+    with ResultSink(daqss, max_rows=2, max_age_seconds=60, capacity=4) as sink:
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(2))
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(2, start=2))
+        with pytest.raises(TimeoutError):
+            sink.put_dq_measurement_results("metric", ROW, "table", _values(1, start=4), timeout=0.1)
+        daqss.release.set()
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(1, start=4), timeout=5)
+    assert sum(len(values) for _, values in daqss.stored) == 5
+
+
+def test_transient_errors_are_retried():
+    daqss = _DaQSS()
+    daqss.failures["table"] = [_operational_error()]
+    rejected: list[pandas.DataFrame] = []
+    with ResultSink(daqss, max_rows=100, max_age_seconds=0.05, on_rejected=rejected.append) as sink:
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(3))
+        sink.flush(timeout=5)
+    assert len(daqss.stored) == 1
+    assert len(daqss.stored[0][1]) == 3
+    assert rejected == []
+
+
+def test_other_errors_reject_only_the_affected_results():
+    daqss = _DaQSS()
+    daqss.failures["unknown_table"] = [ValueError("the level of data granularity is unknown")]
+    rejected: list[pandas.DataFrame] = []
+    with ResultSink(daqss, max_rows=100, max_age_seconds=60, on_rejected=rejected.append) as sink:
+        sink.put_dq_measurement_results("metric", ROW, "unknown_table", _values(2))
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(3))
+        sink.flush(timeout=5)
+        assert [parent for parent, _ in daqss.stored] == ["table"]
+
+        # The sink keeps accepting and storing DQ results afterward
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(1, start=3))
+        sink.flush(timeout=5)
+        assert len(daqss.stored) == 2
+
+    assert len(rejected) == 1
+    assert list(rejected[0].index) == ["row_0", "row_1"]
+    assert (rejected[0]["parent_data_element"] == "unknown_table").all()
+    assert (rejected[0]["dq_metric"] == "metric").all()
+    assert rejected[0]["reason"].str.contains("the level of data granularity is unknown").all()
+
+
+def test_failed_flushes_are_discarded_unless_the_error_is_transient():
+    daqss = _DaQSS()
+    daqss.commit_failures.append(RuntimeError("the deferred constraint is violated"))
+    rejected: list[pandas.DataFrame] = []
+    with ResultSink(daqss, max_rows=100, max_age_seconds=60, on_rejected=rejected.append) as sink:
+        sink.put_dq_measurement_results("metric", ROW, "table", _values(3))
+        sink.flush(timeout=5)
+    assert daqss.commits == 0
+    assert len(rejected) == 1
+    assert len(rejected[0]) == 3
+
+
+def test_invalid_limits_are_rejected():
+    with pytest.raises(ValueError):
+        ResultSink(_DaQSS(), max_rows=10, capacity=5)
+    with pytest.raises(ValueError):
+        ResultSink(_DaQSS(), max_age_seconds=0)
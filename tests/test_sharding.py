@@ -0,0 +1,115 @@
+from contextlib import contextmanager
+
+import pytest
+
+from daqss import sharding
+from daqss.sharding import ShardRouter
+
+
+class _Result:
+    def __init__(self, rows: list[str]) -> None:
+        self._rows = rows
+
+    def scalars(self) -> "_Result":
+        return self
+
+    def all(self) -> list[str]:
+        return self._rows
+
+
+class _Connection:
+    def __init__(self, engine: "_Engine") -> None:
+        self._engine = engine
+
+    def execute(self, statement, parameters: dict) -> _Result:
+        self._engine.lookups += 1
+        return _Result([global_identifier for global_identifier in parameters["global_identifiers"]
+                        if global_identifier in self._engine.data_elements])
+
+
+class _Engine:
+    """Stands in for the engine of a shard, on which the given data elements are stored."""
+
+    def __init__(self, data_elements: set[str] | None = None) -> None:
+        self.data_elements: set[str] = data_elements or set()
+        self.lookups: int = 0
+
+    @contextmanager
+    def connect(self):
+        yield _Connection(self)
+
+
+def test_shard_of_root_is_stable():
+    router: ShardRouter = ShardRouter([_Engine() for _ in range(4)])
+    shard: int = router.shard_of_root("table")
+    assert 0 <= shard < 4
+    assert ShardRouter([_Engine() for _ in range(4)]).shard_of_root("table") == shard
+
+
+def test_route_places_trees_on_the_shard_of_their_root():
+    router: ShardRouter = ShardRouter([_Engine() for _ in range(4)])
+    # Children precede their parents, which are supplied within the same call
+    shards: dict[str, int] = router.route({"table#row#column": "table#row", "table#row": "table", "table": None,
+                                           "other": None, "other#row": "other"})
+    assert shards["table"] == shards["table#row"] == shards["table#row#column"] == router.shard_of_root("table")
+    assert shards["other"] == shards["other#row"] == router.shard_of_root("other")
+
+
+def test_route_places_children_on_the_shard_of_stored_parents():
+    engines: list[_Engine] = [_Engine(), _Engine(), _Engine({"table", "table#stored"})]
+    router: ShardRouter = ShardRouter(engines)
+    shards: dict[str, int] = router.route({"table#new": "table", "table#new#column": "table#new"})
+    assert shards == {"table#new": 2, "table#new#column": 2}
+
+
+def test_route_keeps_stored_data_elements_on_their_shard():
+    router: ShardRouter = ShardRouter([_Engine(), _Engine({"moved"})])
+    router.remember([("table", 0)])
+    shards: dict[str, int] = router.route({"moved": "table"})
+    assert shards == {"moved": 1}
+
+
+def test_route_terminates_on_cycles():
+    router: ShardRouter = ShardRouter([_Engine() for _ in range(3)])
+    shards: dict[str, int] = router.route({"a": "b", "b": "c", "c": "a", "d": "a"})
+    assert set(shards) == {"a", "b", "c", "d"}
+    assert shards["a"] == shards["b"] == shards["c"] == shards["d"]
+
+
+def test_route_of_data_elements_with_unknown_parents():
+    router: ShardRouter = ShardRouter([_Engine() for _ in range(3)])
+    shards: dict[str, int] = router.route({"missing#row": "missing"})
+    assert shards == {"missing#row": router.shard_of_root("missing")}
+
+
+def test_locate_remembers_located_data_elements():
+    engines: list[_Engine] = [_Engine({"a"}), _Engine({"b"})]
+    router: ShardRouter = ShardRouter(engines)
+    assert router.locate(["a", "b", "c"]) == {"a": 0, "b": 1}
+    assert router.locate(["a", "b"]) == {"a": 0, "b": 1}
+    assert [engine.lookups for engine in engines] == [1, 1]
+    assert router.shard_of("c") == 0
+
+
+def test_run_sets_the_current_shard():
+    router: ShardRouter = ShardRouter([_Engine() for _ in range(3)])
+    assert router.run(lambda shard: (shard, sharding.current_shard.get())) == [(0, 0), (1, 1), (2, 2)]
+    assert sharding.current_shard.get() is None
+
+
+def test_run_raises_the_error_of_a_shard():
+    router: ShardRouter = ShardRouter([_Engine() for _ in range(2)])
+
+    def fail_on_second_shard(shard: int) -> int:
+        if shard == 1:
+            raise ValueError("the shard is unavailable")
+        return shard
+
+    with pytest.raises(ValueError):
+        router.run(fail_on_second_shard)
+
+
+def test_merge_yields_the_items_of_all_shards():
+    router: ShardRouter = ShardRouter([_Engine() for _ in range(3)])
+    items: list[tuple[int, int]] = list(router.merge(lambda shard: iter([(shard, index) for index in range(5)])))
+    assert sorted(items) == [(shard, index) for shard in range(3) for index in range(5)]